@@ -1,10 +1,24 @@
-from flask import Flask, request, render_template, redirect, flash, jsonify, send_file
+from flask import Flask, request, render_template, redirect, flash, jsonify, send_file, Response, abort
 from flask_debugtoolbar import DebugToolbarExtension
 from werkzeug.utils import safe_join
+from werkzeug.exceptions import NotFound
 from flask_cors import CORS
 from models import db, connect_db, System, Object, AltName
-from functions import get_obj_batch, get_obj_vectors, get_id_list
+from functions import get_state_batch_async, build_obj, get_metadata_payload, pack_states
+from cache import get_cache_stats
+from propagation import trajectory_frames, integration_steps, INTEGRATORS
+from registry import get_registry
+from object_sets import get_id_list, UnknownSetError
+from frames import get_frame_states_async
+from approaches import get_close_approaches
+from osculating import get_element_batch_async, get_element_series, build_element_obj, element_columns, ELEMENTS
+from textures import find_variant, read_manifest, texture_version, ROOT
+from response_cache import responses, quantize, cache_key, CachedResponse
+import response_cache
 import datetime
+import asyncio
+import numpy
+import json
 import os
 
 app = Flask(__name__)
@@ -13,7 +27,16 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'yeet')
 app.config['DEBUG_TB_INTERCEPT_REDIRECTS'] = False
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'postgresql:///solar_system').replace("postgres://", "postgresql://")
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SQLALCHEMY_ECHO'] = True
+app.config['SQLALCHEMY_ECHO'] = os.environ.get('SQLALCHEMY_ECHO', 'False') == 'True'
+app.config['METADATA_MAX_AGE'] = int(os.environ.get('METADATA_MAX_AGE', 86400))
+app.config['MAX_TRAJECTORY_FRAMES'] = int(os.environ.get('MAX_TRAJECTORY_FRAMES', 100000))
+app.config['MAX_INTEGRATION_STEPS'] = int(os.environ.get('MAX_INTEGRATION_STEPS', 1000000))
+app.config['MAX_APPROACH_SAMPLES'] = int(os.environ.get('MAX_APPROACH_SAMPLES', 2000000))
+app.config['MAX_ELEMENT_SAMPLES'] = int(os.environ.get('MAX_ELEMENT_SAMPLES', 2000000))
+app.config['IMAGE_MAX_AGE'] = int(os.environ.get('IMAGE_MAX_AGE', 86400))
+
+BINARY_MIMETYPE = 'application/octet-stream'
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
 
 debug = DebugToolbarExtension(app)
 connect_db(app)
@@ -27,10 +50,43 @@ def home():
     return render_template('base.html')
 
 
+def wants_binary():
+    """Returns True if the client prefers packed binary state records to JSON"""
+    return request.accept_mimetypes.best_match(['application/json', BINARY_MIMETYPE]) == BINARY_MIMETYPE
+
+
+def wants_elements():
+    """Returns True if the query string asks for orbital elements alongside the states"""
+    return request.args.get('elements') == '1'
+
+
+@app.errorhandler(UnknownSetError)
+def unknown_set(error):
+    """Responds with 404 Not Found to requests naming an object set that does not exist"""
+    return NotFound(str(error))
+
+
+def binary_response(ids, states, elements=None):
+    """Returns states as packed little-endian records, see functions.state_record_dtype
+    precision=32 in the query string selects float32 instead of float64
+    Elements, if given, are appended to each record in the order listed in the X-Element-Columns header"""
+    precision = 32 if request.args.get('precision') == '32' else 64
+    columns = None if elements is None else element_columns(elements)
+    response = Response(pack_states(ids, states, precision, columns), mimetype=BINARY_MIMETYPE)
+    response.headers['X-Record-Layout'] = f'id:u4,position:f{precision // 8}x3,velocity:f{precision // 8}x3'
+    if columns is not None:
+        response.headers['X-Record-Layout'] += f',elements:f{precision // 8}x{len(ELEMENTS)}'
+        response.headers['X-Element-Columns'] = ','.join(ELEMENTS)
+    response.vary.add('Accept')
+    return response
+
+
 @app.route('/bodies/<int:obj_id>')
-def get_object(obj_id):
+async def get_object(obj_id):
     """Accepts a date in the query string and a single object id
-    Calls get_obj_vectors and returns the output as a JSON object"""
+    Awaits get_state_batch_async and returns the output as a JSON object
+    or as a packed binary record if the Accept header asks for application/octet-stream
+    Static object information is served separately by /bodies/metadata"""
     year = int(request.args['year'])
     month = int(request.args['month'])
     day = int(request.args['day'])
@@ -39,16 +95,30 @@ def get_object(obj_id):
     second = int(request.args['second'])
 
     date_time = datetime.datetime(year, month, day, hour, minute, second)
-    return jsonify(get_obj_vectors(obj_id, 0, date_time))
+    if not (await asyncio.to_thread(get_registry)).get(obj_id):
+        abort(404)
+    states = await get_state_batch_async([obj_id], 0, [date_time])
+    if wants_binary():
+        return binary_response([obj_id], states[:, 0])
+    response = jsonify(build_obj(obj_id, states[0, 0]))
+    response.vary.add('Accept')
+    return response
 
 
 @app.route('/bodies')
-def get_bodies():
+async def get_bodies():
     """Accepts a date and object set in the query string
     Calls get_id_list to construct a list of ids to query
-    Then calls get_obj_batch and returns the output as a JSON object"""
+    Then awaits get_frame_states_async and returns the output as a JSON object
+    or as packed binary records if the Accept header asks for application/octet-stream
+    Static object information is served separately by /bodies/metadata
+    An optional frame in the query string makes positions and velocities relative to
+    each object's system barycenter (frame=system) or to a single object (frame=<id>)
+    elements=1 adds each object's osculating elements relative to the body it orbits, see osculating.py
+    With the response cache enabled the date is rounded to its resolution and the X-Epoch header
+    gives the date the response is for, see response_cache.py"""
     object_set = request.args['object_set']
-    ids = get_id_list(object_set)
+    ids = await asyncio.to_thread(get_id_list, object_set)
 
     year = int(request.args['year'])
     month = int(request.args['month'])
@@ -58,10 +128,209 @@ def get_bodies():
     second = int(request.args['second'])
 
     date_time = datetime.datetime(year, month, day, hour, minute, second)
-    return jsonify(get_obj_batch(ids, 0, date_time))
+    if not response_cache.ENABLED:
+        return (await build_bodies_response(ids, date_time))[0]
+
+    date_time = quantize(date_time)
+    key = cache_key(ids, 'bodies', 0, request.args.get('frame'), date_time, wants_binary(),
+                    request.args.get('precision'), wants_elements())
+    cached = responses.get(key)
+    if cached is None:
+        response, complete = await build_bodies_response(ids, date_time)
+        if not complete:
+            # objects missing because the upstream failed or ran out of time are retried by the next request
+            response.headers['X-Epoch'] = date_time.isoformat()
+            return response
+        headers = {name: value for name, value in response.headers.items() if name.startswith('X-')}
+        headers['X-Epoch'] = date_time.isoformat()
+        cached = await asyncio.to_thread(CachedResponse.encode, response.mimetype, headers, response.get_data())
+        responses.set(key, cached)
+    return cached_response(cached)
+
+
+async def build_bodies_response(ids, date_time):
+    """Builds the /bodies response for the objects at one date, see get_bodies
+    Returns the response and whether every object's state was available"""
+    try:
+        states = await get_frame_states_async(ids, 0, [date_time], request.args.get('frame'))
+    except ValueError:
+        abort(400)
+    # the element batch reads the states just cached by the frame batch
+    elements = await get_element_batch_async(ids, [date_time]) if wants_elements() else None
+    complete = not numpy.isnan(states).any()
+    # encoding every object runs on a thread, off the event loop
+    return await asyncio.to_thread(encode_bodies, ids, states, elements), complete
+
+
+def encode_bodies(ids, states, elements):
+    """Encodes the /bodies response from the states and optional elements of the objects at one date"""
+    if wants_binary():
+        return binary_response(ids, states[:, 0], elements)
+    objs = [build_obj(obj_id, states[i, 0]) for i, obj_id in enumerate(ids)]
+    if elements is not None:
+        for i, obj in enumerate(objs):
+            obj['elements'] = build_element_obj(elements, i)
+    response = jsonify(objs)
+    response.vary.add('Accept')
+    return response
+
+
+def cached_response(cached):
+    """Returns a response from the response cache in the best encoding the client accepts
+    Responds with 304 Not Modified if the client's If-None-Match header matches the ETag"""
+    encoding, body = cached.negotiate(request.accept_encodings)
+    response = Response(body, mimetype=cached.mimetype, headers=cached.headers)
+    if encoding != 'identity':
+        response.content_encoding = encoding
+    # each encoding is a different representation, so it gets its own strong ETag
+    response.set_etag(cached.etag if encoding == 'identity' else f'{cached.etag}-{encoding}')
+    response.vary.update(['Accept', 'Accept-Encoding'])
+    return response.make_conditional(request)
+
+
+@app.route('/bodies/metadata')
+def get_metadata():
+    """Accepts an optional object set in the query string
+    Returns the static information for each object in the set, or for all objects, as a JSON object
+    Responds with 304 Not Modified if the client's If-None-Match header matches the ETag"""
+    payload, etag = get_metadata_payload(request.args.get('object_set'))
+    response = Response(payload, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['METADATA_MAX_AGE']
+    return response.make_conditional(request)
+
+
+@app.route('/trajectory')
+def get_trajectory():
+    """Accepts an object set, ISO format start and end dates, and a step in seconds in the query string
+    Seeds an N-body integration with a single ephemeris fetch at the start date
+    and streams a position frame for every step from start to end as it is integrated
+    The first line or event lists the ids of the objects in each frame, in order
+    Frames are sent as newline-delimited JSON, or as server-sent events if format=sse"""
+    object_set = request.args['object_set']
+    ids = get_id_list(object_set)
+    start = datetime.datetime.fromisoformat(request.args['start'])
+    end = datetime.datetime.fromisoformat(request.args['end'])
+    step = float(request.args['step'])
+    integrator = request.args.get('integrator', 'yoshida4')
+    sse = request.args.get('format') == 'sse'
+
+    if step <= 0 or integrator not in INTEGRATORS:
+        abort(400)
+    duration = (end - start).total_seconds()
+    if abs(duration) / step > app.config['MAX_TRAJECTORY_FRAMES']:
+        abort(400)
+    # each integration step costs time for every body, however few frames it produces
+    if len(ids) * integration_steps(duration, step) > app.config['MAX_INTEGRATION_STEPS']:
+        abort(400)
+
+    ids, frames = trajectory_frames(ids, 0, start, end, step, integrator=integrator)
+
+    def encode(message):
+        return f'data: {json.dumps(message)}\n\n' if sse else json.dumps(message) + '\n'
+
+    def generate():
+        yield encode({'ids': ids})
+        for date_time, states in frames:
+            yield encode({'time': date_time.isoformat(), 'position': states[:, :3].tolist()})
+
+    return Response(generate(), mimetype='text/event-stream' if sse else 'application/x-ndjson')
+
+
+@app.route('/approaches')
+def get_approaches():
+    """Accepts an object set, comma separated target ids, ISO format start and end dates,
+    a step in seconds and a distance in km in the query string
+    Returns every time an object in the set passes within the distance of a target as a JSON object,
+    ordered by time, with the distance in km and relative speed in km/s at closest approach,
+    along with the ids of the objects whose states were not available to search
+    The step must be short compared to the orbits searched, see approaches.py"""
+    ids = get_id_list(request.args['object_set'])
+    target_ids = [int(id) for id in request.args['targets'].split(',')]
+    start = datetime.datetime.fromisoformat(request.args['start'])
+    end = datetime.datetime.fromisoformat(request.args['end'])
+    step = float(request.args.get('step', 3600))
+    distance = float(request.args['distance'])
+
+    if not all(get_registry().get(id) for id in target_ids):
+        abort(404)
+    if step <= 0 or distance <= 0 or end <= start:
+        abort(400)
+    # the search holds a state for every object at every step in memory
+    if (len(ids) + len(target_ids)) * ((end - start).total_seconds() // step + 1) > app.config['MAX_APPROACH_SAMPLES']:
+        abort(400)
+    if (len(ids) + len(target_ids)) * integration_steps((end - start).total_seconds(), step) > app.config['MAX_INTEGRATION_STEPS']:
+        abort(400)
+
+    return jsonify(get_close_approaches(ids, target_ids, start, end, step, distance))
+
+
+@app.route('/elements')
+async def get_elements():
+    """Accepts an object set, an ISO format start date and optional end date and step in seconds in the query string
+    Returns the osculating elements of every object in the set
+    relative to the body it orbits at every step from start to end, as a JSON object
+    with the ids, the times and, for each element, a list per object of its value at each time
+    States are sampled with get_element_series, which fetches the objects it must integrate once, at the start date
+    Distances are in km and angles in radians, see osculating.py"""
+    ids = await asyncio.to_thread(get_id_list, request.args['object_set'])
+    start = datetime.datetime.fromisoformat(request.args['start'])
+    end = datetime.datetime.fromisoformat(request.args.get('end', request.args['start']))
+    step = float(request.args.get('step', 86400))
+
+    if step <= 0 or end < start:
+        abort(400)
+    count = int((end - start).total_seconds() // step) + 1
+    if len(ids) * count > app.config['MAX_ELEMENT_SAMPLES']:
+        abort(400)
+    if len(ids) * integration_steps((end - start).total_seconds(), step) > app.config['MAX_INTEGRATION_STEPS']:
+        abort(400)
+
+    datetimes = [start + datetime.timedelta(seconds=i * step) for i in range(count)]
+    elements = await asyncio.to_thread(get_element_series, ids, datetimes)
+    return await asyncio.to_thread(encode_elements, ids, datetimes, elements)
+
+
+def encode_elements(ids, datetimes, elements):
+    """Encodes the /elements response from the elements of the objects at every time"""
+    payload = {'ids': list(ids), 'times': [date_time.isoformat() for date_time in datetimes]}
+    for name in ELEMENTS:
+        values = elements[name]
+        payload[name] = numpy.where(numpy.isnan(values), None, values).tolist()
+    return jsonify(payload)
 
 
 @app.route('/images/<path:img_path>')
 def get_image(img_path):
-    """Returns the image file located at the given path"""
-    return send_file(safe_join('images',img_path))
+    """Returns the image file located at the given path, or a variant of it built by textures.py
+    size in the query string picks the width of the mip level, or full for the original size,
+    and WebP is served to clients that list image/webp in their Accept header
+    Responses have strong ETags and support conditional and range requests
+    size defaults to TEXTURE_DEFAULT_SIZE, the original unless configured otherwise
+    URLs carrying the texture's current version as v, as listed in /bodies/metadata, are cached as immutable"""
+    size = request.args.get('size')
+    if size not in [None, 'full'] and not size.isdigit():
+        abort(400)
+    found = find_variant(img_path, size, 'image/webp' in request.accept_mimetypes.values())
+    if found is None:
+        path = safe_join('images', img_path)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        return send_file(path, max_age=app.config['IMAGE_MAX_AGE'])
+
+    current = request.args.get('v') == texture_version(read_manifest()[img_path])
+    response = send_file(os.path.join(ROOT, found['path']), mimetype=found['mimetype'], etag=found['etag'],
+                         max_age=IMMUTABLE_MAX_AGE if current else app.config['IMAGE_MAX_AGE'])
+    response.cache_control.public = True
+    response.cache_control.immutable = current
+    response.vary.add('Accept')
+    return response
+
+
+@app.route('/stats/cache')
+def get_cache():
+    """Returns hit and miss counters for the ephemeris and response caches as a JSON object"""
+    stats = get_cache_stats()
+    stats['responses'] = responses.stats()
+    return jsonify(stats)
@@ -0,0 +1,195 @@
+"""Close-approach search over propagated state arrays
+
+States are sampled at regular times. Between two samples each body follows the cubic Hermite curve
+through its positions and velocities, which lies inside the convex hull of its four Bezier control points,
+so the box around those points bounds everywhere the body can be during the step. Every step the boxes
+are hashed into a uniform grid, and each target's box, grown by the search distance, only collects
+the bodies in the grid cells it overlaps instead of scanning every body. Pairs whose relative motion
+can come within the distance are refined to the time and distance of closest approach.
+The step must be short compared to the orbital periods involved, or fast bodies can
+pass through more than one minimum in a step and only the closest is reported"""
+from propagation import sample_states
+import datetime
+import numpy
+
+SAMPLES = 16                # points along a step where candidate pairs are first evaluated
+REFINE_ITERATIONS = 40      # golden-section iterations from the closest of those points
+BOUNDARY = 1e-6             # fraction of a step within which a closest point counts as the end of the step
+CELL_QUANTILE = 90          # grid cells are at least as wide as this percentile of the boxes
+CHUNK_SIZE = 2 ** 14        # candidate pairs refined at once
+GOLDEN = (numpy.sqrt(5) - 1) / 2
+HASH = numpy.array([73856093, 19349663, 83492791], dtype=numpy.int64)
+
+
+class CellGrid:
+    """Uniform grid of boxes, each filed under the cell holding its center
+    Boxes more than a cell wide are kept aside and returned for every query"""
+
+    def __init__(self, lo, hi, cell):
+        self.cell = cell
+        center = (lo + hi) / 2
+        oversized = ((hi - lo) > cell).any(axis=1)
+        self.oversized = numpy.flatnonzero(oversized)
+        members = numpy.flatnonzero(~oversized)
+        keys = cell_keys(numpy.floor(center[members] / cell).astype(numpy.int64))
+        order = numpy.argsort(keys)
+        self.keys = keys[order]
+        self.members = members[order]
+
+    def query(self, lo, hi):
+        """Returns (query, member) index pairs for the boxes that may overlap each of the query boxes
+        Can include pairs that do not overlap, but never misses one"""
+        # a member overlapping a query box has its center within half a cell of it
+        first = numpy.floor((lo - self.cell / 2) / self.cell).astype(numpy.int64)
+        span = numpy.floor((hi + self.cell / 2) / self.cell).astype(numpy.int64) - first + 1
+        total = span.prod(axis=1)
+        queries = numpy.repeat(numpy.arange(len(lo)), total)
+        offset = numpy.arange(total.sum()) - numpy.repeat(numpy.cumsum(total) - total, total)
+        span_x, span_y = span[queries, 0], span[queries, 1]
+        cells = first[queries] + numpy.column_stack((offset % span_x, offset // span_x % span_y, offset // (span_x * span_y)))
+
+        keys = cell_keys(cells)
+        left = numpy.searchsorted(self.keys, keys, 'left')
+        counts = numpy.searchsorted(self.keys, keys, 'right') - left
+        runs = numpy.repeat(left - numpy.cumsum(counts) + counts, counts) + numpy.arange(counts.sum())
+        found = numpy.column_stack((numpy.repeat(queries, counts), self.members[runs]))
+        # cells are hashed, so a member can be found through more than one cell
+        found = numpy.unique(found, axis=0)
+        if len(self.oversized):
+            everywhere = numpy.stack(numpy.meshgrid(numpy.arange(len(lo)), self.oversized, indexing='ij'), axis=-1)
+            found = numpy.concatenate((found, everywhere.reshape(-1, 2)))
+        return found[:, 0], found[:, 1]
+
+
+def cell_keys(cells):
+    """Hashes (n, 3) integer cell coordinates into single int64 keys
+    Distinct cells can share a key, which only adds pairs that the box test then rejects"""
+    return (cells[:, 0] * HASH[0]) ^ (cells[:, 1] * HASH[1]) ^ (cells[:, 2] * HASH[2])
+
+
+def control_points(pos0, vel0, pos1, vel1, dt):
+    """Returns the four Bezier control points of the Hermite curves between two samples, each an (n, 3) array"""
+    return pos0, pos0 + vel0 * (dt / 3), pos1 - vel1 * (dt / 3), pos1
+
+
+def bounding_boxes(points):
+    """Returns the lower and upper corners of the boxes around control points"""
+    lo = numpy.minimum(numpy.minimum(points[0], points[1]), numpy.minimum(points[2], points[3]))
+    hi = numpy.maximum(numpy.maximum(points[0], points[1]), numpy.maximum(points[2], points[3]))
+    return lo, hi
+
+
+def hermite(pos0, vel0, pos1, vel1, dt, s):
+    """Evaluates Hermite curves at fractions s of the step
+    pos and vel are (k, 3) arrays and s is an (m, 1, 1) or (k, 1) array of fractions
+    Returns positions and velocities"""
+    s2, s3 = s * s, s * s * s
+    position = ((2 * s3 - 3 * s2 + 1) * pos0 + (s3 - 2 * s2 + s) * dt * vel0 +
+                (3 * s2 - 2 * s3) * pos1 + (s3 - s2) * dt * vel1)
+    velocity = ((6 * s2 - 6 * s) * pos0 / dt + (3 * s2 - 4 * s + 1) * vel0 +
+                (6 * s - 6 * s2) * pos1 / dt + (3 * s2 - 2 * s) * vel1)
+    return position, velocity
+
+
+def closest_approach(pos0, vel0, pos1, vel1, dt):
+    """Finds the closest approach to the origin along relative Hermite curves within one step
+    Returns the fraction of the step, the distance and the relative speed at closest approach"""
+    fractions = numpy.linspace(0, 1, SAMPLES + 1)
+    positions, _ = hermite(pos0, vel0, pos1, vel1, dt, fractions[:, numpy.newaxis, numpy.newaxis])
+    nearest = numpy.argmin((positions ** 2).sum(axis=-1), axis=0)
+    lo = fractions[numpy.maximum(nearest - 1, 0)][:, numpy.newaxis]
+    hi = fractions[numpy.minimum(nearest + 1, SAMPLES)][:, numpy.newaxis]
+
+    def distance_sq(s):
+        return (hermite(pos0, vel0, pos1, vel1, dt, s)[0] ** 2).sum(axis=-1, keepdims=True)
+
+    for _ in range(REFINE_ITERATIONS):
+        left, right = hi - GOLDEN * (hi - lo), lo + GOLDEN * (hi - lo)
+        closer = distance_sq(left) < distance_sq(right)
+        hi = numpy.where(closer, right, hi)
+        lo = numpy.where(closer, lo, left)
+    s = (lo + hi) / 2
+    position, velocity = hermite(pos0, vel0, pos1, vel1, dt, s)
+    return s[:, 0], numpy.linalg.norm(position, axis=-1), numpy.linalg.norm(velocity, axis=-1)
+
+
+def find_approaches(states, times, targets, distance):
+    """Finds every time a body passes within distance of a target
+    states is an (n_bodies, n_times, 6) array in km and km/s, NaN where data was not available,
+    times an increasing (n_times,) array in seconds and targets the indices of the target bodies
+    Pairs of targets are searched once. Returns a dict of arrays with one entry per approach:
+    target and body indices, time in seconds, distance in km and relative speed in km/s"""
+    targets = numpy.asarray(targets, dtype=numpy.intp)
+    is_target = numpy.zeros(len(states), dtype=bool)
+    is_target[targets] = True
+    found = {'target': [], 'body': [], 'time': [], 'distance': [], 'speed': []}
+
+    has_data = ~numpy.isnan(states).any(axis=2)
+    for k in range(len(times) - 1):
+        dt = times[k + 1] - times[k]
+        available = numpy.flatnonzero(has_data[:, k] & has_data[:, k + 1])
+        searching = targets[numpy.isin(targets, available)]
+        if not len(searching):
+            continue
+        sample0, sample1 = states[available, k], states[available, k + 1]
+        lo, hi = bounding_boxes(control_points(sample0[:, :3], sample0[:, 3:], sample1[:, :3], sample1[:, 3:], dt))
+        cell = max(2 * distance, numpy.percentile((hi - lo).max(axis=1), CELL_QUANTILE))
+        grid = CellGrid(lo, hi, cell)
+        query = numpy.searchsorted(available, searching)
+        query, member = grid.query(lo[query] - distance, hi[query] + distance)
+        target, body = searching[query], available[member]
+
+        # each pair of targets is searched from the lower index only
+        keep = (target != body) & ~(is_target[body] & (body < target))
+        target, body = target[keep], body[keep]
+        # the relative path stays inside the box of the differences between control points
+        rel0 = states[body, k] - states[target, k]
+        rel1 = states[body, k + 1] - states[target, k + 1]
+        rel_lo, rel_hi = bounding_boxes(control_points(rel0[:, :3], rel0[:, 3:], rel1[:, :3], rel1[:, 3:], dt))
+        gap = numpy.maximum(rel_lo, 0) + numpy.maximum(-rel_hi, 0)
+        keep = (gap ** 2).sum(axis=1) <= distance ** 2
+        target, body, rel0, rel1 = target[keep], body[keep], rel0[keep], rel1[keep]
+
+        for start in range(0, len(target), CHUNK_SIZE):
+            chunk = slice(start, start + CHUNK_SIZE)
+            t, b, r0, r1 = target[chunk], body[chunk], rel0[chunk], rel1[chunk]
+            s, separation, speed = closest_approach(r0[:, :3], r0[:, 3:], r1[:, :3], r1[:, 3:], dt)
+            # a closest point at either end of a step is only a minimum if the distance stops falling there,
+            # or if it is at either end of the search
+            rate0, rate1 = (r0[:, :3] * r0[:, 3:]).sum(axis=1), (r1[:, :3] * r1[:, 3:]).sum(axis=1)
+            minimum = (((s > BOUNDARY) & (s < 1 - BOUNDARY)) | ((rate0 < 0) & (rate1 >= 0)) |
+                       ((k == 0) & (rate0 >= 0)) | ((k == len(times) - 2) & (rate1 < 0)))
+            hit = (separation <= distance) & minimum
+            found['target'].append(t[hit])
+            found['body'].append(b[hit])
+            found['time'].append(times[k] + s[hit] * dt)
+            found['distance'].append(separation[hit])
+            found['speed'].append(speed[hit])
+
+    approaches = {key: numpy.concatenate(values) if values else numpy.empty(0) for key, values in found.items()}
+    order = numpy.argsort(approaches['time'], kind='stable')
+    return {key: values[order] for key, values in approaches.items()}
+
+
+def get_close_approaches(obj_ids, target_ids, start, end, step, distance):
+    """Finds every time an object passes within distance km of a target between start and end
+    States for the objects and targets are sampled every step seconds with propagation.sample_states,
+    which fetches the objects it must integrate once, at start
+    Returns a dict with a list of approaches ordered by time, each with the target and object ids, the time
+    and the distance in km and relative speed in km/s at closest approach, and a list of the ids
+    of the objects and targets that could not be searched because their states were not available"""
+    ids = list(target_ids) + [obj_id for obj_id in obj_ids if obj_id not in target_ids]
+    count = int((end - start).total_seconds() // step)
+    times = numpy.arange(count + 1) * float(step)
+    datetimes = [start + datetime.timedelta(seconds=offset) for offset in times]
+    states = sample_states(ids, 0, start, datetimes)
+    unavailable = numpy.isnan(states).any(axis=(1, 2))
+
+    approaches = find_approaches(states, times, numpy.arange(len(target_ids)), distance)
+    return {'approaches': [{'target': ids[target], 'id': ids[body],
+                            'time': (start + datetime.timedelta(seconds=float(time))).isoformat(),
+                            'distance': float(separation), 'speed': float(speed)}
+                           for target, body, time, separation, speed in zip(approaches['target'], approaches['body'],
+                                                                            approaches['time'], approaches['distance'],
+                                                                            approaches['speed'])],
+            'unavailable': [id for id, missing in zip(ids, unavailable) if missing]}
@@ -0,0 +1,69 @@
+"""ASGI entry point for serving the app with an async server such as uvicorn
+
+Usage: uvicorn asgi:asgi_app --workers 2
+
+Requests run concurrently on a pool of threads, and the async views in app.py hand their coroutines back
+to the server's event loop, so a worker waiting on JPL Horizons for one request keeps serving others
+Everything blocking in those coroutines, the database cache tiers, registry and set loading and the NumPy and
+JSON work, is handed to asyncio.to_thread, since the event loop is shared by every request of the worker"""
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from asgiref.sync import sync_to_async
+from concurrent.futures import ThreadPoolExecutor
+from app import app
+import contextvars
+import asyncio
+import os
+
+THREADS = int(os.environ.get('ASGI_THREADS', 32))   # requests handled at once by each worker process
+
+_executor = ThreadPoolExecutor(max_workers=THREADS, thread_name_prefix='asgi')
+
+
+class ConcurrentWsgiToAsgiInstance(WsgiToAsgiInstance):
+    """Runs each request on the shared thread pool
+    asgiref runs every request of a worker on one thread by default, which serializes them"""
+
+    def run_wsgi_app(self, body):
+        """Runs the WSGI app for one request on a thread of the pool and sends its response
+        Copied from asgiref 3.12.1, pinned in requirements.txt, whose version runs on the thread-sensitive executor"""
+        try:
+            environ = self.build_environ(self.scope, body)
+        except ValueError:
+            # too many duplicate headers
+            self.sync_send({'type': 'http.response.start', 'status': 400, 'headers': [(b'content-type', b'text/plain')]})
+            self.sync_send({'type': 'http.response.body', 'body': b'Bad Request: Too many duplicate headers'})
+            return
+        bytes_sent = 0
+        for output in self.wsgi_application(environ, self.start_response):
+            # the headers go out with the first block of the body
+            if not self.response_started:
+                self.response_started = True
+                self.sync_send(self.response_start)
+            # nothing beyond the Content-Length the app declared is sent
+            if self.response_content_length is not None:
+                bytes_allowed = self.response_content_length - bytes_sent
+                if len(output) > bytes_allowed:
+                    output = output[:bytes_allowed]
+            self.sync_send({'type': 'http.response.body', 'body': output, 'more_body': True})
+            bytes_sent += len(output)
+            if bytes_sent == self.response_content_length:
+                break
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({'type': 'http.response.body'})
+
+    run_wsgi_app = sync_to_async(run_wsgi_app, thread_sensitive=False, executor=_executor)
+
+
+class ConcurrentWsgiToAsgi(WsgiToAsgi):
+    """WSGI to ASGI adapter that does not serialize requests
+    Each request runs in an empty context, so Flask pushes it its own app context and database session
+    instead of sharing the one app.py pushes on import with every concurrent request"""
+
+    async def __call__(self, scope, receive, send):
+        instance = ConcurrentWsgiToAsgiInstance(self.wsgi_application, self.duplicate_header_limit)
+        await contextvars.Context().run(asyncio.ensure_future, instance(scope, receive, send))
+
+
+asgi_app = ConcurrentWsgiToAsgi(app)
@@ -0,0 +1,150 @@
+"""Array-backed Barnes-Hut octree for the server-side propagation engine
+
+Python counterpart of the Tree class in static/barnes-hut.js. Instead of one object per node,
+the tree is stored in flat NumPy arrays and built level by level from the Morton codes of the bodies,
+so rebuilding it every step allocates a handful of arrays rather than one object per node"""
+from propagation import G
+import numpy
+
+MAX_DEPTH = 21      # levels below the root, 21 bits per axis fills a 63-bit Morton code
+CHUNK_SIZE = 4096   # bodies walked through the tree at once, bounds memory use during traversal
+
+
+class Octree:
+    """Octree over a set of bodies
+    Node i covers a cube of side size[i] and holds the total mass and center of mass of its bodies
+    children[i] holds the indices of the node's eight child octants, -1 where an octant is empty"""
+
+    def __init__(self, children, mass, center_mass, size, body):
+        self.children = children            # (n_nodes, 8) child index table
+        self.mass = mass                    # (n_nodes,) total mass of each node, kg
+        self.center_mass = center_mass      # (n_nodes, 3) center of mass of each node, km
+        self.size = size                    # (n_nodes,) side length of each node, km
+        self.body = body                    # (n_nodes,) index of the only body in a node, -1 if it holds several
+        self.is_leaf = (children < 0).all(axis=1)
+
+    @classmethod
+    def build(cls, pos, masses):
+        """Builds the tree for an (n, 3) array of positions in km and an (n,) array of masses in kg"""
+        min_coords = pos.min(axis=0)
+        side = float((pos.max(axis=0) - min_coords).max()) or 1.0
+        side *= 1 + 1e-9    # keeps bodies on the far faces inside the root cube
+
+        cells = ((pos - min_coords) / side * 2 ** MAX_DEPTH).astype(numpy.uint64)
+        codes = morton_codes(numpy.minimum(cells, 2 ** MAX_DEPTH - 1))
+        order = numpy.argsort(codes, kind='stable')
+        codes = codes[order]
+        sorted_pos = pos[order]
+        sorted_mass = masses[order]
+        weighted_pos = sorted_pos * sorted_mass[:, numpy.newaxis]
+
+        n = len(pos)
+        levels = []
+        active = numpy.ones(n, dtype=bool)     # bodies inside a node that still needs subdividing
+        parent_starts = None
+        first = 0
+        for level in range(MAX_DEPTH + 1):
+            prefix = codes >> numpy.uint64(3 * (MAX_DEPTH - level))
+            starts = numpy.flatnonzero(numpy.concatenate(([True], prefix[1:] != prefix[:-1])))
+            counts = numpy.diff(numpy.append(starts, n))
+            mass = numpy.add.reduceat(sorted_mass, starts)
+            moment = numpy.add.reduceat(weighted_pos, starts, axis=0)
+
+            keep = active[starts]
+            starts, counts, mass, moment = starts[keep], counts[keep], mass[keep], moment[keep]
+            if not len(starts):
+                break
+
+            if parent_starts is None:
+                parents = octants = None
+            else:
+                parents = first - len(parent_starts) + numpy.searchsorted(parent_starts, starts, side='right') - 1
+                octants = (prefix[starts] & numpy.uint64(7)).astype(numpy.intp)
+            levels.append((level, starts, counts, mass, moment, parents, octants))
+
+            # a node with a single body is a leaf, its body needs no further subdivision
+            single = numpy.zeros(n, dtype=bool)
+            single[starts[counts == 1]] = True
+            active &= ~single
+            parent_starts = starts
+            first += len(starts)
+
+        n_nodes = first
+        children = numpy.full((n_nodes, 8), -1, dtype=numpy.intp)
+        node_mass = numpy.empty(n_nodes)
+        center_mass = numpy.empty((n_nodes, 3))
+        size = numpy.empty(n_nodes)
+        body = numpy.full(n_nodes, -1, dtype=numpy.intp)
+
+        index = 0
+        for level, starts, counts, mass, moment, parents, octants in levels:
+            nodes = numpy.arange(index, index + len(starts))
+            node_mass[nodes] = mass
+            # massless nodes fall back to the position of their first body
+            safe_mass = numpy.where(mass > 0, mass, 1.0)[:, numpy.newaxis]
+            center_mass[nodes] = numpy.where(mass[:, numpy.newaxis] > 0, moment / safe_mass, sorted_pos[starts])
+            size[nodes] = side / 2 ** level
+            body[nodes[counts == 1]] = order[starts[counts == 1]]
+            if parents is not None:
+                children[parents, octants] = nodes
+            index += len(starts)
+
+        return cls(children, node_mass, center_mass, size, body)
+
+    def accelerations(self, pos, theta=0.5):
+        """Calculates the gravitational acceleration on each of the bodies the tree was built from
+        A node is treated as a single body when it is a leaf or when its side length divided by its
+        distance from the body is below theta
+        Returns an (n, 3) array in km/s2"""
+        n = len(pos)
+        acc = numpy.zeros((n, 3))
+        theta_sq = theta ** 2
+        for chunk_start in range(0, n, CHUNK_SIZE):
+            chunk_end = min(chunk_start + CHUNK_SIZE, n)
+            bodies = numpy.arange(chunk_start, chunk_end)
+            nodes = numpy.zeros(len(bodies), dtype=numpy.intp)
+            while len(bodies):
+                r_vec = self.center_mass[nodes] - pos[bodies]
+                r_sq = numpy.einsum('ij,ij->i', r_vec, r_vec)
+                accept = self.is_leaf[nodes] | (self.size[nodes] ** 2 < theta_sq * r_sq)
+
+                # a body exerts no gravitational force on itself
+                apply = accept & (self.body[nodes] != bodies) & (r_sq > 0)
+                scale = G * self.mass[nodes[apply]] * r_sq[apply] ** -1.5
+                for k in range(3):
+                    acc[chunk_start:chunk_end, k] += numpy.bincount(bodies[apply] - chunk_start,
+                                                                    weights=scale * r_vec[apply, k],
+                                                                    minlength=chunk_end - chunk_start)
+
+                # else descend into the node's non-empty children
+                opened = ~accept
+                kids = self.children[nodes[opened]]
+                present = kids >= 0
+                bodies = numpy.repeat(bodies[opened], 8).reshape(-1, 8)[present]
+                nodes = kids[present]
+        return acc
+
+
+def morton_codes(cells):
+    """Interleaves the bits of an (n, 3) array of integer cell coordinates into (n,) Morton codes"""
+    codes = numpy.zeros(len(cells), dtype=numpy.uint64)
+    for axis in range(3):
+        codes |= spread_bits(cells[:, axis]) << numpy.uint64(axis)
+    return codes
+
+
+def spread_bits(values):
+    """Spreads the lower 21 bits of each value so there are two zero bits between each bit"""
+    x = values.astype(numpy.uint64) & numpy.uint64(0x1fffff)
+    x = (x | x << numpy.uint64(32)) & numpy.uint64(0x1f00000000ffff)
+    x = (x | x << numpy.uint64(16)) & numpy.uint64(0x1f0000ff0000ff)
+    x = (x | x << numpy.uint64(8)) & numpy.uint64(0x100f00f00f00f00f)
+    x = (x | x << numpy.uint64(4)) & numpy.uint64(0x10c30c30c30c30c3)
+    x = (x | x << numpy.uint64(2)) & numpy.uint64(0x1249249249249249)
+    return x
+
+
+def accelerations(pos, masses, theta=0.5):
+    """Calculates gravitational accelerations with a freshly built tree
+    Has the same signature as propagation.accelerations so it can be passed to propagation.trajectory"""
+    return Octree.build(pos, masses).accelerations(pos, theta)
@@ -0,0 +1,114 @@
+"""Times the close-approach search in approaches.py against a scan of every pair at every step
+
+Usage: python bench/approach_bench.py [asteroids]
+
+Two workloads are generated with kepler.propagate:
+the moon set, with as many moons around each planet as the bundled catalogue, searched for moons passing
+near each other, and a large asteroid catalogue of main-belt and near-Earth orbits searched for
+approaches to Earth and Mars. The scan evaluates every pair at the same points along each step that the
+search starts its refinement from, and every pair it finds within the distance must be found by the search"""
+import os
+import sys
+import csv
+import time
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from approaches import find_approaches, hermite, SAMPLES
+from functions import STATE_TO_KM
+from kepler import propagate, GM_SUN
+from seed import DATA_DIR
+
+AU = 149597870.7
+# system id: semi-major axis in au and mass as a fraction of the Sun's
+PLANETS = {3: (1.0, 3.0e-6), 4: (1.524, 3.2e-7), 5: (5.203, 9.55e-4), 6: (9.537, 2.86e-4),
+           7: (19.19, 4.37e-5), 8: (30.07, 5.15e-5), 9: (39.48, 6.6e-9)}
+
+
+def random_orbits(n, rng, a, e, i):
+    """Returns elements for n orbits with semi-major axis, eccentricity and inclination
+    drawn uniformly from the given ranges and random orientations, epoch 0"""
+    return dict(a=rng.uniform(*a, n), e=rng.uniform(*e, n), i=numpy.radians(rng.uniform(*i, n)),
+                long_asc=rng.uniform(0, 2 * numpy.pi, n), arg_peri=rng.uniform(0, 2 * numpy.pi, n),
+                mean_anomaly=rng.uniform(0, 2 * numpy.pi, n), epoch=numpy.zeros(n))
+
+
+def moon_states(days, rng):
+    """Returns states in km and km/s at every day in days for the planets and the moons around them,
+    with the number of moons in each system taken from the bundled catalogue"""
+    with open(os.path.join(DATA_DIR, 'objects.csv'), newline='') as file:
+        systems = [int(row['system_id']) for row in csv.DictReader(file) if row['system_id']]
+    planets = random_orbits(len(PLANETS), rng, (0, 0), (0, 0.05), (0, 2))
+    planets['a'] = numpy.array([planet_a for planet_a, mass in PLANETS.values()])
+    planets = propagate(**planets, julians=days)
+    states = [planets]
+    for index, (id, (planet_a, mass)) in enumerate(PLANETS.items()):
+        count = systems.count(id) - 1
+        hill = planet_a * (mass / 3) ** (1 / 3)
+        moons = random_orbits(count, rng, (0, 1), (0, 0.3), (0, 60))
+        moons['a'] = 10 ** rng.uniform(numpy.log10(hill / 500), numpy.log10(hill / 3), count)
+        states.append(propagate(**moons, julians=days, mu=GM_SUN * mass) + planets[index])
+    return numpy.concatenate(states) * STATE_TO_KM
+
+
+def asteroid_states(n, days, rng):
+    """Returns states in km and km/s at every day in days for Earth, Mars and n asteroids,
+    nine in ten in the main belt and the rest on near-Earth orbits"""
+    near = n // 10
+    belt = random_orbits(n - near, rng, (2.1, 3.3), (0, 0.3), (0, 20))
+    neo = random_orbits(near, rng, (0.8, 2.5), (0.1, 0.7), (0, 30))
+    elements = {key: numpy.concatenate((belt[key], neo[key])) for key in belt}
+    planets = random_orbits(2, rng, (0, 0), (0, 0.05), (0, 2))
+    planets['a'] = numpy.array([1.0, 1.524])
+    return numpy.concatenate((propagate(**planets, julians=days), propagate(**elements, julians=days))) * STATE_TO_KM
+
+
+def scan(states, times, targets, distance):
+    """Evaluates every target against every other body at SAMPLES + 1 points along every step
+    Returns the set of (target, body) pairs found within distance"""
+    fractions = numpy.linspace(0, 1, SAMPLES + 1)[:, numpy.newaxis, numpy.newaxis]
+    pairs = set()
+    for k in range(len(times) - 1):
+        dt = times[k + 1] - times[k]
+        for target in targets:
+            rel0 = states[:, k] - states[target, k]
+            rel1 = states[:, k + 1] - states[target, k + 1]
+            position, _ = hermite(rel0[:, :3], rel0[:, 3:], rel1[:, :3], rel1[:, 3:], dt, fractions)
+            near = (position ** 2).sum(axis=-1).min(axis=0) <= distance ** 2
+            near[target] = False
+            pairs.update((min(target, body), max(target, body)) if body in targets else (target, body)
+                         for body in numpy.flatnonzero(near))
+    return pairs
+
+
+def compare(name, states, times, targets, distance):
+    """Times the search and the scan on the same states and checks that the search found every pair"""
+    start = time.perf_counter()
+    approaches = find_approaches(states, times, targets, distance)
+    search_time = time.perf_counter() - start
+    start = time.perf_counter()
+    scanned = scan(states, times, targets, distance)
+    scan_time = time.perf_counter() - start
+
+    found = set(zip(approaches['target'].tolist(), approaches['body'].tolist()))
+    missed = len(scanned - found)
+    print(f'{name:>36}: {states.shape[0]:>7} bodies x {len(times):>3} steps, {len(targets):>3} targets, '
+          f'{len(approaches["time"]):>5} approaches, search {search_time:7.3f} s, scan {scan_time:7.3f} s, '
+          f'{scan_time / search_time:6.1f}x, missed {missed}')
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = numpy.random.default_rng(0)
+
+    days = numpy.arange(0, 10, 1 / 24)
+    states = moon_states(days, rng)
+    compare('moon set, moons within 100,000 km', states, days * 86400, numpy.arange(len(states)), 1e5)
+
+    days = numpy.arange(0, 20.01, 0.5)
+    states = asteroid_states(n, days, rng)
+    compare('asteroids within 0.05 au of planets', states, days * 86400, [0, 1], 0.05 * AU)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Compares the sync and async serving stacks for /bodies against a local stub of JPL Horizons
+
+Usage: DATABASE_URL=<seeded database> python bench/async_bench.py [concurrency] [requests] [latency] [object set]
+
+Starts bench/fake_horizons.py with the given per-request latency, then serves the app with
+gunicorn sync workers (the current Procfile), gunicorn threaded workers and uvicorn through asgi.py,
+using the same number of worker processes, and fires requests from concurrent clients at each. Every request asks for a
+different date, never repeated across stacks, so it misses the ephemeris cache and pays the upstream round trips.
+HORIZONS_MAX_BATCH=1 makes the stub answer one object per round trip, like astroquery
+The object set defaults to inner, 9 bodies; larger sets such as full weigh the database and encoding work
+that the async views run off the event loop"""
+import os
+import sys
+import time
+import random
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKERS = '2'
+HORIZONS_PORT = 8598
+APP_PORT = 8597
+
+STACKS = {
+    'sync (gunicorn)': ['gunicorn', 'app:app', '--workers', WORKERS, '--bind', f'127.0.0.1:{APP_PORT}'],
+    'threaded (gunicorn)': ['gunicorn', 'app:app', '--workers', WORKERS, '--worker-class', 'gthread', '--threads', '16', '--bind', f'127.0.0.1:{APP_PORT}'],
+    'async (uvicorn)': ['uvicorn', 'asgi:asgi_app', '--workers', WORKERS, '--port', str(APP_PORT), '--log-level', 'warning'],
+}
+
+
+def start(command, env=None):
+    """Starts a server process from the repository root"""
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(url, timeout=30):
+    """Polls url until the server answers"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=5).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server at {url} did not start')
+
+
+def bodies_url(rng, object_set):
+    """Returns a /bodies url for a random date, so each request misses the cache"""
+    return (f'http://127.0.0.1:{APP_PORT}/bodies?object_set={object_set}&year={rng.randint(1950, 2049)}'
+            f'&month={rng.randint(1, 12)}&day={rng.randint(1, 28)}&hour={rng.randint(0, 23)}'
+            f'&minute={rng.randint(0, 59)}&second={rng.randint(0, 59)}')
+
+
+def timed_get(url):
+    """Returns the time taken by a single request, in seconds"""
+    start_time = time.perf_counter()
+    urllib.request.urlopen(url, timeout=120).read()
+    return time.perf_counter() - start_time
+
+
+def run_load(concurrency, requests, rng, object_set):
+    """Sends requests from concurrent clients and returns requests per second and the latency of each request"""
+    urls = [bodies_url(rng, object_set) for _ in range(requests)]
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        latencies = sorted(clients.map(timed_get, urls))
+    return requests / (time.perf_counter() - start_time), latencies
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    latency = sys.argv[3] if len(sys.argv) > 3 else '0.2'
+    object_set = sys.argv[4] if len(sys.argv) > 4 else 'inner'
+
+    env = dict(os.environ, HORIZONS_URL=f'http://127.0.0.1:{HORIZONS_PORT}/vectors')
+    horizons = start([sys.executable, 'bench/fake_horizons.py', str(HORIZONS_PORT), latency])
+    try:
+        wait_ready(f'http://127.0.0.1:{HORIZONS_PORT}/vectors?ids=399&id_type=id&center=0&epochs=2451545.0')
+        print(f'{WORKERS} workers, {concurrency} clients, {requests} requests, upstream latency {latency} s, '
+              f'object set {object_set}')
+        for seed, (name, command) in enumerate(STACKS.items()):
+            server = start(command, env)
+            try:
+                wait_ready(f'http://127.0.0.1:{APP_PORT}/bodies/metadata')
+                rate, latencies = run_load(concurrency, requests, random.Random(seed), object_set)
+            finally:
+                server.terminate()
+                server.wait()
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(f'{name:>19}: {rate:7.2f} req/s, p50 {p50 * 1000:7.0f} ms, p99 {p99 * 1000:7.0f} ms')
+    finally:
+        horizons.terminate()
+        horizons.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Compares the Barnes-Hut octree in barnes_hut.py with direct O(N^2) summation in propagation.py
+
+Usage: python bench/barnes_hut_bench.py [theta]
+
+Bodies are drawn from a flattened disc resembling the solar system's moons and small bodies.
+Direct summation above 10k bodies is timed on a sample of rows and scaled up, since a full
+evaluation at 100k bodies takes several minutes"""
+import os
+import sys
+import time
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from propagation import accelerations as direct_accelerations
+from barnes_hut import Octree
+
+SIZES = [200, 10000, 100000]
+DIRECT_SAMPLE = 2000
+
+
+def make_bodies(n, rng):
+    """Returns random positions in km and masses in kg for n bodies"""
+    radius = rng.uniform(5e7, 5e9, n)
+    angle = rng.uniform(0, 2 * numpy.pi, n)
+    pos = numpy.column_stack((radius * numpy.cos(angle), radius * numpy.sin(angle), rng.normal(0, 1e7, n)))
+    masses = 10 ** rng.uniform(15, 24, n)
+    masses[0] = 1.9884e+30
+    pos[0] = 0
+    return pos, masses
+
+
+def direct_sample(pos, masses, rows):
+    """Direct summation for a subset of rows, used to time and check large sets"""
+    acc = []
+    for start in range(0, len(rows), 100):
+        block = rows[start:start + 100]
+        diff = pos[numpy.newaxis, :, :] - pos[block, numpy.newaxis, :]
+        dist_sq = numpy.einsum('ijk,ijk->ij', diff, diff)
+        dist_sq[numpy.arange(len(block)), block] = numpy.inf
+        acc.append(6.67408e-20 * numpy.einsum('ijk,ij,j->ik', diff, dist_sq ** -1.5, masses))
+    return numpy.vstack(acc)
+
+
+def timed(function, *args):
+    """Returns the result of a call and the time it took in seconds"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    theta = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    rng = numpy.random.default_rng(0)
+    print(f'theta = {theta}')
+    print(f'{"bodies":>8} {"direct s":>10} {"build s":>10} {"walk s":>10} {"tree s":>10} {"speedup":>8} {"median err":>11} {"max err":>10}')
+    for n in SIZES:
+        pos, masses = make_bodies(n, rng)
+        tree, build_time = timed(Octree.build, pos, masses)
+        tree_acc, walk_time = timed(tree.accelerations, pos, theta)
+
+        if n <= 10000:
+            direct_acc, direct_time = timed(direct_accelerations, pos, masses)
+            rows = numpy.arange(n)
+        else:
+            rows = rng.choice(n, DIRECT_SAMPLE, replace=False)
+            direct_acc, sample_time = timed(direct_sample, pos, masses, rows)
+            direct_time = sample_time * n / DIRECT_SAMPLE
+
+        err = numpy.linalg.norm(tree_acc[rows] - direct_acc, axis=1) / numpy.linalg.norm(direct_acc, axis=1)
+        tree_time = build_time + walk_time
+        print(f'{n:>8} {direct_time:>10.3f} {build_time:>10.3f} {walk_time:>10.3f} {tree_time:>10.3f} '
+              f'{direct_time / tree_time:>8.1f} {numpy.median(err):>11.2e} {err.max():>10.2e}')
@@ -0,0 +1,73 @@
+"""Times opening an offline ephemeris bundle and looking up states in it, against the Chebyshev segment tables
+
+Usage: python bench/bundle_bench.py [objects] [years]
+
+Writes a bundle of synthetic 2 day segments for the given number of objects and years with bundle.create,
+then times opening it, lookups of every object at one epoch as served by /bodies, and lookups over a
+span of epochs, against chebyshev.SegmentTable holding the same segments in memory"""
+import os
+import sys
+import time
+import tempfile
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bundle import Bundle, create
+from chebyshev import SegmentTable
+
+SEGMENT_DAYS = 2
+DEGREE = 11
+START = 2451545.0
+
+
+def best(function, repeat=5):
+    """Returns the shortest of repeat timings of function, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 250
+    years = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    segments = int(years * 365.25 / SEGMENT_DAYS)
+    rng = numpy.random.default_rng(0)
+    ids = list(range(1000, 1000 + n))
+    path = os.path.join(tempfile.mkdtemp(), 'bench.bundle')
+
+    offsets, covered, coeffs = create(path, ids, 0, START, START + segments * SEGMENT_DAYS, [SEGMENT_DAYS] * n, DEGREE)
+    for row in range(n):
+        coeffs[offsets[row]:offsets[row + 1]] = rng.normal(size=(segments, 6, DEGREE + 1)) / numpy.arange(1, DEGREE + 2) ** 4
+    covered[:] = True
+    coeffs.flush()
+    covered.flush()
+    del offsets, covered, coeffs
+    print(f'{n} objects x {segments} segments, {os.path.getsize(path) / 1e6:.0f} MB')
+
+    print(f'{"open":>36}: {best(lambda: Bundle(path)) * 1000:8.2f} ms')
+    bundle = Bundle(path)
+    starts = [START + k * SEGMENT_DAYS for k in range(segments)]
+    ends = [start + SEGMENT_DAYS for start in starts]
+    tables = {id: SegmentTable(starts, ends, list(bundle.coeffs[bundle.offsets[row]:bundle.offsets[row + 1]]))
+              for row, id in enumerate(ids)}
+
+    for name, epochs in [('every object, one epoch', [START + 1234.567]),
+                         ('every object, 100 epochs', list(START + rng.uniform(0, segments * SEGMENT_DAYS, 100)))]:
+        lookup = best(lambda: bundle.lookup(ids, 0, epochs))
+        table = best(lambda: {id: [tables[id].evaluate(epoch) for epoch in epochs] for id in ids}, repeat=2)
+        print(f'{name:>36}: bundle {lookup * 1000:8.2f} ms, segment tables {table * 1000:8.2f} ms, '
+              f'{lookup * 1e9 / (n * len(epochs)):6.0f} ns per body-epoch')
+
+    rows = numpy.arange(n)
+    epochs = START + rng.uniform(0, segments * SEGMENT_DAYS, 20)
+    states = bundle.evaluate(rows, epochs)
+    expected = numpy.array([[tables[id].evaluate(epoch) for epoch in epochs] for id in ids])
+    print(f'{"largest difference from tables":>36}: {numpy.abs(states - expected).max():.2e}')
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
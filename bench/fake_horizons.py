@@ -0,0 +1,90 @@
+"""Local stand-in for JPL Horizons used for benchmarking
+Serves the JSON format expected by horizons.HttpTransport, with synthetic circular orbits
+and an artificial per-request latency. Connections are kept alive between requests.
+A fraction of requests can be failed with a 503 to exercise retries and the circuit breaker,
+and ids that are multiples of NO_DATA_MODULUS are left out of responses as if they had no data
+
+Usage: python bench/fake_horizons.py [port] [latency in seconds] [failure rate]
+Then run the app with HORIZONS_URL=http://localhost:<port>/vectors"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import random
+import json
+import math
+import sys
+import time
+
+LATENCY = 0.2
+FAILURE_RATE = 0.0
+NO_DATA_MODULUS = 0     # no ids are left out if 0
+
+
+def fake_vectors(id, julian):
+    """Returns a deterministic circular orbit state for an id at a Julian date, in au and au/d"""
+    radius = 0.3 + (id % 97) * 0.1
+    period = 365.25 * radius ** 1.5
+    angle = 2 * math.pi * julian / period + id
+    speed = 2 * math.pi * radius / period
+    return [radius * math.cos(angle), radius * math.sin(angle), 0.0,
+            -speed * math.sin(angle), speed * math.cos(angle), 0.0]
+
+
+class FakeHorizonsServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog deep enough for bursts of concurrent connections
+    latency, failure_rate and no_data_modulus default to the module settings and can be changed while serving"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, handler, latency=None, failure_rate=None, no_data_modulus=None):
+        super().__init__(address, handler)
+        self.latency = LATENCY if latency is None else latency
+        self.failure_rate = FAILURE_RATE if failure_rate is None else failure_rate
+        self.no_data_modulus = NO_DATA_MODULUS if no_data_modulus is None else no_data_modulus
+        self.connections = 0
+        self.requests = 0
+
+
+class FakeHorizonsHandler(BaseHTTPRequestHandler):
+    """Responds to vector queries after sleeping for the configured latency"""
+
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, which would otherwise stall kept-alive connections on delayed acks
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests += 1
+        query = parse_qs(urlparse(self.path).query)
+        ids = [int(id) for id in query['ids'][0].split(',')]
+        epochs = [float(epoch) for epoch in query['epochs'][0].split(',')]
+        time.sleep(self.server.latency)
+
+        if random.random() < self.server.failure_rate:
+            self.send_error(503)
+            return
+        modulus = self.server.no_data_modulus
+        body = json.dumps({'vectors': {id: [fake_vectors(id, epoch) for epoch in epochs]
+                                       for id in ids if not modulus or id % modulus}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8500
+    if len(sys.argv) > 2:
+        LATENCY = float(sys.argv[2])
+    if len(sys.argv) > 3:
+        FAILURE_RATE = float(sys.argv[3])
+    print(f'Fake Horizons listening on http://localhost:{port}/vectors with {LATENCY}s latency '
+          f'and {FAILURE_RATE:.0%} of requests failing')
+    FakeHorizonsServer(('', port), FakeHorizonsHandler).serve_forever()
@@ -0,0 +1,59 @@
+"""Measures the throughput and accuracy of the vectorized Kepler propagator in kepler.py
+
+Usage: python bench/kepler_bench.py [bodies] [epochs]
+
+Reports body-epochs per second for catalogues of main-belt, eccentric and hyperbolic orbits,
+and the largest residual of Kepler's equation over a million random mean anomalies"""
+import os
+import sys
+import time
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import kepler
+
+J2000 = 2451545.0
+
+
+def make_elements(n, rng, e_low, e_high, a_low, a_high):
+    """Returns random elements for n bodies, as the arguments of kepler.propagate before the epochs"""
+    return (rng.uniform(a_low, a_high, n), rng.uniform(e_low, e_high, n), rng.uniform(0, 0.6, n),
+            rng.uniform(0, 2 * numpy.pi, n), rng.uniform(0, 2 * numpy.pi, n), rng.uniform(0, 2 * numpy.pi, n),
+            numpy.full(n, J2000))
+
+
+def throughput(elements, julians, repeats=3):
+    """Returns the best body-epochs per second over a few runs"""
+    best = numpy.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        kepler.propagate(*elements, julians)
+        best = min(best, time.perf_counter() - start)
+    return len(elements[0]) * len(julians) / best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    m = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rng = numpy.random.default_rng(0)
+    julians = J2000 + numpy.linspace(-3650, 3650, m)
+
+    print(f'{n} bodies x {m} epochs')
+    for name, ranges in [('main belt, e < 0.3', (0, 0.3, 2.1, 3.3)),
+                         ('eccentric, 0.6 < e < 0.99', (0.6, 0.99, 1, 30)),
+                         ('hyperbolic, 1 < e < 3', (1.001, 3, -20, -0.5))]:
+        rate = throughput(make_elements(n, rng, *ranges), julians)
+        print(f'{name:>26}: {rate:10.3g} body-epochs/s')
+
+    mean = rng.uniform(-100, 100, 10 ** 6)
+    e = rng.uniform(0, 0.999, 10 ** 6)
+    ecc_anomaly = kepler.solve_elliptic(mean, e)
+    wrapped = numpy.remainder(mean + numpy.pi, 2 * numpy.pi) - numpy.pi
+    print(f'max elliptic residual {numpy.abs(ecc_anomaly - e * numpy.sin(ecc_anomaly) - wrapped).max():.2e} rad')
+    e = rng.uniform(1.001, 10, 10 ** 6)
+    hyp_anomaly = kepler.solve_hyperbolic(mean, e)
+    print(f'max hyperbolic residual {numpy.abs(e * numpy.sinh(hyp_anomaly) - hyp_anomaly - mean).max():.2e} rad')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Times osculating.osculating_elements and checks it against the elements states were propagated from
+
+Usage: python bench/osculating_bench.py [bodies] [epochs]
+
+States are generated with kepler.propagate from random elliptic and hyperbolic elements
+at one epoch, so the elements recovered from them should match the ones propagated"""
+import os
+import sys
+import time
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from osculating import osculating_elements
+from kepler import propagate
+from propagation import G
+
+GM_SUN = G * 1.9884e+30     # km^3/s^2
+
+
+def angle_error(x, y):
+    """Returns the largest difference between two arrays of angles, allowing for wrapping"""
+    return numpy.abs(numpy.remainder(x - y + numpy.pi, 2 * numpy.pi) - numpy.pi).max()
+
+
+def check(name, n, rng, a, e, mean_anomaly):
+    """Propagates n random orbits to their epoch and compares the recovered elements"""
+    i = rng.uniform(0, numpy.pi, n)
+    long_asc, arg_peri = rng.uniform(0, 2 * numpy.pi, (2, n))
+    states = propagate(a, e, i, long_asc, arg_peri, mean_anomaly, numpy.zeros(n), numpy.zeros(1), GM_SUN)[:, 0]
+    elements = osculating_elements(states, GM_SUN)
+    print(f'{name:>10}: a {numpy.abs(elements["a"] / a - 1).max():.1e} (relative), e {numpy.abs(elements["e"] - e).max():.1e}, '
+          f'i {angle_error(elements["i"], i):.1e}, long_asc {angle_error(elements["long_asc"], long_asc):.1e}, '
+          f'arg_peri {angle_error(elements["arg_peri"], arg_peri):.1e}, '
+          f'mean_anomaly {angle_error(elements["mean_anomaly"], mean_anomaly):.1e} rad')
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    epochs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rng = numpy.random.default_rng(0)
+
+    check('elliptic', n, rng, rng.uniform(5e7, 5e9, n), rng.uniform(0.001, 0.99, n), rng.uniform(0, 2 * numpy.pi, n))
+    check('hyperbolic', n, rng, -rng.uniform(1e7, 1e9, n), rng.uniform(1.01, 4, n), rng.uniform(-5, 5, n))
+
+    a, e = rng.uniform(5e7, 5e9, n), rng.uniform(0, 0.3, n)
+    i, long_asc, arg_peri, mean_anomaly = rng.uniform(0, 2 * numpy.pi, (4, n))
+    states = propagate(a, e, i, long_asc, arg_peri, mean_anomaly, numpy.zeros(n), numpy.linspace(0, 1e7, epochs), GM_SUN)
+    start = time.perf_counter()
+    osculating_elements(states, GM_SUN)
+    elapsed = time.perf_counter() - start
+    print(f'{n} bodies x {epochs} epochs in {elapsed:.3f} s, {n * epochs / elapsed:.2e} body-epochs/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Times seed.py loading the bundled catalogue and a synthetic catalogue of small bodies
+
+Usage: python bench/seed_bench.py [bodies]
+
+Loads into a fresh SQLite database in a temporary directory unless DATABASE_URL is set.
+Each catalogue is loaded twice: into empty tables, then again over itself, as an incremental
+update that rewrites every row"""
+import os
+import sys
+import csv
+import time
+import tempfile
+import numpy
+
+tmp = tempfile.mkdtemp()
+os.environ.setdefault('DATABASE_URL', f'sqlite:///{tmp}/seed_bench.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import app
+from seed import read_catalogue, load_catalogue, DATA_DIR
+
+FIRST_ID = 2000001      # above the ids Horizons uses for numbered asteroids in the bundled catalogue
+
+
+def write_synthetic(directory, n, rng):
+    """Writes the bundled systems and objects plus n synthetic asteroids, each with one alternate name"""
+    os.makedirs(directory, exist_ok=True)
+    catalogue = read_catalogue(DATA_DIR)
+    columns = list(catalogue['objects'][0])
+    ids = numpy.arange(FIRST_ID, FIRST_ID + n)
+    radius = 10 ** rng.uniform(-1, 2.5, n)
+    mass = 2000 * 4 / 3 * numpy.pi * (radius * 1000) ** 3
+
+    with open(os.path.join(directory, 'systems.csv'), 'w', newline='') as file:
+        writer = csv.DictWriter(file, ['id', 'name'])
+        writer.writeheader()
+        writer.writerows(catalogue['systems'])
+    with open(os.path.join(directory, 'objects.csv'), 'w', newline='') as file:
+        writer = csv.DictWriter(file, columns)
+        writer.writeheader()
+        writer.writerows(catalogue['objects'])
+        for id, r, m in zip(ids, radius, mass):
+            writer.writerow({'id': id, 'name': f'Synthetic {id}', 'designation': f'S{id}', 'obj_type': 'Asteroid',
+                             'mass': m, 'radius_x': r, 'radius_y': r, 'radius_z': r})
+    with open(os.path.join(directory, 'alt_names.csv'), 'w', newline='') as file:
+        writer = csv.DictWriter(file, ['obj_id', 'name'])
+        writer.writeheader()
+        writer.writerows(catalogue['alt_names'])
+        writer.writerows({'obj_id': id, 'name': f'Minor Planet {id}'} for id in ids)
+
+
+def timed_load(name, directory):
+    """Reads and loads a catalogue, printing the time taken by each step"""
+    start = time.perf_counter()
+    catalogue = read_catalogue(directory)
+    read_time = time.perf_counter() - start
+    report = load_catalogue(catalogue)
+    print(f'{name:>28}: {report["objects"]:>7} objects, read {read_time:6.2f} s, write {report["write_time"]:6.2f} s, '
+          f'commit {report["commit_time"]:5.2f} s, sets {report["sets_time"]:5.2f} s, '
+          f'total {read_time + report["total_time"]:6.2f} s')
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    synthetic = os.path.join(tmp, 'synthetic')
+    write_synthetic(synthetic, n, numpy.random.default_rng(0))
+
+    from models import db
+    db.create_all()
+    print(f'database {os.environ["DATABASE_URL"]}')
+    timed_load('bundled catalogue', DATA_DIR)
+    timed_load('bundled catalogue, reload', DATA_DIR)
+    timed_load(f'{n} synthetic bodies', synthetic)
+    timed_load(f'{n} synthetic bodies, reload', synthetic)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Exercises the upstream client in horizons.py against bench/fake_horizons.py served in-process
+
+Usage: python bench/upstream_bench.py [objects]
+
+Four scenarios, each fetching one epoch for every object in batches of BATCH ids:
+pooled keep-alive connections against a new connection per request, how many objects survive
+a failing upstream with and without retries, how fast batches fail once the circuit is open against
+waiting out every timeout, and how long a batch takes and what it returns when it hits its deadline"""
+import os
+import sys
+import time
+import json
+import threading
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from horizons import HttpTransport, UpstreamClient, CircuitBreaker, fetch_batch, MAX_WORKERS, BATCH_DEADLINE
+from fake_horizons import FakeHorizonsServer, FakeHorizonsHandler
+
+PORT = 8596
+URL = f'http://localhost:{PORT}/vectors'
+BATCH = 10
+EPOCHS = [2460000.5]
+
+
+class UnpooledTransport(HttpTransport):
+    """HttpTransport as it was before pooling, opening a new connection for every request"""
+
+    def vectors(self, ids, id_type, center, epochs, timeout):
+        query = urllib.parse.urlencode({'ids': ','.join(str(id) for id in ids), 'id_type': id_type, 'center': center,
+                                        'epochs': ','.join(repr(epoch) for epoch in epochs)})
+        with urllib.request.urlopen(f'{self.url}?{query}', timeout=timeout) as res:
+            body = json.load(res)
+        return {int(id): [tuple(row) for row in rows] for id, rows in body['vectors'].items()}
+
+
+def run(server, ids, client, deadline=None, rounds=1):
+    """Fetches ids rounds times through client, returning the mean time per batch, the share of objects
+    returned and the number of connections the server accepted"""
+    server.connections = 0
+    found = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = fetch_batch(ids, 10, EPOCHS, client, timeout=1, deadline=deadline)
+        found += sum(rows is not None for rows in results.values())
+    return (time.perf_counter() - start) / rounds, found / (len(ids) * rounds), server.connections
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ids = list(range(1000, 1000 + n))
+    server = FakeHorizonsServer(('127.0.0.1', PORT), FakeHorizonsHandler, latency=0.0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f'{n} objects in batches of {BATCH}, {MAX_WORKERS} workers')
+    for name, transport in [('new connection per request', UnpooledTransport(URL, BATCH)),
+                            ('pooled keep-alive', HttpTransport(URL, BATCH))]:
+        elapsed, _, connections = run(server, ids, UpstreamClient(transport), rounds=5)
+        print(f'{name:>36}: {elapsed * 1000:7.1f} ms per batch, {connections // 5:>5} connections per batch')
+
+    server.failure_rate = 0.3
+    for retries in [0, 1, 2, 3]:
+        client = UpstreamClient(HttpTransport(URL, BATCH), retries=retries, backoff=0.01,
+                                breaker=CircuitBreaker(threshold=10 ** 9))
+        elapsed, share, _ = run(server, ids, client, rounds=3)
+        print(f'{f"30% failing, {retries} retries":>36}: {elapsed * 1000:7.1f} ms per batch, {share:6.1%} of objects returned, '
+              f'{client.stats()["requests"]} requests')
+
+    server.failure_rate = 1.0
+    server.latency = 0.05
+    for name, threshold in [('upstream down, no circuit breaker', 10 ** 9), ('upstream down, circuit breaker', 5)]:
+        client = UpstreamClient(HttpTransport(URL, BATCH), retries=2, backoff=0.01, breaker=CircuitBreaker(threshold, 30))
+        elapsed, share, _ = run(server, ids, client, rounds=3)
+        stats = client.stats()
+        print(f'{name:>36}: {elapsed * 1000:7.1f} ms per batch, {stats["requests"]:>5} requests, '
+              f'{stats["circuit_open"]} objects refused, circuit {stats["circuit"]}')
+
+    server.failure_rate = 0.0
+    server.latency = 0.2
+    server.no_data_modulus = 7
+    for deadline in [None, 0.5]:
+        client = UpstreamClient(HttpTransport(URL, BATCH))
+        elapsed, share, _ = run(server, ids[:BATCH * MAX_WORKERS * 4], client, deadline=deadline)
+        stats = client.stats()
+        print(f'{f"200 ms latency, deadline {deadline or BATCH_DEADLINE:g} s":>36}: {elapsed * 1000:7.1f} ms per batch, '
+              f'{share:6.1%} of objects returned, {stats["no_data"]} without data, {stats["deadline"]} past the deadline')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""Offline ephemeris bundles: Chebyshev segments for a fixed set of objects in one memory-mapped file
+
+Usage:
+    python bundle.py export <path> <start> <stop> [--sets full,outer,...] [--center 0] [--segment DAYS] [--degree N]
+    python bundle.py info <path>
+
+Dates are given as YYYY-MM-DD. The export fetches vectors from JPL Horizons for every object in the
+named object sets, every set if none are named, fits Chebyshev segments like ingest.py and writes them to path.
+Each object's segments are as long as its orbit allows, see chebyshev.segment_plans, and segments that miss
+the fit tolerance are left uncovered and listed by the export and by info.
+Objects with orbital elements are left out, since kepler.py propagates them without the network.
+
+With EPHEMERIS_BUNDLE set to a bundle's path the app runs offline: the ephemeris cache answers every state
+request from the bundle and never queries JPL Horizons, the database cache or the stored Chebyshev tables.
+Objects and dates the bundle does not cover come back unavailable. States relative to another center
+are derived from the center's own state when the center is in the bundle.
+
+A bundle is a JSON header followed by five columns: the object ids, each object's segment length,
+the offset of each object's first segment, a flag per segment saying whether it was covered, and the coefficients,
+with each object's segments stored together. An object's segments all span the same number of days from
+the bundle's start, so the segment holding a date is found by division and the row of an object by one dict lookup. Opening a bundle only reads the header
+and maps the columns, so startup time does not depend on the size of the file"""
+from chebyshev import fit_segments, segment_plans, segment_grid, segment_samples
+from horizons import fetch_batch
+from object_sets import get_id_list, load_sets, UnknownSetError
+from registry import get_registry
+import threading
+import datetime
+import argparse
+import json
+import numpy
+import os
+
+BUNDLE_PATH = os.environ.get('EPHEMERIS_BUNDLE')     # offline mode if set
+MAGIC = b'EPHEMBDL'
+VERSION = 2
+ALIGNMENT = 64          # byte alignment of each column in the file
+EPOCHS_PER_REQUEST = 100
+DEADLINE = 3600         # seconds each upstream batch may take, see ingest.py
+
+_bundle = None
+_bundle_lock = threading.Lock()
+
+
+class Bundle:
+    """A bundle file mapped into memory, see the module docstring"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not an ephemeris bundle')
+            length = int.from_bytes(file.read(8), 'little')
+            self.header = json.loads(file.read(length))
+        if self.header['version'] != VERSION:
+            raise ValueError(f'{path} is bundle version {self.header["version"]}, expected {VERSION}')
+
+        self.center = self.header['center']
+        self.start = self.header['start']                   # Julian dates covered by every object
+        self.end = self.header['end']
+        columns = {name: numpy.memmap(path, dtype=column['dtype'], mode='r', offset=column['offset'],
+                                      shape=tuple(column['shape']))
+                   for name, column in self.header['columns'].items()}
+        self.ids = columns['ids']
+        self.segment_days = columns['segment_days']         # segment length of each object
+        self.offsets = columns['offsets']                   # index of each object's first segment, then the total
+        self.covered = columns['covered']                   # bool per segment
+        self.coeffs = columns['coeffs']                     # (segments, 6, degree + 1) in au and au/d
+        self.rows = {id: row for row, id in enumerate(self.ids.tolist())}
+        self.lookups = 0
+        self.misses = 0
+
+    def evaluate(self, rows, julians):
+        """Evaluates the segments of the objects at rows at every date in julians
+        Returns an (len(rows), len(julians), 6) array in au and au/d, NaN where the bundle has no segment"""
+        rows = numpy.asarray(rows, dtype=numpy.intp)
+        julians = numpy.asarray(julians, dtype=float)
+        segment_days = self.segment_days[rows][:, numpy.newaxis]
+        first, count = self.offsets[rows][:, numpy.newaxis], numpy.diff(self.offsets)[rows][:, numpy.newaxis]
+        position = (julians[numpy.newaxis, :] - self.start) / segment_days
+        # a date on the end of the last segment belongs to it
+        inside = (julians >= self.start) & (julians <= self.end)
+        segment = numpy.where(inside, numpy.minimum(numpy.floor(position), count - 1), 0).astype(numpy.intp)
+        s = 2 * (position - segment) - 1
+        index = first + segment
+
+        # Clenshaw recurrence over every object and date at once, as in numpy.polynomial.chebyshev.chebval
+        coeffs = self.coeffs[index]
+        s = numpy.broadcast_to(s[..., numpy.newaxis], coeffs.shape[:3])
+        b1 = b2 = 0.0
+        for j in range(coeffs.shape[-1] - 1, 0, -1):
+            b1, b2 = 2 * s * b1 - b2 + coeffs[..., j], b1
+        states = s * b1 - b2 + coeffs[..., 0]
+
+        available = self.covered[index] & inside
+        states[~available] = numpy.nan
+        return states
+
+    def lookup(self, ids, center, epochs):
+        """Returns vectors for multiple objects like cache.get_cached_batch, read only from the bundle
+        A dict mapping each id to a list of rows, one per epoch, or None if the bundle does not cover every epoch"""
+        results = {id: None for id in ids}
+        found = [id for id in ids if id in self.rows]
+        if center != self.center and center not in self.rows:
+            found = []
+        if found:
+            states = self.evaluate([self.rows[id] for id in found], epochs)
+            if center != self.center:
+                states = states - self.evaluate([self.rows[center]], epochs)
+            complete = ~numpy.isnan(states).any(axis=(1, 2))
+            for id, rows, ok in zip(found, states.tolist(), complete):
+                if ok:
+                    results[id] = rows
+        missing = sum(rows is None for rows in results.values())
+        with _bundle_lock:
+            self.lookups += len(ids)
+            self.misses += missing
+        return results
+
+    def stats(self):
+        """Returns the span and size of the bundle and how many object lookups it could not answer"""
+        return {'path': self.path, 'objects': len(self.ids), 'center': self.center,
+                'start': self.start, 'end': self.end, 'lookups': self.lookups, 'misses': self.misses}
+
+
+def get_bundle():
+    """Returns the bundle at EPHEMERIS_BUNDLE, opening it on first use, or None when not running offline"""
+    global _bundle
+    if BUNDLE_PATH is None:
+        return None
+    with _bundle_lock:
+        if _bundle is None:
+            _bundle = Bundle(BUNDLE_PATH)
+    return _bundle
+
+
+def column_layout(header_size, columns):
+    """Returns the offset of each column, given as (name, dtype, shape), after the header, and the size of the file"""
+    layout, offset = {}, header_size
+    for name, dtype, shape in columns:
+        offset += -offset % ALIGNMENT
+        layout[name] = {'dtype': numpy.dtype(dtype).str, 'shape': list(shape), 'offset': offset}
+        offset += numpy.dtype(dtype).itemsize * int(numpy.prod(shape))
+    return layout, offset
+
+
+def create(path, ids, center, start, end, segment_days, degree):
+    """Writes an empty bundle with every segment uncovered, for objects with the segment lengths in segment_days
+    Returns the offsets, covered and coeffs columns, mapped for writing"""
+    counts = [max(1, int(numpy.ceil((end - start) / days - 1e-9))) for days in segment_days]
+    total = sum(counts)
+    columns = [('ids', '<i8', (len(ids),)), ('segment_days', '<f8', (len(ids),)), ('offsets', '<i8', (len(ids) + 1,)),
+               ('covered', '|b1', (total,)), ('coeffs', '<f8', (total, 6, degree + 1))]
+    header = {'version': VERSION, 'center': center, 'start': start, 'end': end, 'degree': degree,
+              'created': datetime.datetime.utcnow().isoformat()}
+    # the header is padded to a fixed size so the offsets written into it do not change its length
+    size = len(json.dumps(dict(header, columns=column_layout(0, columns)[0]))) + 64
+    header['columns'], length = column_layout(len(MAGIC) + 8 + size, columns)
+    encoded = json.dumps(header).encode().ljust(size)
+
+    with open(path, 'wb') as file:
+        file.write(MAGIC + size.to_bytes(8, 'little') + encoded)
+        file.truncate(length)
+    mapped = {name: numpy.memmap(path, dtype=column['dtype'], mode='r+', offset=column['offset'],
+                                 shape=tuple(column['shape']))
+              for name, column in header['columns'].items()}
+    mapped['ids'][:] = ids
+    mapped['segment_days'][:] = segment_days
+    mapped['offsets'][:] = numpy.concatenate(([0], numpy.cumsum(counts)))
+    return mapped['offsets'], mapped['covered'], mapped['coeffs']
+
+
+def export(path, ids, center, start, stop, segment_days, degree, transport=None):
+    """Fetches vectors for ids from start to stop, Julian dates, and writes a bundle of segments fitted to them
+    Segments are at most segment_days long, shorter for bodies with short orbits, see chebyshev.segment_plans.
+    They are fetched a request at a time and written straight to the file, so memory use does not grow with the span.
+    A segment an object had no data for, or whose fit missed the tolerance, is left uncovered for that object only.
+    Returns the number of segments written and a dict mapping each id with uncovered segments to how many"""
+    plans = segment_plans(ids, center, start, segment_days, transport)
+    temporary = f'{path}.tmp'
+    offsets, covered, coeffs = create(temporary, ids, center, start, stop, [plans[id] for id in ids], degree)
+    per_request = max(1, (EPOCHS_PER_REQUEST - 1) // segment_samples(degree))
+
+    for days in sorted(set(plans.values()), reverse=True):
+        rows = [row for row, id in enumerate(ids) if plans[id] == days]
+        segments = int(offsets[rows[0] + 1] - offsets[rows[0]])
+        for first in range(0, segments, per_request):
+            count = min(per_request, segments - first)
+            julians = segment_grid(start + first * days, count, days, degree)
+            vectors = fetch_batch([ids[row] for row in rows], center, julians.tolist(), transport, deadline=DEADLINE)
+            for row in rows:
+                if not vectors[ids[row]]:
+                    continue
+                for k, (_, _, fitted) in enumerate(fit_segments(julians, vectors[ids[row]], days, degree)):
+                    if fitted is not None:
+                        coeffs[offsets[row] + first + k] = fitted
+                        covered[offsets[row] + first + k] = True
+    coeffs.flush()
+    covered.flush()
+    uncovered = {}
+    for row, id in enumerate(ids):
+        missing = int((~covered[offsets[row]:offsets[row + 1]]).sum())
+        if missing:
+            uncovered[id] = missing
+    total = int(offsets[-1])
+    del offsets, covered, coeffs
+    os.replace(temporary, path)
+    return total, uncovered
+
+
+def export_ids(names):
+    """Returns the ids in the named object sets, or in every set, without duplicates or objects with orbital elements
+    Raises UnknownSetError for a name that is not an object set"""
+    registry = get_registry()
+    sets = [get_id_list(name) for name in names] if names else list(load_sets(registry).values())
+    ids = []
+    for id in (id for object_set in sets for id in object_set):
+        if id not in ids:
+            ids.append(id)
+    analytic = registry.elements.find(ids) >= 0
+    return [id for id, skip in zip(ids, analytic) if not skip]
+
+
+if __name__ == '__main__':
+    from app import app
+    from julian import to_jd
+
+    parser = argparse.ArgumentParser(description='Export or inspect an offline ephemeris bundle')
+    parser.add_argument('command', choices=['export', 'info'])
+    parser.add_argument('path')
+    parser.add_argument('start', nargs='?')
+    parser.add_argument('stop', nargs='?')
+    parser.add_argument('--sets', type=lambda value: value.split(','), default=[],
+                        help='comma separated object sets to export, every set if omitted')
+    parser.add_argument('--center', type=int, default=0)
+    parser.add_argument('--segment', type=float, default=2, help='longest span covered by a segment, in days')
+    parser.add_argument('--degree', type=int, default=11)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        if not args.start or not args.stop:
+            parser.error('export needs a start and stop date')
+        start, stop = (to_jd(datetime.datetime.strptime(date, '%Y-%m-%d'), fmt='jd') for date in [args.start, args.stop])
+        try:
+            ids = export_ids(args.sets)
+        except UnknownSetError as exc:
+            parser.error(str(exc))
+        segments, uncovered = export(args.path, ids, args.center, start, stop, args.segment, args.degree)
+        print(f'wrote {len(ids)} objects, {segments} segments to {args.path}, {os.path.getsize(args.path) / 1e6:.1f} MB')
+        for id, missing in uncovered.items():
+            print(f'{id}: {missing} segments uncovered, missing data or the fit tolerance')
+    else:
+        bundle = Bundle(args.path)
+        header = {key: value for key, value in bundle.header.items() if key != 'columns'}
+        print(json.dumps(header, indent=1))
+        for row, id in enumerate(bundle.ids.tolist()):
+            covered = bundle.covered[bundle.offsets[row]:bundle.offsets[row + 1]]
+            if not covered.all():
+                print(f'{id}: {covered.mean():.1%} of {len(covered)} {bundle.segment_days[row]:g} day segments covered')
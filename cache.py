@@ -0,0 +1,254 @@
+from models import db, Ephemeris
+from horizons import fetch_batch, fetch_batch_async, get_client
+from chebyshev import evaluate_batch
+from bundle import get_bundle
+from db_utils import upsert
+from sqlalchemy.exc import SQLAlchemyError
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
+import asyncio
+import datetime
+import time
+import os
+
+CACHE_SIZE = int(os.environ.get('EPHEMERIS_CACHE_SIZE', 20000))     # max entries held in memory
+CACHE_TTL = float(os.environ.get('EPHEMERIS_CACHE_TTL', 3600))       # seconds an in-memory entry stays valid
+DB_CACHE_TTL = float(os.environ.get('EPHEMERIS_DB_TTL', 30 * 86400))  # seconds a database entry stays valid
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with a maximum size and a time to live for each entry
+    Keeps hit, miss and eviction counters for sizing"""
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Returns the value stored for key, or None if it is missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        """Stores value for key, evicting the least recently used entries if the cache is full"""
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all entries"""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Returns the cache counters"""
+        return {'size': len(self.entries),
+                'max_size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
+
+
+class SingleFlight:
+    """Tracks upstream fetches in progress, keyed by (object id, center, Julian date),
+    so concurrent requests for the same vectors share one fetch instead of each querying upstream"""
+
+    def __init__(self):
+        self.calls = {}             # key to a Future resolved with the row, or None if no data was available
+        self.lock = threading.Lock()
+        self.fetched = 0
+        self.shared = 0
+
+    def claim(self, ids, center, epochs):
+        """Registers the caller as the fetcher of every key not already in flight
+        Returns the ids the caller must fetch, the keys it claimed, and a dict mapping each id
+        that is entirely in flight elsewhere to the futures of its rows, one per epoch"""
+        owned, claimed, waiting = [], [], {}
+        with self.lock:
+            for id in ids:
+                keys = [(id, center, epoch) for epoch in epochs]
+                new_keys = [key for key in keys if key not in self.calls]
+                if new_keys:
+                    for key in new_keys:
+                        self.calls[key] = Future()
+                    owned.append(id)
+                    claimed.extend(new_keys)
+                else:
+                    waiting[id] = [self.calls[key] for key in keys]
+            self.fetched += len(owned)
+            self.shared += len(waiting)
+        return owned, claimed, waiting
+
+    def release(self, claimed, epochs, results):
+        """Resolves the claimed keys with the fetched rows, or None for objects with no data
+        Must be called once the fetch is finished, even if it failed, so waiting requests are not left hanging"""
+        index = {epoch: i for i, epoch in enumerate(epochs)}
+        with self.lock:
+            futures = [(key, self.calls.pop(key)) for key in claimed]
+        for (id, center, epoch), future in futures:
+            rows = results.get(id)
+            future.set_result(rows[index[epoch]] if rows else None)
+
+    def stats(self):
+        """Returns the number of objects fetched and the number served by another request's fetch"""
+        return {'in_flight': len(self.calls), 'fetched': self.fetched, 'shared': self.shared}
+
+
+memory_cache = LRUCache(CACHE_SIZE, CACHE_TTL)
+in_flight = SingleFlight()
+db_stats = {'hits': 0, 'misses': 0}
+db_stats_lock = threading.Lock()
+
+
+def get_cached_batch(ids, center, epochs):
+    """Returns vectors for multiple objects, evaluating precomputed Chebyshev segments where they cover
+    the requested epochs, then checking the in-memory cache, then the shared database cache, then JPL Horizons
+    Cache entries are keyed by (object id, center, Julian date), and objects already being fetched
+    for a concurrent request are waited for rather than fetched again
+    Returns a dict mapping each id to a list of rows, one per epoch, or None if no data was available
+    In offline mode every lookup is answered from the ephemeris bundle alone, see bundle.py"""
+    bundle = get_bundle()
+    if bundle is not None:
+        return bundle.lookup(ids, center, epochs)
+    results, missing = get_local_batch(ids, center, epochs)
+    if missing:
+        owned, claimed, waiting = in_flight.claim(missing, center, epochs)
+        try:
+            if owned:
+                store_fetched(results, center, epochs, fetch_batch(owned, center, epochs))
+        finally:
+            in_flight.release(claimed, epochs, results)
+        for id, futures in waiting.items():
+            results[id] = shared_rows([future.result() for future in futures])
+    return results
+
+
+async def get_cached_batch_async(ids, center, epochs):
+    """Coroutine version of get_cached_batch that awaits the upstream fetch for objects missing from every cache tier
+    The local cache tiers and the database writes run on a thread, so they do not block the event loop"""
+    bundle = get_bundle()
+    if bundle is not None:
+        return await asyncio.to_thread(bundle.lookup, ids, center, epochs)
+    results, missing = await asyncio.to_thread(get_local_batch, ids, center, epochs)
+    if missing:
+        owned, claimed, waiting = in_flight.claim(missing, center, epochs)
+        try:
+            if owned:
+                fetched = await fetch_batch_async(owned, center, epochs)
+                await asyncio.to_thread(store_fetched, results, center, epochs, fetched)
+        finally:
+            in_flight.release(claimed, epochs, results)
+        for id, futures in waiting.items():
+            results[id] = shared_rows(await asyncio.gather(*[asyncio.wrap_future(future) for future in futures]))
+    return results
+
+
+def shared_rows(rows):
+    """Returns the rows fetched by another request for one object, or None if any epoch had no data"""
+    return None if None in rows else list(rows)
+
+
+def get_local_batch(ids, center, epochs):
+    """Looks up vectors in the Chebyshev segments, the in-memory cache and the database cache
+    Returns a dict of the vectors found and a list of the ids that must be fetched from upstream"""
+    results = evaluate_batch(ids, center, epochs)
+    missing = []
+    for id in ids:
+        if id in results:
+            continue
+        rows = [memory_cache.get((id, center, epoch)) for epoch in epochs]
+        if None in rows:
+            missing.append(id)
+        else:
+            results[id] = rows
+
+    if missing:
+        found = get_db_rows(missing, center, epochs)
+        for id in missing:
+            rows = [found.get((id, epoch)) for epoch in epochs]
+            with db_stats_lock:
+                db_stats['misses'] += rows.count(None)
+                db_stats['hits'] += len(rows) - rows.count(None)
+            if None in rows:
+                continue
+            results[id] = rows
+            for epoch, row in zip(epochs, rows):
+                memory_cache.set((id, center, epoch), row)
+        missing = [id for id in missing if id not in results]
+
+    return results, missing
+
+
+def store_fetched(results, center, epochs, fetched):
+    """Adds vectors fetched from upstream to results and to both cache tiers"""
+    # objects without data for the requested epochs are not cached,
+    # since the upstream may just have failed for this request
+    store_db_rows(center, epochs, {id: rows for id, rows in fetched.items() if rows})
+    for id, rows in fetched.items():
+        results[id] = rows
+        if rows:
+            for epoch, row in zip(epochs, rows):
+                memory_cache.set((id, center, epoch), row)
+
+
+def get_db_rows(ids, center, epochs):
+    """Loads cached vectors from the database in a single query
+    Returns a dict mapping (id, epoch) to a row"""
+    oldest = datetime.datetime.utcnow() - datetime.timedelta(seconds=DB_CACHE_TTL)
+    try:
+        entries = Ephemeris.query.filter(Ephemeris.center == center,
+                                         Ephemeris.obj_id.in_(ids),
+                                         Ephemeris.julian.in_(epochs),
+                                         Ephemeris.created >= oldest).all()
+    except SQLAlchemyError:
+        db.session.rollback()
+        return {}
+    return {(entry.obj_id, entry.julian): entry.vectors() for entry in entries}
+
+
+def store_db_rows(center, epochs, vectors):
+    """Writes freshly fetched vectors to the database in bulk, see seed.upsert
+    Rows that are already stored, such as expired ones, are overwritten
+    A write that fails, for example because a concurrent request holds a lock on the same rows, is dropped"""
+    if not vectors:
+        return
+    now = datetime.datetime.utcnow()
+    rows = [{'obj_id': id, 'center': center, 'julian': epoch, 'created': now,
+             'x': row[0], 'y': row[1], 'z': row[2], 'vx': row[3], 'vy': row[4], 'vz': row[5]}
+            for id, rows in vectors.items() for epoch, row in zip(epochs, rows)]
+    try:
+        upsert(Ephemeris, rows)
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+
+
+def get_cache_stats():
+    """Returns hit and miss counters for both cache tiers, how many upstream fetches were shared,
+    and the upstream client's request, retry and failure counters, or the bundle's lookups in offline mode"""
+    with db_stats_lock:
+        database = dict(db_stats)
+    stats = {'memory': memory_cache.stats(), 'database': database, 'upstream': in_flight.stats()}
+    bundle = get_bundle()
+    if bundle is None:
+        stats['client'] = get_client().stats()
+    else:
+        stats['bundle'] = bundle.stats()
+    return stats
@@ -0,0 +1,119 @@
+"""Loads small-body orbital element catalogues, such as asteroid and comet exports from the
+JPL Small-Body Database, into the Objects and Orbital-Elements tables
+
+Usage: python catalogue.py <file> [--obj-type TYPE] [--max-magnitude H]
+
+The file is a CSV with the SBDB field names: spkid, name, pdes, kind, epoch (Julian date),
+e, a or q (au), i, om, w (degrees), ma (degrees) or tp (Julian date), and optionally H, diameter (km)
+and GM (km^3/s^2). spkid becomes the object id. Rows are upserted in bulk in one transaction,
+so a catalogue can be reloaded to update its elements. Bodies already in the database under
+another id, such as the dwarf planets queried from Horizons, keep their Horizons ephemerides and are skipped,
+as are rows missing a field the orbit needs and exactly parabolic orbits, which have no semi-major axis.
+Hyperbolic orbits get a negative semi-major axis"""
+from models import db, Object, OrbitalElements
+from registry import get_registry, reset_registry, bump_version
+from db_utils import upsert, create_indexes
+from kepler import GM_SUN
+from propagation import G
+import argparse
+import time
+import math
+import csv
+
+DEFAULT_TYPE = 'Asteroid'
+KIND_TYPES = {'a': 'Asteroid', 'c': 'Comet'}   # SBDB kind starts with a for asteroids and c for comets
+REQUIRED = ['epoch', 'e', 'i', 'om', 'w']        # fields every row needs, besides a or q and ma or tp
+
+
+def value(row, key):
+    """Returns a field as a float, or None if it is missing or empty"""
+    field = row.get(key)
+    return float(field) if field not in [None, ''] else None
+
+
+def build_rows(rows, registry, obj_type=None, max_magnitude=None):
+    """Converts catalogue rows into Object and OrbitalElements rows
+    Returns both lists of rows and a dict counting the rows skipped for each reason"""
+    names = {record.name: record.id for record in registry.records.values() if record.name}
+    designations = {record.designation: record.id for record in registry.records.values() if record.designation}
+    objects, elements = [], []
+    skipped = {'existing': 0, 'incomplete': 0, 'parabolic': 0, 'faint': 0}
+
+    for row in rows:
+        id = int(row['spkid'])
+        name = row.get('name') or None
+        designation = row.get('pdes') or None
+        if names.get(name, id) != id or designations.get(designation, id) != id:
+            skipped['existing'] += 1
+            continue
+        magnitude = value(row, 'H')
+        if max_magnitude is not None and (magnitude is None or magnitude > max_magnitude):
+            skipped['faint'] += 1
+            continue
+        e, a, q = value(row, 'e'), value(row, 'a'), value(row, 'q')
+        missing = any(value(row, key) is None for key in REQUIRED)
+        if missing or (a is None and q is None) or (value(row, 'ma') is None and value(row, 'tp') is None):
+            skipped['incomplete'] += 1
+            continue
+        if e == 1:
+            skipped['parabolic'] += 1
+            continue
+
+        if a is None:
+            a = q / (1 - e)
+        epoch = value(row, 'epoch')
+        if value(row, 'ma') is not None:
+            mean_anomaly = math.radians(value(row, 'ma'))
+        else:
+            mean_anomaly = math.sqrt(GM_SUN / abs(a) ** 3) * (epoch - value(row, 'tp'))
+        i = math.radians(value(row, 'i'))
+        long_asc = math.radians(value(row, 'om'))
+        radius = value(row, 'diameter') / 2 if value(row, 'diameter') else None
+        gm = value(row, 'GM')
+
+        objects.append({'id': id, 'name': name, 'designation': designation,
+                        'obj_type': obj_type or KIND_TYPES.get((row.get('kind') or 'a')[0], DEFAULT_TYPE),
+                        'mass': gm / G if gm else None,
+                        'radius_x': radius, 'radius_y': radius, 'radius_z': radius,
+                        'solstice_angle': 0.0, 'axial_tilt': 0.0, 'inclination': i, 'long_asc': long_asc})
+        elements.append({'obj_id': id, 'epoch': epoch, 'a': a, 'e': e, 'i': i, 'long_asc': long_asc,
+                         'arg_peri': math.radians(value(row, 'w')), 'mean_anomaly': mean_anomaly,
+                         'abs_magnitude': magnitude})
+    return objects, elements, skipped
+
+
+def load_catalogue_file(path, obj_type=None, max_magnitude=None):
+    """Reads a catalogue file and upserts its bodies and elements in one transaction
+    Returns the number of bodies loaded, the rows skipped for each reason and the time taken, in seconds"""
+    start = time.perf_counter()
+    with open(path, newline='') as file:
+        rows = list(csv.DictReader(file))
+    objects, elements, skipped = build_rows(rows, get_registry(), obj_type, max_magnitude)
+    try:
+        upsert(Object, objects)
+        upsert(OrbitalElements, elements)
+        # the bulk statements bypass the session's change tracking, so other processes are told here
+        bump_version(db.session)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    # the bulk statements bypass the session's change tracking, so the registry is reset here
+    reset_registry()
+    return len(objects), skipped, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    from app import app
+
+    parser = argparse.ArgumentParser(description='Load a small-body orbital element catalogue')
+    parser.add_argument('file')
+    parser.add_argument('--obj-type', help='object type for every body, instead of one derived from the kind field')
+    parser.add_argument('--max-magnitude', type=float, help='skip bodies fainter than this absolute magnitude')
+    args = parser.parse_args()
+
+    db.create_all()
+    create_indexes()
+    loaded, skipped, elapsed = load_catalogue_file(args.file, args.obj_type, args.max_magnitude)
+    print(f'loaded {loaded} bodies in {elapsed:.2f} s, skipped ' +
+          ', '.join(f'{count} {reason}' for reason, count in skipped.items()))
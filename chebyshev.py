@@ -0,0 +1,207 @@
+from models import db, ChebyshevSegment
+from registry import get_registry
+from horizons import fetch_batch
+from sqlalchemy.exc import SQLAlchemyError
+from numpy.polynomial import chebyshev
+import threading
+import bisect
+import numpy
+import time
+import os
+
+# seconds before loaded segments are reloaded, so segments stored by another process such as warmer.py are picked up
+RELOAD_INTERVAL = float(os.environ.get('CHEBYSHEV_RELOAD', 600))
+# largest position error in km at the held-out samples for a segment to be kept, see fit_segments
+TOLERANCE = float(os.environ.get('CHEBYSHEV_TOLERANCE', 10))
+ORBIT_SEGMENTS = 8          # segments are at most this fraction of the orbital period around the body's primary
+MAX_SPLITS = 8              # segment lengths are the requested length halved at most this many times
+AU = 149597870.7            # km
+G = 6.67408e-20 * 86400 ** 2 / AU ** 3      # universal gravitational constant, au3/(kg*d2)
+
+
+class SegmentTable:
+    """Chebyshev segments for one object relative to one center, sorted by start date
+    Each segment holds separate position and velocity coefficients, like a type 3 SPK segment"""
+
+    def __init__(self, starts, ends, coeffs):
+        self.starts = starts        # list of segment start dates, Julian days
+        self.ends = ends            # list of segment end dates, Julian days
+        self.coeffs = coeffs        # list of (6, degree + 1) coefficient arrays in au and au/d
+
+    def find(self, julian):
+        """Returns the index of the segment containing julian, or None"""
+        i = bisect.bisect_right(self.starts, julian) - 1
+        if i < 0 or julian > self.ends[i]:
+            return None
+        return i
+
+    def evaluate(self, julian):
+        """Returns the (x, y, z, vx, vy, vz) row at julian in au and au/d, or None outside the covered span"""
+        i = self.find(julian)
+        if i is None:
+            return None
+        start = self.starts[i]
+        end = self.ends[i]
+        s = (2 * julian - start - end) / (end - start)
+        return tuple(float(value) for value in chebyshev.chebval(s, self.coeffs[i].T))
+
+
+_tables = None
+_tables_loaded = 0
+_tables_lock = threading.Lock()
+
+
+def segment_samples(degree):
+    """Returns the number of sample intervals per segment for a degree
+    Every other sample is held out of a trial fit that must still have degree + 1 samples, see fit_segments"""
+    return 2 * (degree + 1)
+
+
+def segment_grid(start, count, segment_days, degree):
+    """Returns the sample dates for count segments of segment_days from start, see segment_samples"""
+    samples = segment_samples(degree)
+    return start + segment_days * numpy.arange(count * samples + 1) / samples
+
+
+def fit_segments(julians, rows, segment_days, degree, tolerance=TOLERANCE):
+    """Fits Chebyshev polynomials to sampled vectors
+    julians is a sorted array of sample dates and rows an (n, 6) array of vectors in au and au/d
+    Each segment is first fitted to every other sample and its position error measured at the samples left out.
+    Segments within tolerance km are refitted to every sample, the rest are rejected with coeffs None,
+    since a body that moves too far within a segment for the polynomial to follow would be served wrong positions
+    Returns a list of (start, end, coeffs) tuples with coeffs of shape (6, degree + 1) or None"""
+    julians = numpy.asarray(julians, dtype=float)
+    rows = numpy.asarray(rows, dtype=float)
+    # the tolerance stops rounding error from adding a sliver of a segment when the span is a whole number of segments
+    count = max(1, int(numpy.ceil((julians[-1] - julians[0]) / segment_days - 1e-9)))
+    edges = numpy.linspace(julians[0], julians[-1], count + 1)
+
+    segments = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        # samples on the boundaries are shared by neighbouring segments so the fits join up
+        mask = (julians >= start) & (julians <= end)
+        if mask.sum() < 2 * degree + 1:
+            raise ValueError(f'segment {start}-{end} has {mask.sum()} samples, '
+                             f'at least {2 * degree + 1} are needed for degree {degree}')
+        s = (2 * julians[mask] - start - end) / (end - start)
+        trial = chebyshev.chebfit(s[::2], rows[mask][::2], degree)
+        residual = chebyshev.chebval(s[1::2], trial).T - rows[mask][1::2]
+        if numpy.linalg.norm(residual[:, :3], axis=1).max() * AU > tolerance:
+            segments.append((float(start), float(end), None))
+            continue
+        coeffs = chebyshev.chebfit(s, rows[mask], degree).T
+        segments.append((float(start), float(end), coeffs))
+    return segments
+
+
+def segment_plans(ids, center, julian, segment_days, transport=None):
+    """Chooses a segment length for each object from its orbital period around the body it orbits
+    The requested length is halved until a segment spans at most 1 / ORBIT_SEGMENTS of the period,
+    so fast inner moons get short segments. Periods come from one fetch of the objects and their primaries at julian
+    Returns a dict mapping each id to its segment length in days"""
+    registry = get_registry()
+    primary_ids = registry.get_primary_ids(ids)
+    query_ids = list(dict.fromkeys(list(ids) + [id for id in primary_ids.tolist() if id >= 0]))
+    vectors = fetch_batch(query_ids, center, [julian], transport)
+
+    masses = dict(zip(query_ids, registry.get_masses(query_ids).tolist()))
+    plans = {}
+    for id, primary_id in zip(ids, primary_ids.tolist()):
+        plans[id] = segment_days
+        if primary_id < 0 or not vectors.get(id) or not vectors.get(primary_id):
+            continue
+        relative = numpy.subtract(vectors[id][0], vectors[primary_id][0])
+        r = numpy.linalg.norm(relative[:3])
+        mu = G * (masses[id] + masses[primary_id])
+        if r == 0 or mu <= 0:
+            continue
+        # vis-viva, with unbound orbits keeping the requested length
+        inverse_a = 2 / r - numpy.dot(relative[3:], relative[3:]) / mu
+        if inverse_a <= 0:
+            continue
+        period = 2 * numpy.pi * numpy.sqrt(inverse_a ** -3 / mu)
+        for _ in range(MAX_SPLITS):
+            if plans[id] <= period / ORBIT_SEGMENTS:
+                break
+            plans[id] /= 2
+    return plans
+
+
+def group_plans(plans):
+    """Groups the ids in plans from segment_plans by segment length, so each group can be fetched on one grid
+    Returns a dict mapping each segment length in days to a list of ids"""
+    groups = {}
+    for id, segment_days in plans.items():
+        groups.setdefault(segment_days, []).append(id)
+    return groups
+
+
+def store_segments(obj_id, center, segments):
+    """Replaces the stored segments for an object over the span covered by the new segments
+    Segments rejected by fit_segments are not stored, so those dates fall through to the other cache tiers
+    Returns the number of segments stored"""
+    ChebyshevSegment.query.filter(ChebyshevSegment.obj_id == obj_id,
+                                  ChebyshevSegment.center == center,
+                                  ChebyshevSegment.jd_start < segments[-1][1],
+                                  ChebyshevSegment.jd_end > segments[0][0]).delete()
+    accepted = [(start, end, coeffs) for start, end, coeffs in segments if coeffs is not None]
+    for start, end, coeffs in accepted:
+        db.session.add(ChebyshevSegment(obj_id=obj_id, center=center, jd_start=start, jd_end=end,
+                                        degree=coeffs.shape[1] - 1, coeffs=coeffs.astype('<f8').tobytes()))
+    db.session.commit()
+    reset_tables()
+    return len(accepted)
+
+
+def load_tables():
+    """Loads every stored segment in one query and indexes them by (object id, center)"""
+    try:
+        segments = ChebyshevSegment.query.order_by(ChebyshevSegment.obj_id,
+                                                   ChebyshevSegment.center,
+                                                   ChebyshevSegment.jd_start).all()
+    except SQLAlchemyError:
+        db.session.rollback()
+        return {}
+
+    tables = {}
+    for segment in segments:
+        table = tables.setdefault((segment.obj_id, segment.center), SegmentTable([], [], []))
+        table.starts.append(segment.jd_start)
+        table.ends.append(segment.jd_end)
+        table.coeffs.append(segment.coefficients())
+    return tables
+
+
+def get_tables():
+    """Returns the segment tables, loading them from the database on first use
+    and again once they are older than RELOAD_INTERVAL"""
+    global _tables, _tables_loaded
+    with _tables_lock:
+        if _tables is None or time.monotonic() - _tables_loaded > RELOAD_INTERVAL:
+            _tables = load_tables()
+            _tables_loaded = time.monotonic()
+    return _tables
+
+
+def reset_tables():
+    """Discards the loaded segment tables so they are reloaded on next use"""
+    global _tables
+    with _tables_lock:
+        _tables = None
+
+
+def evaluate_batch(ids, center, epochs):
+    """Evaluates the stored segments for multiple objects
+    Returns a dict mapping each id whose segments cover every epoch to a list of rows, one per epoch
+    Objects or epochs outside the covered span are left out"""
+    tables = get_tables()
+    results = {}
+    for id in ids:
+        table = tables.get((id, center))
+        if table is None:
+            continue
+        rows = [table.evaluate(epoch) for epoch in epochs]
+        if None not in rows:
+            results[id] = rows
+    return results
+
@@ -0,0 +1,40 @@
+"""Bulk database writes and schema upkeep shared by the web app and the loading scripts"""
+from models import db
+from sqlalchemy.dialects import postgresql, sqlite
+
+CHUNK_SIZE = 2000   # rows per insert or delete statement
+
+
+def chunks(rows):
+    """Splits a list into lists of at most CHUNK_SIZE items"""
+    return [rows[i:i + CHUNK_SIZE] for i in range(0, len(rows), CHUNK_SIZE)]
+
+
+def create_indexes():
+    """Creates the indexes declared on the models that the database is missing
+    db.create_all skips tables that already exist, so indexes added to the models later are only created here"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
+def upsert(model, rows):
+    """Inserts rows into the model's table, updating the rows whose primary key already exists
+    Uses INSERT ... ON CONFLICT on PostgreSQL and SQLite and falls back to merging each row elsewhere"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in ['postgresql', 'sqlite']:
+        for row in rows:
+            db.session.merge(model(**row))
+        db.session.flush()
+        return
+
+    insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+    table = model.__table__
+    keys = [column.name for column in table.primary_key.columns]
+    columns = [column.name for column in table.columns]
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(index_elements=keys,
+                                                set_={column: statement.excluded[column] for column in columns if column not in keys})
+    # every row gets every column, so a single statement can be executed for all of them
+    for chunk in chunks(rows):
+        db.session.execute(statement, [{column: row.get(column) for column in columns} for row in chunk])
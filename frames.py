@@ -0,0 +1,110 @@
+from registry import get_registry
+from functions import get_state_batch, get_state_batch_async
+import asyncio
+import numpy
+
+
+def system_index(obj_ids):
+    """Returns the system ids of multiple objects and, for each object, the index of its system in that list
+    Objects with no system get index -1"""
+    object_systems = get_registry().get_system_ids(obj_ids)
+    system_ids, index = numpy.unique(object_systems, return_inverse=True)
+    if len(system_ids) and system_ids[0] == -1:
+        system_ids = system_ids[1:]
+        index = index - 1
+    return system_ids.tolist(), index.astype(numpy.intp)
+
+
+def system_barycenters(obj_ids, states, masses=None):
+    """Calculates the barycenter of every system represented in obj_ids at every epoch in one pass
+    states is an (n_bodies, n_epochs, 6) array in km and km/s, NaN where data was not available,
+    and masses defaults to the object masses from the object registry
+    Returns the system ids and an (n_systems, n_epochs, 6) array of barycenter positions and velocities
+    in the same frame as states, weighted by the masses of the bodies with data at each epoch"""
+    if masses is None:
+        masses = get_registry().get_masses(obj_ids)
+    system_ids, index = system_index(obj_ids)
+
+    members = numpy.zeros((len(system_ids), len(obj_ids)))
+    in_system = index >= 0
+    members[index[in_system], numpy.flatnonzero(in_system)] = 1.0
+
+    available = ~numpy.isnan(states[:, :, 0])
+    weights = masses[:, numpy.newaxis] * available                                  # (n_bodies, n_epochs)
+    total = numpy.einsum('sb,be->se', members, weights)
+    moment = numpy.einsum('sb,be,bed->sed', members, weights, numpy.nan_to_num(states))
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        return system_ids, moment / total[:, :, numpy.newaxis]
+
+
+def to_system_frame(obj_ids, states, masses=None):
+    """Returns states relative to the barycenter of each object's own system
+    Objects with no system are left relative to the original center"""
+    system_ids, barycenters = system_barycenters(obj_ids, states, masses)
+    _, index = system_index(obj_ids)
+    relative = states.copy()
+    in_system = index >= 0
+    relative[in_system] -= barycenters[index[in_system]]
+    return relative
+
+
+def to_body_frame(obj_ids, states, center_id):
+    """Returns states relative to one of the objects, such as a planet, at each epoch"""
+    return states - states[list(obj_ids).index(center_id)]
+
+
+def get_frame_states(obj_ids, center, datetimes, frame=None):
+    """Returns states for multiple objects like functions.get_state_batch, transformed to a reference frame:
+    None or 'ssb' leaves them relative to center, 'system' makes them relative to each object's system barycenter,
+    and an object id makes them relative to that object
+    Other members of the objects' systems, or the frame object, are fetched in the same batch if needed
+    Raises ValueError for any other frame"""
+    query_ids = frame_query_ids(obj_ids, frame)
+    return apply_frame(obj_ids, get_state_batch(query_ids, center, datetimes), frame)
+
+
+async def get_frame_states_async(obj_ids, center, datetimes, frame=None):
+    """Coroutine version of get_frame_states that awaits the upstream fetch instead of blocking on it"""
+    query_ids = await asyncio.to_thread(frame_query_ids, obj_ids, frame)
+    return await asyncio.to_thread(apply_frame, obj_ids, await get_state_batch_async(query_ids, center, datetimes), frame)
+
+
+def frame_query_ids(obj_ids, frame):
+    """Returns the ids whose states are needed to express obj_ids in a reference frame
+    Raises ValueError for an unknown frame"""
+    if frame in [None, 'ssb']:
+        return list(obj_ids)
+    if frame == 'system':
+        return system_query_ids(obj_ids)
+    if not frame.isdigit() or not get_registry().get(int(frame)):
+        raise ValueError(f'unknown frame {frame}')
+    center_id = int(frame)
+    return list(obj_ids) if center_id in obj_ids else list(obj_ids) + [center_id]
+
+
+def system_query_ids(obj_ids):
+    """Returns obj_ids followed by every other member of their systems,
+    since a system's barycenter depends on all of its members, not just the requested ones"""
+    registry = get_registry()
+    query_ids = list(obj_ids)
+    known = set(query_ids)
+    for system_id in numpy.unique(registry.get_system_ids(obj_ids)).tolist():
+        system = registry.systems.get(system_id)
+        if system is None:
+            continue
+        for id in system.member_ids.tolist():
+            if id not in known:
+                query_ids.append(id)
+                known.add(id)
+    return query_ids
+
+
+def apply_frame(obj_ids, states, frame):
+    """Transforms states fetched for frame_query_ids(obj_ids, frame) to the reference frame
+    Returns one row per id in obj_ids"""
+    if frame in [None, 'ssb']:
+        return states
+    query_ids = frame_query_ids(obj_ids, frame)
+    if frame == 'system':
+        return to_system_frame(query_ids, states)[:len(obj_ids)]
+    return to_body_frame(query_ids, states, int(frame))[:len(obj_ids)]
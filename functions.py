@@ -1,79 +1,147 @@
-from astroquery.jplhorizons import Horizons
 from julian import to_jd
 from models import System, Object, AltName
+from cache import get_cached_batch, get_cached_batch_async
+from registry import get_registry
+from kepler import SUN
+from object_sets import get_id_list
+from textures import texture_url, manifest_version
+import threading
+import asyncio
 import datetime
+import hashlib
+import json
 import numpy
 import math
 
+metadata_payloads = {}
+metadata_cache = {'version': None}
+metadata_lock = threading.Lock()
+
 
 def get_obj_vectors(id, center, datetime):
     """Get position and velocity vectors for a given object at a specified date and time,
     relative to the specified coordinate center.
-    Then get object mass and name data from SQL database to combine into a single object."""
-    julian = to_jd(datetime, fmt='jd')
-
-    # these four objects must be queried from the small body database, which is separate from the major body database
-    # major body database contains the Sun, all planets and their moons, and Pluto and its moons
-    # small body database contains objects such as comets, asteroids, and these four dwarf planets
-    if id in [1, 136108, 136199, 136472]:
-        id_type = 'smallbody'
-    else:
-        id_type = 'id'
-
-    # if position and velocity data are not available for the given object at the given date and time,
-    # the nasa_obj.vectors() method will raise an exception
-    # if this happens, we will set the object's available property to false
-    try:
-        nasa_obj = Horizons(
-            id=id, location=f'500@{center}', epochs=julian, id_type=id_type)
-        vec_table = nasa_obj.vectors()
-        pos = [au_to_km(vec_table['x'][0]), au_to_km(
-            vec_table['y'][0]), au_to_km(vec_table['z'][0])]
-        vel = [au_to_km(vec_table['vx'][0], vel=True), au_to_km(
-            vec_table['vy'][0], vel=True), au_to_km(vec_table['vz'][0], vel=True)]
-    except:
-        nasa_obj = None
-
-    # after the call is made to JPL Horizons,
-    # query our local SQL database for all information needed to construct the object's model
-    database_obj = Object.query.get_or_404(id)
-    size = [database_obj.radius_x, database_obj.radius_y, database_obj.radius_z]
+    Static information about the object is served separately, see get_metadata_payload"""
+    states = get_state_batch([id], center, [datetime])
+    return build_obj(id, states[0, 0])
 
-    # see the Body class in the classes.js file for more information on these properties
-    final_obj = {'id': id,
-                 'available': False,
-                 'name': database_obj.name,
-                 'designation': database_obj.designation,
-                 'obj_type': database_obj.obj_type,
-                 'sat_type': database_obj.sat_type,
-                 'mass': database_obj.mass,
-                 'dimensions': size,
-                 'rotation_period': database_obj.rotation_period,
-                 'solstice_angle': database_obj.solstice_angle,
-                 'axial_tilt': database_obj.axial_tilt,
-                 'inclination': database_obj.inclination,
-                 'long_asc': database_obj.long_asc,
-                 'ring_inner_radius': database_obj.ring_inner_radius,
-                 'ring_outer_radius': database_obj.ring_outer_radius,
-                 'color_map': database_obj.color_map,
-                 'bump_map': database_obj.bump_map,
-                 'specular_map': database_obj.specular_map,
-                 'cloud_map': database_obj.cloud_map,
-                 'cloud_transparency': database_obj.cloud_transparency,
-                 'ring_color': database_obj.ring_color,
-                 'ring_transparency': database_obj.ring_transparency,
-                 'bump_scale': database_obj.bump_scale}
-
-    # if the nasa_obj.vectors() call raised an exception, the value of nasa_obj will be None
-    if nasa_obj:
-        final_obj['position'] = pos
-        final_obj['velocity'] = vel
+
+def get_state_batch(obj_ids, center, datetimes):
+    """Returns position and velocity vectors for multiple objects at one or more dates and times
+    as an array of shape (len(obj_ids), len(datetimes), 6) holding x, y, z in km and vx, vy, vz in km/s
+    Rows are NaN where data was not available for an object
+    Objects with orbital elements are propagated analytically, and the rest not found in the ephemeris cache
+    are fetched from JPL Horizons in one concurrent batch"""
+    julians = [to_jd(datetime, fmt='jd') for datetime in datetimes]
+    elements = get_registry().elements
+    vectors = get_cached_batch(cached_ids(obj_ids, center, elements), center, julians)
+    return build_states(obj_ids, center, julians, vectors, elements)
+
+
+async def get_state_batch_async(obj_ids, center, datetimes):
+    """Coroutine version of get_state_batch that awaits the upstream fetch instead of blocking on it
+    Loading the object registry and propagating orbital elements run on a thread, off the event loop"""
+    julians = [to_jd(datetime, fmt='jd') for datetime in datetimes]
+    elements = (await asyncio.to_thread(get_registry)).elements
+    vectors = await get_cached_batch_async(cached_ids(obj_ids, center, elements), center, julians)
+    return await asyncio.to_thread(build_states, obj_ids, center, julians, vectors, elements)
+
+
+def cached_ids(obj_ids, center, elements):
+    """Returns the ids that must be looked up in the ephemeris cache: every object without orbital elements,
+    plus the Sun if any object has elements and the Sun is not the center, since elements are heliocentric"""
+    with_elements = elements.find(obj_ids) >= 0
+    ids = [obj_id for obj_id, analytic in zip(obj_ids, with_elements) if not analytic]
+    if with_elements.any() and center != SUN and SUN not in ids:
+        ids.append(SUN)
+    return ids
+
+
+def build_states(obj_ids, center, julians, vectors, elements):
+    """Converts cached or fetched vectors in au and au/d into a state array in km and km/s, see get_state_batch
+    Objects with orbital elements are propagated to julians and shifted from the Sun to center"""
+    states = numpy.full((len(obj_ids), len(julians), 6), numpy.nan)
+    index = elements.find(obj_ids)
+    for i, obj_id in enumerate(obj_ids):
+        if index[i] < 0 and vectors[obj_id]:
+            states[i] = vectors[obj_id]
+
+    analytic = index >= 0
+    if analytic.any():
+        states[analytic] = elements.states(index[analytic], julians)
+        if center != SUN:
+            sun = numpy.array(vectors[SUN]) if vectors.get(SUN) else numpy.nan
+            states[analytic] += sun
+    return states * STATE_TO_KM
+
+
+def build_obj(id, state):
+    """Builds the JSON state of an object from its state vector in km and km/s
+    If position and velocity data were not available, state is NaN or None
+    and the object's available property is set to false"""
+    final_obj = {'id': id, 'available': False}
+
+    if state is not None and not numpy.isnan(state[0]):
+        final_obj['position'] = state[:3].tolist()
+        final_obj['velocity'] = state[3:].tolist()
         # available is set to True if we have valid position and velocity data
         final_obj['available'] = True
 
     return final_obj
 
 
+def get_metadata_payload(object_set=None):
+    """Returns the static information for every object in an object set, or for all objects if object_set is None,
+    serialized as JSON along with a strong ETag derived from the serialized contents
+    The payload is generated once per set from the Object, System and AltName tables
+    and kept until the object registry is reloaded or textures are rebuilt"""
+    registry = get_registry()
+    with metadata_lock:
+        # payloads built from an older registry or texture manifest are stale
+        version = (registry.version, manifest_version())
+        if metadata_cache['version'] != version:
+            metadata_payloads.clear()
+            metadata_cache['version'] = version
+        if object_set not in metadata_payloads:
+            ids = registry.ids.tolist() if object_set is None else get_id_list(object_set)
+            records = [registry.get(id) for id in ids if registry.get(id)]
+            payload = json.dumps([build_metadata(record) for record in records], sort_keys=True, separators=(',', ':')).encode()
+            metadata_payloads[object_set] = (payload, hashlib.sha256(payload).hexdigest())
+        return metadata_payloads[object_set]
+
+
+def build_metadata(database_obj):
+    """Returns the static information needed to construct an object's model from its record in the object registry
+    Texture URLs carry the content hash of the texture once textures.py has built it"""
+    size = [database_obj.radius_x, database_obj.radius_y, database_obj.radius_z]
+
+    # see the Body class in the classes.js file for more information on these properties
+    return {'id': database_obj.id,
+            'name': database_obj.name,
+            'designation': database_obj.designation,
+            'obj_type': database_obj.obj_type,
+            'sat_type': database_obj.sat_type,
+            'mass': database_obj.mass,
+            'dimensions': size,
+            'rotation_period': database_obj.rotation_period,
+            'solstice_angle': database_obj.solstice_angle,
+            'axial_tilt': database_obj.axial_tilt,
+            'inclination': database_obj.inclination,
+            'long_asc': database_obj.long_asc,
+            'ring_inner_radius': database_obj.ring_inner_radius,
+            'ring_outer_radius': database_obj.ring_outer_radius,
+            'color_map': texture_url(database_obj.color_map),
+            'bump_map': texture_url(database_obj.bump_map),
+            'specular_map': texture_url(database_obj.specular_map),
+            'cloud_map': texture_url(database_obj.cloud_map),
+            'cloud_transparency': texture_url(database_obj.cloud_transparency),
+            'ring_color': texture_url(database_obj.ring_color),
+            'ring_transparency': texture_url(database_obj.ring_transparency),
+            'bump_scale': database_obj.bump_scale,
+            'system': database_obj.system_name,
+            'alt_names': list(database_obj.alt_names)}
+
+
 def au_to_km(au, vel=False):
     """Convert from astronomical units (au) to kilometers (km)
     If vel is True, function will convert velocity from au/d to km/s"""
@@ -84,98 +152,35 @@ def au_to_km(au, vel=False):
     return km
 
 
+# multiplies an (x, y, z, vx, vy, vz) array in au and au/d to convert it to km and km/s
+STATE_TO_KM = numpy.array([au_to_km(1)] * 3 + [au_to_km(1, vel=True)] * 3)
+
+
+def state_record_dtype(precision=64, element_count=0):
+    """Returns the packed little-endian record layout used for binary state responses:
+    a uint32 id followed by position in km and velocity in km/s as float64 or float32,
+    and element_count orbital elements if any were requested"""
+    float_type = '<f8' if precision == 64 else '<f4'
+    fields = [('id', '<u4'), ('position', float_type, 3), ('velocity', float_type, 3)]
+    if element_count:
+        fields.append(('elements', float_type, element_count))
+    return numpy.dtype(fields)
+
+
+def pack_states(obj_ids, states, precision=64, elements=None):
+    """Packs an (n, 6) array of states into consecutive binary records, one per id
+    elements is an optional (n, k) array of orbital elements appended to each record
+    Unavailable objects have NaN position and velocity"""
+    records = numpy.empty(len(obj_ids), dtype=state_record_dtype(precision, 0 if elements is None else elements.shape[1]))
+    records['id'] = obj_ids
+    records['position'] = states[:, :3]
+    records['velocity'] = states[:, 3:]
+    if elements is not None:
+        records['elements'] = elements
+    return records.tobytes()
+
+
 def get_obj_batch(obj_ids, center, datetime):
     """Returns a list of position and velocity vectors for multiple objects"""
-    return [get_obj_vectors(obj_id, center, datetime) for obj_id in obj_ids]
-
-
-def get_id_list(object_set):
-    """Constructs a preselected list of object ids for a given object set"""
-    mars_moons = [401, 402]
-    jupiter_moons = [i for i in range(501, 573)]
-    for i in range(55501, 55508):
-        jupiter_moons.append(i)
-    saturn_moons = [i for i in range(601, 654)]
-    for i in [65035, 65040, 65041, 65045, 65048, 65050, 65055, 65056]:
-        saturn_moons.append(i)
-    for i in range(65065, 65085):
-        saturn_moons.append(i)
-    uranus_moons = [i for i in range(701, 728)]
-    neptune_moons = [i for i in range(801, 815)]
-    pluto_moons = [i for i in range(901, 906)]
-
-    if object_set == 'full':                # full solar system
-        id_list = [10, 199, 299, 399, 301, 499, 1]
-        for moon_id in mars_moons:
-            id_list.append(moon_id)
-        id_list.append(599)
-        for moon_id in jupiter_moons:
-            id_list.append(moon_id)
-        id_list.append(699)
-        for moon_id in saturn_moons:
-            id_list.append(moon_id)
-        id_list.append(799)
-        for moon_id in uranus_moons:
-            id_list.append(moon_id)
-        id_list.append(899)
-        for moon_id in neptune_moons:
-            id_list.append(moon_id)
-        id_list.append(999)
-        for moon_id in pluto_moons:
-            id_list.append(moon_id)
-        id_list.append(136108)
-        id_list.append(136199)
-        id_list.append(136472)
-    elif object_set == 'inner':             # inner solar system
-        id_list = [10, 199, 299, 399, 301, 499, 401, 402, 1]
-    elif object_set == 'outer':             # outer solar system
-        id_list = [10, 599]
-        for moon_id in jupiter_moons:
-            id_list.append(moon_id)
-        id_list.append(699)
-        for moon_id in saturn_moons:
-            id_list.append(moon_id)
-        id_list.append(799)
-        for moon_id in uranus_moons:
-            id_list.append(moon_id)
-        id_list.append(899)
-        for moon_id in neptune_moons:
-            id_list.append(moon_id)
-        id_list.append(999)
-        for moon_id in pluto_moons:
-            id_list.append(moon_id)
-        id_list.append(136108)
-        id_list.append(136199)
-        id_list.append(136472)
-    elif object_set == 'planets':           # planets only
-        id_list = [10, 199, 299, 399, 499, 599, 699, 799, 899]
-    elif object_set == 'dwarves':           # dwarf planets only
-        id_list = [10, 1, 999, 136108, 136199, 136472]
-    elif object_set == 'planets-dwarves':   # planets and dwarf planets
-        id_list = [10, 199, 299, 399, 499, 1, 599,
-                   699, 799, 899, 999, 136108, 136199, 136472]
-    elif object_set == '3':                 # earth-moon system
-        id_list = [10, 399, 301]
-    elif object_set == '4':                 # martian system
-        id_list = [10, 499, 401, 402]
-    elif object_set == '5':                 # jovian system
-        id_list = [10, 599]
-        for moon_id in jupiter_moons:
-            id_list.append(moon_id)
-    elif object_set == '6':                 # saturnian system
-        id_list = [10, 699]
-        for moon_id in saturn_moons:
-            id_list.append(moon_id)
-    elif object_set == '7':                 # uranian system
-        id_list = [10, 799]
-        for moon_id in uranus_moons:
-            id_list.append(moon_id)
-    elif object_set == '8':                 # neptunian system
-        id_list = [10, 899]
-        for moon_id in neptune_moons:
-            id_list.append(moon_id)
-    elif object_set == '9':                 # plutonian system
-        id_list = [10, 999]
-        for moon_id in pluto_moons:
-            id_list.append(moon_id)
-    return id_list
+    states = get_state_batch(obj_ids, center, [datetime])
+    return [build_obj(obj_id, states[i, 0]) for i, obj_id in enumerate(obj_ids)]
@@ -0,0 +1,392 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+import requests
+import urllib3
+import asyncio
+import threading
+import random
+import json
+import time
+import os
+
+# these four objects must be queried from the small body database, which is separate from the major body database
+# major body database contains the Sun, all planets and their moons, and Pluto and its moons
+# small body database contains objects such as comets, asteroids, and these four dwarf planets
+SMALL_BODIES = [1, 136108, 136199, 136472]
+
+MAX_WORKERS = int(os.environ.get('HORIZONS_MAX_WORKERS', 16))   # upper bound on concurrent upstream requests
+TIMEOUT = float(os.environ.get('HORIZONS_TIMEOUT', 30))         # per-request timeout, seconds
+MAX_BATCH = int(os.environ.get('HORIZONS_MAX_BATCH', 50))      # ids per request to a HORIZONS_URL service
+RETRIES = int(os.environ.get('HORIZONS_RETRIES', 2))            # extra attempts after a failed request
+BACKOFF = float(os.environ.get('HORIZONS_BACKOFF', 0.2))        # upper bound on the first retry delay, doubled for each retry
+BATCH_DEADLINE = float(os.environ.get('HORIZONS_BATCH_DEADLINE', 20))   # seconds a batch waits before returning what it has
+BREAKER_THRESHOLD = int(os.environ.get('HORIZONS_BREAKER_THRESHOLD', 5))  # consecutive failures that open the circuit
+BREAKER_RESET = float(os.environ.get('HORIZONS_BREAKER_RESET', 30))     # seconds the circuit stays open before a trial request
+
+# Horizons error messages meaning the object has no ephemeris for the requested epochs, rather than a failure
+NO_DATA_MESSAGES = ['No ephemeris for target', 'No matches found', 'outside the range of']
+
+_executor = None
+_executor_lock = threading.Lock()
+_transport = None
+_client = None
+
+
+class UpstreamError(Exception):
+    """Raised by HttpTransport when the upstream answers with an HTTP error status"""
+
+    def __init__(self, status, message):
+        super().__init__(f'{status}: {message}')
+        self.status = status
+
+
+class NoDataError(Exception):
+    """Raised by a transport when the upstream has no data for an object at the requested epochs"""
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of querying the upstream while the circuit breaker is open"""
+
+
+class DeadlineExceeded(Exception):
+    """Marks a chunk that had not finished when its batch's deadline passed"""
+
+
+def pooled(session, pool_size=MAX_WORKERS):
+    """Makes a requests session keep up to pool_size connections alive per host, and returns it"""
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class AstroqueryTransport:
+    """Queries JPL Horizons through the astroquery.jplhorizons module
+    Horizons only accepts one target per query, so batches are a single id
+    Every query shares one pooled session, so connections to Horizons are kept alive between queries"""
+
+    max_batch = 1
+
+    def __init__(self):
+        # imported here since astroquery takes most of the app's startup time and offline bundles never need it
+        from astroquery.jplhorizons import Horizons
+        self.horizons = Horizons
+        # a session set up by astroquery, with its User-Agent and response hooks
+        self.session = pooled(Horizons()._session)
+
+    def vectors(self, ids, id_type, center, epochs, timeout):
+        """Returns a dict mapping each id to a list of (x, y, z, vx, vy, vz) rows in au and au/d,
+        one row per epoch
+        Raises NoDataError if Horizons has no ephemeris for the object at the epochs"""
+        results = {}
+        for id in ids:
+            nasa_obj = self.horizons(id=id, location=f'500@{center}', epochs=epochs, id_type=id_type)
+            nasa_obj.TIMEOUT = timeout
+            nasa_obj._session = self.session
+            try:
+                vec_table = nasa_obj.vectors()
+            except ValueError as exc:
+                if any(message in str(exc) for message in NO_DATA_MESSAGES):
+                    raise NoDataError(str(exc)) from exc
+                raise
+            results[id] = [(float(row['x']), float(row['y']), float(row['z']),
+                            float(row['vx']), float(row['vy']), float(row['vz'])) for row in vec_table]
+        return results
+
+
+class HttpTransport:
+    """Queries a Horizons-compatible JSON service, such as the fake server in bench/fake_horizons.py
+    The service is sent a GET request with ids, id_type, center and epochs in the query string
+    and must respond with {"vectors": {"<id>": [[x, y, z, vx, vy, vz], ...]}} in au and au/d
+    Ids with no data for the requested epochs are left out of the response
+    Requests go through a connection pool, so connections are kept alive between requests"""
+
+    def __init__(self, url, max_batch=50):
+        self.url = url
+        self.max_batch = max_batch
+        # retries are left to UpstreamClient
+        self.pool = urllib3.PoolManager(maxsize=MAX_WORKERS, retries=False)
+
+    def vectors(self, ids, id_type, center, epochs, timeout):
+        """Returns a dict mapping each id to a list of (x, y, z, vx, vy, vz) rows in au and au/d,
+        one row per epoch
+        Raises UpstreamError if the service answers with an error status"""
+        query = {'ids': ','.join(str(id) for id in ids),
+                 'id_type': id_type,
+                 'center': center,
+                 'epochs': ','.join(repr(epoch) for epoch in epochs)}
+        res = self.pool.request('GET', self.url, fields=query, timeout=timeout)
+        if res.status >= 400:
+            raise UpstreamError(res.status, res.data[:200].decode(errors='replace'))
+        return {int(id): [tuple(row) for row in rows] for id, rows in json.loads(res.data)['vectors'].items()}
+
+
+class RateLimitedTransport:
+    """Wraps another transport so it sends at most rate requests per second, for background jobs
+    that should not compete with interactive requests for the upstream's capacity"""
+
+    def __init__(self, transport, rate):
+        self.transport = transport
+        self.max_batch = transport.max_batch
+        self.interval = 1 / rate
+        self.next_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def vectors(self, ids, id_type, center, epochs, timeout):
+        """Waits for the next free request slot, then queries the wrapped transport"""
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+        return self.transport.vectors(ids, id_type, center, epochs, timeout)
+
+
+class CircuitBreaker:
+    """Stops requests to an upstream that keeps failing
+    After threshold consecutive failures the circuit opens and requests fail immediately.
+    Once reset_timeout seconds have passed one trial request is let through: the circuit closes
+    if it succeeds and stays open for another reset_timeout if it fails"""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False      # True while the trial request is in flight
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Returns True if a request may be sent now"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.trial = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial = False
+
+    def state(self):
+        """Returns 'closed', 'open' or 'half-open'"""
+        with self.lock:
+            if self.opened_at is None:
+                return 'closed'
+            return 'half-open' if self.trial or time.monotonic() - self.opened_at >= self.reset_timeout else 'open'
+
+
+class UpstreamClient:
+    """Sends queries through a transport with retries, a circuit breaker and a deadline
+    Failed requests are retried up to retries times after a random delay of up to backoff seconds,
+    doubling for each retry, as long as the deadline allows. Counters separate objects the upstream
+    had no data for from objects lost to upstream errors, an open circuit or the deadline"""
+
+    def __init__(self, transport, retries=RETRIES, backoff=BACKOFF, breaker=None):
+        self.transport = transport
+        self.max_batch = transport.max_batch
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.lock = threading.Lock()
+        self.counters = {'requests': 0, 'retries': 0, 'fetched': 0, 'no_data': 0,
+                         'upstream_error': 0, 'circuit_open': 0, 'deadline': 0}
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def vectors(self, ids, id_type, center, epochs, timeout, deadline=None):
+        """Queries the transport, retrying failures until the deadline, a time.monotonic() value
+        Returns the rows found like a transport, leaving out objects with no data
+        Raises CircuitOpenError without querying if the circuit is open, DeadlineExceeded if the deadline
+        passes before a request succeeds, and the last upstream error if every attempt fails"""
+        for attempt in range(self.retries + 1):
+            # the deadline is checked first, since allow() can claim the half-open circuit's trial request,
+            # which only a recorded success or failure releases
+            remaining = TIMEOUT if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded('batch deadline passed')
+            if not self.breaker.allow():
+                self.count('circuit_open', len(ids))
+                raise CircuitOpenError('upstream circuit is open')
+
+            self.count('requests')
+            try:
+                vectors = self.transport.vectors(ids, id_type, center, epochs, min(timeout, remaining))
+            except NoDataError:
+                self.breaker.record_success()
+                self.count('no_data', len(ids))
+                return {}
+            except Exception as exc:
+                if not retryable(exc):
+                    self.breaker.record_success()
+                    self.count('upstream_error', len(ids))
+                    raise
+                self.breaker.record_failure()
+                delay = random.uniform(0, self.backoff * 2 ** attempt)
+                if attempt == self.retries or (deadline is not None and time.monotonic() + delay >= deadline):
+                    self.count('upstream_error', len(ids))
+                    raise
+                self.count('retries')
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            found = {id: rows for id, rows in vectors.items() if rows and len(rows) == len(epochs)}
+            self.count('fetched', len(found))
+            self.count('no_data', len([id for id in ids if id not in found]))
+            return found
+
+    def stats(self):
+        """Returns the counters and the state of the circuit"""
+        with self.lock:
+            stats = dict(self.counters)
+        stats['circuit'] = self.breaker.state()
+        return stats
+
+
+def retryable(exc):
+    """Returns False for errors a retry cannot fix: requests the upstream rejected as invalid"""
+    if isinstance(exc, UpstreamError):
+        return not 400 <= exc.status < 500
+    response = getattr(exc, 'response', None)
+    return not (isinstance(exc, requests.HTTPError) and response is not None and 400 <= response.status_code < 500)
+
+
+def get_transport():
+    """Returns the transport used for upstream queries
+    Uses the HTTP transport if HORIZONS_URL is set, otherwise queries JPL Horizons through astroquery"""
+    global _transport
+    if _transport is None:
+        url = os.environ.get('HORIZONS_URL')
+        _transport = HttpTransport(url, MAX_BATCH) if url else AstroqueryTransport()
+    return _transport
+
+
+def set_transport(transport):
+    """Replaces the transport used for upstream queries"""
+    global _transport, _client
+    _transport = transport
+    _client = None
+
+
+def get_client(transport=None):
+    """Returns the client used for upstream queries
+    With no transport this is the shared client for get_transport(), so every request sees the same
+    circuit breaker and counters. A transport that is not already a client is wrapped in a new one"""
+    global _client
+    if transport is None:
+        if _client is None:
+            _client = UpstreamClient(get_transport())
+        return _client
+    return transport if isinstance(transport, UpstreamClient) else UpstreamClient(transport)
+
+
+def get_executor():
+    """Returns the worker pool shared by all batches, so total upstream concurrency stays bounded"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='horizons')
+    return _executor
+
+
+def get_id_type(id):
+    """Returns the Horizons id_type for a given object id"""
+    return 'smallbody' if id in SMALL_BODIES else 'id'
+
+
+def group_ids(ids, center):
+    """Groups object ids by the (id_type, center) pair they must be queried with"""
+    groups = {}
+    for id in ids:
+        groups.setdefault((get_id_type(id), center), []).append(id)
+    return groups
+
+
+def split_chunks(ids, center, transport):
+    """Groups ids by id_type and center and splits each group into chunks the transport can handle
+    Returns a list of (chunk, id_type, center) tuples"""
+    chunks = []
+    for (id_type, group_center), group in group_ids(ids, center).items():
+        for i in range(0, len(group), transport.max_batch):
+            chunks.append((group[i:i + transport.max_batch], id_type, group_center))
+    return chunks
+
+
+def collect_results(ids, epochs, outcomes):
+    """Merges the outcome of each chunk, either a dict of vectors or the exception it raised, into one dict
+    Every object in a chunk that failed, was refused by the circuit breaker or missed the deadline
+    is marked unavailable, as is every object the upstream had no data for"""
+    results = {id: None for id in ids}
+    for chunk, vectors in outcomes:
+        if isinstance(vectors, Exception):
+            continue
+        for id in chunk:
+            rows = vectors.get(id)
+            if rows and len(rows) == len(epochs):
+                results[id] = rows
+    return results
+
+
+def fetch_batch(ids, center, epochs, transport=None, timeout=None, deadline=None):
+    """Fetches vectors for multiple objects concurrently
+    Ids are grouped by id_type and center, each group is split into chunks the transport can handle,
+    and the chunks are run on the shared worker pool through an UpstreamClient, see get_client
+    Chunks still running deadline seconds after the call are given up on, and the objects that did finish are returned
+    Returns a dict mapping each id to a list of rows, one per epoch, or None if no data was available"""
+    client = get_client(transport)
+    timeout = timeout or TIMEOUT
+    deadline = time.monotonic() + (deadline or BATCH_DEADLINE)
+    executor = get_executor()
+
+    futures = [(chunk, executor.submit(client.vectors, chunk, id_type, chunk_center, epochs, timeout, deadline))
+               for chunk, id_type, chunk_center in split_chunks(ids, center, client)]
+    wait([future for _, future in futures], timeout=max(0, deadline - time.monotonic()))
+    return collect_results(ids, epochs, [(chunk, chunk_outcome(client, chunk, future)) for chunk, future in futures])
+
+
+async def fetch_batch_async(ids, center, epochs, transport=None, timeout=None, deadline=None):
+    """Coroutine version of fetch_batch for async views
+    The chunks run on the same shared worker pool, so upstream concurrency stays bounded,
+    and the calling event loop is free to serve other requests until every chunk is done or the deadline passes"""
+    client = get_client(transport)
+    timeout = timeout or TIMEOUT
+    deadline = time.monotonic() + (deadline or BATCH_DEADLINE)
+    executor = get_executor()
+    loop = asyncio.get_running_loop()
+
+    chunks = split_chunks(ids, center, client)
+    futures = [loop.run_in_executor(executor, client.vectors, chunk, id_type, chunk_center, epochs, timeout, deadline)
+               for chunk, id_type, chunk_center in chunks]
+    if futures:
+        await asyncio.wait(futures, timeout=max(0, deadline - time.monotonic()))
+    return collect_results(ids, epochs, [(chunk, chunk_outcome(client, chunk, future))
+                                         for (chunk, _, _), future in zip(chunks, futures)])
+
+
+def chunk_outcome(client, chunk, future):
+    """Returns the vectors a chunk fetched or the exception it raised
+    A chunk still running when its batch's deadline passed is cancelled and counted as missing the deadline.
+    One already being fetched keeps its worker until the request returns, but is not retried"""
+    if future.done() and not future.cancelled():
+        outcome = future.exception() or future.result()
+    else:
+        future.cancel()
+        outcome = DeadlineExceeded('batch deadline passed')
+    if isinstance(outcome, DeadlineExceeded):
+        client.count('deadline', len(chunk))
+    return outcome
@@ -0,0 +1,119 @@
+"""Precomputes Chebyshev ephemeris tables from JPL Horizons
+
+Fetches vectors for every object in an object set on a grid of dates,
+fits Chebyshev segments to them and stores the coefficients in the database.
+Segments are at most --segment days long and shorter for bodies with short orbits, see chebyshev.segment_plans,
+and segments that miss CHEBYSHEV_TOLERANCE at held-out samples are not stored
+
+Usage:
+    python ingest.py fit <object_set> <start> <stop> [--segment DAYS] [--degree N]
+    python ingest.py report <object_set> <start> <stop> [--step HOURS]
+
+Dates are given as YYYY-MM-DD. The report fetches raw samples offset by half a step from a grid
+step hours apart and prints the position and velocity error of the stored segments at those dates"""
+from app import app
+from functions import au_to_km
+from object_sets import get_id_list, UnknownSetError
+from horizons import fetch_batch
+from chebyshev import fit_segments, store_segments, get_tables, segment_plans, segment_grid, group_plans
+from julian import to_jd
+import argparse
+import datetime
+import numpy
+
+EPOCHS_PER_REQUEST = 100
+DEADLINE = 3600     # seconds each batch may take, since offline runs can wait out a slow upstream instead of losing samples
+
+
+def fetch_grid(ids, center, julians, transport=None):
+    """Fetches vectors for multiple objects at every date in julians, through transport if given
+    Returns a dict mapping each id to an (n, 6) array of rows, leaving out objects with missing data"""
+    rows = {id: [] for id in ids}
+    for i in range(0, len(julians), EPOCHS_PER_REQUEST):
+        epochs = [float(julian) for julian in julians[i:i + EPOCHS_PER_REQUEST]]
+        vectors = fetch_batch(ids, center, epochs, transport, deadline=DEADLINE)
+        for id in ids:
+            if rows[id] is not None and vectors[id]:
+                rows[id].extend(vectors[id])
+            else:
+                rows[id] = None
+    return {id: numpy.array(id_rows) for id, id_rows in rows.items() if id_rows}
+
+
+def get_grid(start, stop, step):
+    """Returns an array of Julian dates from start to stop, spaced step hours apart"""
+    jd_start = to_jd(datetime.datetime.strptime(start, '%Y-%m-%d'), fmt='jd')
+    jd_stop = to_jd(datetime.datetime.strptime(stop, '%Y-%m-%d'), fmt='jd')
+    return numpy.arange(jd_start, jd_stop + step / 48, step / 24)
+
+
+def accuracy_report(obj_id, center, julians, rows):
+    """Compares the stored segments for an object against raw sampled vectors
+    Returns the number of samples compared along with the max and rms position error in km
+    and velocity error in km/s"""
+    table = get_tables().get((obj_id, center))
+    errors = []
+    for julian, row in zip(julians, rows):
+        fitted = table.evaluate(julian) if table else None
+        if fitted is not None:
+            errors.append(numpy.subtract(fitted, row))
+    if not errors:
+        return {'obj_id': obj_id, 'samples': 0}
+
+    errors = numpy.array(errors)
+    pos_err = au_to_km(numpy.linalg.norm(errors[:, :3], axis=1))
+    vel_err = au_to_km(numpy.linalg.norm(errors[:, 3:], axis=1), vel=True)
+    return {'obj_id': obj_id,
+            'samples': len(errors),
+            'max_pos_err': float(pos_err.max()),
+            'rms_pos_err': float(numpy.sqrt((pos_err ** 2).mean())),
+            'max_vel_err': float(vel_err.max()),
+            'rms_vel_err': float(numpy.sqrt((vel_err ** 2).mean()))}
+
+
+def fit(ids, center, start, stop, segment, degree):
+    """Fetches, fits and stores Chebyshev segments for multiple objects from start to stop, Julian dates"""
+    for segment_days, group in group_plans(segment_plans(ids, center, start, segment)).items():
+        count = max(1, int(numpy.ceil((stop - start) / segment_days - 1e-9)))
+        julians = segment_grid(start, count, segment_days, degree)
+        for id, rows in fetch_grid(group, center, julians).items():
+            segments = fit_segments(julians, rows, segment_days, degree)
+            stored = store_segments(id, center, segments)
+            print(f'{id}: stored {stored} of {len(segments)} segments of {segment_days:g} days')
+
+
+def report(ids, center, julians):
+    """Prints the accuracy of the stored segments for multiple objects"""
+    print(f'{"id":>8} {"samples":>8} {"max pos km":>12} {"rms pos km":>12} {"max vel km/s":>14} {"rms vel km/s":>14}')
+    for id, rows in fetch_grid(ids, center, julians).items():
+        result = accuracy_report(id, center, julians, rows)
+        if result['samples']:
+            print(f'{id:>8} {result["samples"]:>8} {result["max_pos_err"]:>12.4g} {result["rms_pos_err"]:>12.4g} '
+                  f'{result["max_vel_err"]:>14.4g} {result["rms_vel_err"]:>14.4g}')
+        else:
+            print(f'{id:>8} {0:>8}   not covered')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Precompute Chebyshev ephemeris tables from JPL Horizons')
+    parser.add_argument('command', choices=['fit', 'report'])
+    parser.add_argument('object_set')
+    parser.add_argument('start')
+    parser.add_argument('stop')
+    parser.add_argument('--center', type=int, default=0)
+    parser.add_argument('--step', type=float, default=3, help='hours between report samples')
+    parser.add_argument('--segment', type=float, default=2, help='longest span covered by a segment, in days')
+    parser.add_argument('--degree', type=int, default=11)
+    args = parser.parse_args()
+
+    try:
+        ids = get_id_list(args.object_set)
+    except UnknownSetError as exc:
+        parser.error(str(exc))
+    julians = get_grid(args.start, args.stop, args.step)
+    if args.command == 'fit':
+        fit(ids, args.center, julians[0], julians[-1], args.segment, args.degree)
+    else:
+        # sample halfway between the --step grid dates. The fitting grid depends on each object's segment length,
+        # see chebyshev.segment_plans, so these samples may coincide with fitted dates for some --step values
+        report(ids, args.center, julians[:-1] + args.step / 48)
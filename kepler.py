@@ -0,0 +1,152 @@
+"""Analytic two-body propagation of bodies with osculating orbital elements
+
+Used for small bodies such as asteroids and comets, which are too numerous to query from
+JPL Horizons one at a time. Elements are heliocentric and referred to the ecliptic and equinox
+of J2000, the same frame as the vectors returned by Horizons, and states are in au and au/d"""
+import numpy
+
+GM_SUN = 2.9591220828559115e-04     # gravitational parameter of the Sun, au^3/d^2
+SUN = 10                            # id of the Sun, the center of the elements
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-12     # radians
+CHUNK_SIZE = 2 ** 14  # body-epochs propagated at once
+
+
+class ElementTable:
+    """Osculating elements for many bodies, stored as arrays sorted by object id
+    Distances are in au, angles in radians and epochs in Julian days
+    Hyperbolic orbits have a negative semi-major axis and a mean anomaly measured from periapsis"""
+
+    def __init__(self, ids, epoch, a, e, i, long_asc, arg_peri, mean_anomaly):
+        order = numpy.argsort(ids)
+        self.ids = numpy.asarray(ids, dtype=numpy.int64)[order]
+        self.epoch = numpy.asarray(epoch, dtype=float)[order]
+        self.a = numpy.asarray(a, dtype=float)[order]
+        self.e = numpy.asarray(e, dtype=float)[order]
+        self.i = numpy.asarray(i, dtype=float)[order]
+        self.long_asc = numpy.asarray(long_asc, dtype=float)[order]
+        self.arg_peri = numpy.asarray(arg_peri, dtype=float)[order]
+        self.mean_anomaly = numpy.asarray(mean_anomaly, dtype=float)[order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def find(self, ids):
+        """Returns the index of each id in the table, -1 for ids with no elements"""
+        ids = numpy.asarray(ids, dtype=numpy.int64)
+        if not len(self.ids):
+            return numpy.full(len(ids), -1)
+        index = numpy.minimum(numpy.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return numpy.where(self.ids[index] == ids, index, -1)
+
+    def states(self, index, julians):
+        """Propagates the bodies at the given table indices to every Julian date in julians
+        Returns an (n_bodies, n_epochs, 6) array of heliocentric states in au and au/d"""
+        julians = numpy.asarray(julians, dtype=float)
+        return propagate(self.a[index], self.e[index], self.i[index], self.long_asc[index], self.arg_peri[index],
+                         self.mean_anomaly[index], self.epoch[index], julians)
+
+
+def solve_elliptic(mean_anomaly, e):
+    """Solves Kepler's equation M = E - e sin E for the eccentric anomaly of elliptic orbits, 0 <= e < 1
+    mean_anomaly and e are 1-d arrays of the same length. Uses Halley's method from Danby's starting value,
+    iterating only on the entries that have not converged yet"""
+    mean_anomaly = numpy.remainder(mean_anomaly + numpy.pi, 2 * numpy.pi) - numpy.pi
+    anomaly = mean_anomaly + 0.85 * e * numpy.sign(numpy.sin(mean_anomaly))
+    todo = numpy.arange(len(anomaly))
+    for _ in range(MAX_ITERATIONS):
+        current, ecc, mean = anomaly[todo], e[todo], mean_anomaly[todo]
+        e_sin = ecc * numpy.sin(current)
+        f = current - e_sin - mean
+        df = 1 - ecc * numpy.cos(current)
+        delta = f * df / (df * df - 0.5 * f * e_sin)
+        anomaly[todo] = current - delta
+        todo = todo[numpy.abs(delta) > TOLERANCE]
+        if not len(todo):
+            break
+    return anomaly
+
+
+def solve_hyperbolic(mean_anomaly, e):
+    """Solves Kepler's equation M = e sinh H - H for the hyperbolic anomaly of unbound orbits, e > 1
+    mean_anomaly and e are 1-d arrays of the same length. Uses Halley's method,
+    iterating only on the entries that have not converged yet"""
+    anomaly = numpy.sign(mean_anomaly) * numpy.log(2 * numpy.abs(mean_anomaly) / e + 1.8)
+    todo = numpy.arange(len(anomaly))
+    for _ in range(MAX_ITERATIONS):
+        current, ecc, mean = anomaly[todo], e[todo], mean_anomaly[todo]
+        e_sinh = ecc * numpy.sinh(current)
+        f = e_sinh - current - mean
+        df = ecc * numpy.cosh(current) - 1
+        delta = f * df / (df * df - 0.5 * f * e_sinh)
+        anomaly[todo] = current - delta
+        todo = todo[numpy.abs(delta) > TOLERANCE * numpy.maximum(1, numpy.abs(current))]
+        if not len(todo):
+            break
+    return anomaly
+
+
+def propagate(a, e, i, long_asc, arg_peri, mean_anomaly, epoch, julians, mu=GM_SUN):
+    """Propagates orbits from their elements at epoch to every date in julians
+    Element arguments are (n,) arrays and julians an (m,) array. Orbits with e < 1 are elliptic,
+    orbits with e > 1 hyperbolic with a negative semi-major axis and a mean anomaly measured from periapsis
+    Returns an (n, m, 6) array of states, in au and au/d for the default mu
+    Bodies are processed in chunks of about CHUNK_SIZE body-epochs so intermediate arrays stay in cache"""
+    julians = numpy.asarray(julians, dtype=float)
+    states = numpy.empty((len(a), len(julians), 6))
+    step = max(1, CHUNK_SIZE // max(1, len(julians)))
+    for start in range(0, len(a), step):
+        chunk = slice(start, start + step)
+        states[chunk] = propagate_chunk(a[chunk], e[chunk], i[chunk], long_asc[chunk], arg_peri[chunk],
+                                        mean_anomaly[chunk], epoch[chunk], julians, mu)
+    return states
+
+
+def propagate_chunk(a, e, i, long_asc, arg_peri, mean_anomaly, epoch, julians, mu):
+    """Propagates a chunk of bodies, see propagate"""
+    abs_a = numpy.abs(a)[:, numpy.newaxis]
+    ecc = e[:, numpy.newaxis]
+    mean_motion = numpy.sqrt(mu / abs_a ** 3)
+    mean = mean_anomaly[:, numpy.newaxis] + mean_motion * (julians - epoch[:, numpy.newaxis])
+    shape = mean.shape
+
+    # position and velocity in the orbital plane, x toward periapsis
+    # parabolic orbits, e == 1, have no finite semi-major axis and are left NaN
+    x, y, vx, vy = (numpy.full(shape, numpy.nan) for _ in range(4))
+    for bound, elliptic in [(e < 1, True), (e > 1, False)]:
+        if not bound.any():
+            continue
+        ecc_b = numpy.broadcast_to(ecc[bound], (bound.sum(), shape[1]))
+        a_b = abs_a[bound]
+        if elliptic:
+            anomaly = solve_elliptic(mean[bound].ravel(), ecc_b.ravel()).reshape(ecc_b.shape)
+            cos, sin = numpy.cos(anomaly), numpy.sin(anomaly)
+            root = numpy.sqrt(1 - ecc_b ** 2)
+            x[bound] = a_b * (cos - ecc_b)
+            rate = numpy.sqrt(mu / a_b) / (1 - ecc_b * cos)
+        else:
+            anomaly = solve_hyperbolic(mean[bound].ravel(), ecc_b.ravel()).reshape(ecc_b.shape)
+            cos, sin = numpy.cosh(anomaly), numpy.sinh(anomaly)
+            root = numpy.sqrt(ecc_b ** 2 - 1)
+            x[bound] = a_b * (ecc_b - cos)
+            rate = numpy.sqrt(mu / a_b) / (ecc_b * cos - 1)
+        y[bound] = a_b * root * sin
+        vx[bound] = -sin * rate
+        vy[bound] = root * cos * rate
+
+    # unit vectors toward periapsis (p) and 90 degrees ahead of it in the orbital plane (q),
+    # from the argument of periapsis, inclination and longitude of the ascending node
+    cos_w, sin_w = numpy.cos(arg_peri), numpy.sin(arg_peri)
+    cos_o, sin_o = numpy.cos(long_asc), numpy.sin(long_asc)
+    cos_i, sin_i = numpy.cos(i), numpy.sin(i)
+    p = numpy.stack([cos_o * cos_w - sin_o * sin_w * cos_i,
+                     sin_o * cos_w + cos_o * sin_w * cos_i,
+                     sin_w * sin_i], axis=-1)[:, numpy.newaxis, :]
+    q = numpy.stack([-cos_o * sin_w - sin_o * cos_w * cos_i,
+                     -sin_o * sin_w + cos_o * cos_w * cos_i,
+                     cos_w * sin_i], axis=-1)[:, numpy.newaxis, :]
+
+    states = numpy.empty(shape + (6,))
+    states[..., :3] = x[..., numpy.newaxis] * p + y[..., numpy.newaxis] * q
+    states[..., 3:] = vx[..., numpy.newaxis] * p + vy[..., numpy.newaxis] * q
+    return states
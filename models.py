@@ -1,7 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
+import numpy
 
 db = SQLAlchemy()
 
+# aggregate properties of each system by system id, filled in by the object registry when it loads
+system_aggregates = {}
+
 def connect_db(app):
     """Connect to database."""
 
@@ -20,25 +24,14 @@ class System(db.Model):
         return f'<System name: {self.name}>'
 
     def mass(self):
-        """Calculate total mass of system"""
+        """Calculate total mass of system
+        Uses the aggregate precomputed by the object registry if it has been loaded"""
+        if self.id in system_aggregates:
+            return system_aggregates[self.id].mass
         tot_mass = 0
         for obj in self.objects:
             tot_mass += obj.mass
         return tot_mass
-    
-    def barycenter(self, objects):
-        """Calculate the position and velocity of the system barycenter relative to the solar system barycenter"""
-        sys_mass = self.mass()
-
-        x_pos = sum([obj['position'][0] * obj['mass'] for obj in objects]) / sys_mass
-        y_pos = sum([obj['position'][1] * obj['mass'] for obj in objects]) / sys_mass
-        z_pos = sum([obj['position'][2] * obj['mass'] for obj in objects]) / sys_mass
-
-        x_vel = sum([obj['velocity'][0] * obj['mass'] for obj in objects]) / sys_mass
-        y_vel = sum([obj['velocity'][1] * obj['mass'] for obj in objects]) / sys_mass
-        z_vel = sum([obj['velocity'][2] * obj['mass'] for obj in objects]) / sys_mass
-
-        return {'position': [x_pos, y_pos, z_pos], 'velocity': [x_vel, y_vel, z_vel]}
 
 class Object(db.Model):
     """Object"""
@@ -48,9 +41,9 @@ class Object(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(), unique=True)
     designation = db.Column(db.String(), unique=True)
-    obj_type = db.Column(db.String(), nullable=False)
+    obj_type = db.Column(db.String(), nullable=False, index=True)
     sat_type = db.Column(db.String())
-    mass = db.Column(db.Float)
+    mass = db.Column(db.Float, index=True)
     radius_x = db.Column(db.Float)
     radius_y = db.Column(db.Float)
     radius_z = db.Column(db.Float)
@@ -69,7 +62,7 @@ class Object(db.Model):
     ring_color = db.Column(db.String())
     ring_transparency = db.Column(db.String())
     bump_scale = db.Column(db.Float)
-    system_id = db.Column(db.Integer, db.ForeignKey('Systems.id'), nullable=True)
+    system_id = db.Column(db.Integer, db.ForeignKey('Systems.id'), nullable=True, index=True)
     system = db.relationship('System', backref='objects')
 
     def __repr__(self):
@@ -87,3 +80,117 @@ class AltName(db.Model):
 
     def __repr__(self):
         return f'<AltName name: {self.name}>'
+
+class ObjectSet(db.Model):
+    """Named set of objects that can be requested together
+    Members are the explicit ObjectSetMember rows in order,
+    followed by every object matching all of the filter columns that are set"""
+
+    __tablename__ = 'Object-Sets'
+
+    name = db.Column(db.String(), primary_key=True)
+    description = db.Column(db.String())
+    system_id = db.Column(db.Integer, db.ForeignKey('Systems.id'))
+    obj_type = db.Column(db.String())
+    sat_type = db.Column(db.String())
+    min_mass = db.Column(db.Float)
+    max_mass = db.Column(db.Float)
+    system = db.relationship('System')
+
+    def __repr__(self):
+        return f'<ObjectSet name: {self.name}, description: {self.description}>'
+
+    def has_filter(self):
+        """Returns True if any of the filter columns are set"""
+        return any(value is not None for value in [self.system_id, self.obj_type, self.sat_type, self.min_mass, self.max_mass])
+
+class ObjectSetMember(db.Model):
+    """Explicit member of an object set"""
+
+    __tablename__ = 'Object-Set-Members'
+
+    set_name = db.Column(db.String(), db.ForeignKey('Object-Sets.name', ondelete='CASCADE'), primary_key=True)
+    obj_id = db.Column(db.Integer, db.ForeignKey('Objects.id', ondelete='CASCADE'), primary_key=True)
+    position = db.Column(db.Integer, nullable=False)
+    object_set = db.relationship('ObjectSet', backref=db.backref('members', order_by='ObjectSetMember.position', cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<ObjectSetMember set_name: {self.set_name}, obj_id: {self.obj_id}>'
+
+class Ephemeris(db.Model):
+    """Cached position and velocity vectors from JPL Horizons, in au and au/d"""
+
+    __tablename__ = 'Ephemerides'
+
+    obj_id = db.Column(db.Integer, primary_key=True)
+    center = db.Column(db.Integer, primary_key=True)
+    julian = db.Column(db.Float, primary_key=True)
+    x = db.Column(db.Float, nullable=False)
+    y = db.Column(db.Float, nullable=False)
+    z = db.Column(db.Float, nullable=False)
+    vx = db.Column(db.Float, nullable=False)
+    vy = db.Column(db.Float, nullable=False)
+    vz = db.Column(db.Float, nullable=False)
+    created = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<Ephemeris obj_id: {self.obj_id}, center: {self.center}, julian: {self.julian}>'
+
+    def vectors(self):
+        """Returns the cached vectors as an (x, y, z, vx, vy, vz) row"""
+        return (self.x, self.y, self.z, self.vx, self.vy, self.vz)
+
+class ChebyshevSegment(db.Model):
+    """Chebyshev polynomial coefficients fitted to JPL Horizons vectors over a span of dates
+    coeffs holds a little-endian float64 array of shape (6, degree + 1) for x, y, z, vx, vy, vz in au and au/d"""
+
+    __tablename__ = 'Chebyshev-Segments'
+    __table_args__ = (db.Index('ix_chebyshev_obj_center_start', 'obj_id', 'center', 'jd_start'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    obj_id = db.Column(db.Integer, nullable=False)
+    center = db.Column(db.Integer, nullable=False)
+    jd_start = db.Column(db.Float, nullable=False)
+    jd_end = db.Column(db.Float, nullable=False)
+    degree = db.Column(db.Integer, nullable=False)
+    coeffs = db.Column(db.LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f'<ChebyshevSegment obj_id: {self.obj_id}, center: {self.center}, jd_start: {self.jd_start}, jd_end: {self.jd_end}>'
+
+    def coefficients(self):
+        """Returns the coefficients as a (6, degree + 1) array"""
+        return numpy.frombuffer(self.coeffs, dtype='<f8').reshape(6, self.degree + 1)
+
+class OrbitalElements(db.Model):
+    """Heliocentric osculating orbital elements of a small body, referred to the ecliptic and equinox of J2000
+    Bodies with elements are propagated analytically instead of being queried from JPL Horizons, see kepler.py"""
+
+    __tablename__ = 'Orbital-Elements'
+
+    obj_id = db.Column(db.Integer, db.ForeignKey('Objects.id', ondelete='CASCADE'), primary_key=True)
+    epoch = db.Column(db.Float, nullable=False)             # Julian date, TDB
+    a = db.Column(db.Float, nullable=False)                 # semi-major axis, au
+    e = db.Column(db.Float, nullable=False)                 # eccentricity
+    i = db.Column(db.Float, nullable=False)                 # inclination, radians
+    long_asc = db.Column(db.Float, nullable=False)          # longitude of the ascending node, radians
+    arg_peri = db.Column(db.Float, nullable=False)          # argument of periapsis, radians
+    mean_anomaly = db.Column(db.Float, nullable=False)      # mean anomaly at epoch, radians
+    abs_magnitude = db.Column(db.Float, index=True)         # absolute magnitude H
+    obj = db.relationship('Object', backref=db.backref('elements', uselist=False))
+
+    def __repr__(self):
+        return f'<OrbitalElements obj_id: {self.obj_id}, epoch: {self.epoch}, a: {self.a}, e: {self.e}>'
+
+class RegistryVersion(db.Model):
+    """Single row counting the committed changes to the rows the object registry is loaded from
+    Lets every process notice changes committed by another, such as seed.py or catalogue.py, see registry.py"""
+
+    __tablename__ = 'Registry-Version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    updated = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<RegistryVersion version: {self.version}, updated: {self.updated}>'
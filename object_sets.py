@@ -0,0 +1,165 @@
+"""Object sets that can be requested from /bodies
+
+Built-in sets are defined by rules over the System and Object tables rather than by id ranges,
+so new objects join the right sets without code changes. User-defined sets are rows in the
+Object-Sets table, with explicit members and/or filters resolved through an indexed query.
+Every set is resolved once into an immutable tuple of ids and kept until the object registry reloads
+
+Usage:
+    python object_sets.py sync
+    python object_sets.py define <name> [--description TEXT] [--system NAME] [--obj-type TYPE]
+                                        [--sat-type TYPE] [--min-mass KG] [--max-mass KG] [--ids ID,ID,...]
+    python object_sets.py list"""
+from models import db, Object, System, ObjectSet, ObjectSetMember
+from registry import get_registry
+from sqlalchemy.exc import SQLAlchemyError
+import threading
+import argparse
+
+STAR = 'G-type main-sequence star'
+PLANETS = ['Terrestrial planet', 'Gas giant', 'Ice giant']
+DWARF_PLANET = 'Dwarf planet'
+ALL_SYSTEMS = ['Mercury', 'Venus', 'Earth', 'Mars', 'Jupiter', 'Saturn', 'Uranus', 'Neptune', 'Pluto']
+
+# each rule includes every object in the listed systems, every object of the listed types, and the listed ids
+BUILTIN_SETS = {
+    'full': {'description': 'full solar system', 'systems': ALL_SYSTEMS, 'obj_types': [STAR, DWARF_PLANET]},
+    'inner': {'description': 'inner solar system', 'systems': ALL_SYSTEMS[:4], 'obj_types': [STAR], 'ids': [1]},
+    'outer': {'description': 'outer solar system', 'systems': ALL_SYSTEMS[4:], 'obj_types': [STAR], 'ids': [136108, 136199, 136472]},
+    'planets': {'description': 'planets only', 'obj_types': [STAR] + PLANETS},
+    'dwarves': {'description': 'dwarf planets only', 'obj_types': [STAR, DWARF_PLANET]},
+    'planets-dwarves': {'description': 'planets and dwarf planets', 'obj_types': [STAR] + PLANETS + [DWARF_PLANET]},
+    '3': {'description': 'earth-moon system', 'systems': ['Earth'], 'obj_types': [STAR]},
+    '4': {'description': 'martian system', 'systems': ['Mars'], 'obj_types': [STAR]},
+    '5': {'description': 'jovian system', 'systems': ['Jupiter'], 'obj_types': [STAR]},
+    '6': {'description': 'saturnian system', 'systems': ['Saturn'], 'obj_types': [STAR]},
+    '7': {'description': 'uranian system', 'systems': ['Uranus'], 'obj_types': [STAR]},
+    '8': {'description': 'neptunian system', 'systems': ['Neptune'], 'obj_types': [STAR]},
+    '9': {'description': 'plutonian system', 'systems': ['Pluto'], 'obj_types': [STAR]},
+}
+
+_sets = {}
+_sets_version = None
+_lock = threading.Lock()
+
+
+def sort_key(record):
+    """Orders the Sun first, then each system with its primary ahead of its satellites, then everything else"""
+    is_star = record.obj_type == STAR
+    is_satellite = 'satellite' in record.obj_type.lower()
+    return (not is_star, record.system_id is None, record.system_id or 0, is_satellite, record.id)
+
+
+def resolve_rule(rule, registry):
+    """Returns the ids matched by a built-in rule as a tuple"""
+    systems = set(rule.get('systems', []))
+    obj_types = set(rule.get('obj_types', []))
+    ids = set(rule.get('ids', []))
+    records = [record for record in registry.records.values()
+               if record.system_name in systems or record.obj_type in obj_types or record.id in ids]
+    return tuple(record.id for record in sorted(records, key=sort_key))
+
+
+def resolve_stored(object_set):
+    """Returns the ids of a stored set: its explicit members in order, then any objects matching its filters"""
+    ids = [member.obj_id for member in object_set.members]
+    if object_set.has_filter():
+        query = Object.query.with_entities(Object.id)
+        if object_set.system_id is not None:
+            query = query.filter(Object.system_id == object_set.system_id)
+        if object_set.obj_type is not None:
+            query = query.filter(Object.obj_type == object_set.obj_type)
+        if object_set.sat_type is not None:
+            query = query.filter(Object.sat_type == object_set.sat_type)
+        if object_set.min_mass is not None:
+            query = query.filter(Object.mass >= object_set.min_mass)
+        if object_set.max_mass is not None:
+            query = query.filter(Object.mass <= object_set.max_mass)
+        explicit = set(ids)
+        ids.extend(id for (id,) in query.order_by(Object.id) if id not in explicit)
+    return tuple(ids)
+
+
+def load_sets(registry):
+    """Resolves every stored and built-in set
+    Stored sets take precedence over built-in rules of the same name"""
+    sets = {name: resolve_rule(rule, registry) for name, rule in BUILTIN_SETS.items()}
+    try:
+        for object_set in ObjectSet.query.all():
+            sets[object_set.name] = resolve_stored(object_set)
+    except SQLAlchemyError:
+        db.session.rollback()
+    return sets
+
+
+def get_set(name):
+    """Returns the ids in an object set as a tuple, or None if there is no such set"""
+    global _sets, _sets_version
+    registry = get_registry()
+    with _lock:
+        if _sets_version != registry.version:
+            _sets = load_sets(registry)
+            _sets_version = registry.version
+        return _sets.get(name)
+
+
+class UnknownSetError(LookupError):
+    """Raised for an object set name that is neither built in nor defined in the database"""
+
+
+def get_id_list(object_set):
+    """Returns the ids in an object set, raising UnknownSetError if there is no such set"""
+    ids = get_set(object_set)
+    if ids is None:
+        raise UnknownSetError(f'unknown object set {object_set!r}')
+    return ids
+
+
+def sync_builtin_sets():
+    """Stores the built-in sets, resolved against the current System and Object tables, as explicit members"""
+    registry = get_registry()
+    for name, rule in BUILTIN_SETS.items():
+        object_set = ObjectSet.query.get(name) or ObjectSet(name=name)
+        object_set.description = rule['description']
+        object_set.members = [ObjectSetMember(obj_id=id, position=i) for i, id in enumerate(resolve_rule(rule, registry))]
+        db.session.add(object_set)
+    db.session.commit()
+
+
+def define_set(name, description=None, system=None, obj_type=None, sat_type=None, min_mass=None, max_mass=None, ids=None):
+    """Creates or replaces a user-defined set"""
+    object_set = ObjectSet.query.get(name) or ObjectSet(name=name)
+    object_set.description = description
+    object_set.system_id = System.query.filter_by(name=system).one().id if system else None
+    object_set.obj_type = obj_type
+    object_set.sat_type = sat_type
+    object_set.min_mass = min_mass
+    object_set.max_mass = max_mass
+    object_set.members = [ObjectSetMember(obj_id=id, position=i) for i, id in enumerate(ids or [])]
+    db.session.add(object_set)
+    db.session.commit()
+    return object_set
+
+
+if __name__ == '__main__':
+    from app import app
+
+    parser = argparse.ArgumentParser(description='Manage object sets')
+    parser.add_argument('command', choices=['sync', 'define', 'list'])
+    parser.add_argument('name', nargs='?')
+    parser.add_argument('--description')
+    parser.add_argument('--system')
+    parser.add_argument('--obj-type')
+    parser.add_argument('--sat-type')
+    parser.add_argument('--min-mass', type=float)
+    parser.add_argument('--max-mass', type=float)
+    parser.add_argument('--ids', type=lambda ids: [int(id) for id in ids.split(',')])
+    args = parser.parse_args()
+
+    if args.command == 'sync':
+        sync_builtin_sets()
+    elif args.command == 'define':
+        define_set(args.name, args.description, args.system, args.obj_type, args.sat_type,
+                   args.min_mass, args.max_mass, args.ids)
+    for name, ids in sorted(load_sets(get_registry()).items()):
+        print(f'{name}: {len(ids)} objects')
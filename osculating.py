@@ -0,0 +1,123 @@
+"""Osculating orbital elements computed from state vectors, for many bodies and epochs at once
+
+Server-side counterpart of Body.getOrbitalParams in static/classes.js. Each object's elements are
+relative to the body it orbits: the primary of its system, the most massive member, for moons,
+and the Sun for primaries and objects with no system. Distances are in km and angles in radians,
+referred to the same ecliptic frame as the state vectors. Hyperbolic orbits have a negative
+semi-major axis, as in kepler.py"""
+from functions import get_state_batch, get_state_batch_async
+from registry import get_registry
+from propagation import G, sample_states
+import asyncio
+import numpy
+
+ELEMENTS = ['a', 'e', 'i', 'long_asc', 'arg_peri', 'true_anomaly', 'mean_anomaly']
+TOLERANCE = 1e-11   # eccentricities and sines of inclination below this are treated as circular and equatorial
+
+
+def osculating_elements(states, mu):
+    """Returns the elements of orbits with states relative to the central body
+    states is a (..., 6) array in km and km/s and mu the gravitational parameter in km^3/s^2,
+    a scalar or an array broadcasting against states[..., 0]
+    Returns a dict of arrays of the same shape as states[..., 0], keyed by ELEMENTS
+    The node of equatorial orbits is placed on the x axis and the periapsis of circular orbits at the node"""
+    pos, vel = states[..., :3], states[..., 3:]
+    r = numpy.linalg.norm(pos, axis=-1)
+    speed_sq = (vel * vel).sum(axis=-1)
+    radial = (pos * vel).sum(axis=-1)
+    h_vec = numpy.cross(pos, vel)
+    h = numpy.linalg.norm(h_vec, axis=-1)
+
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        e_vec = ((speed_sq - mu / r)[..., numpy.newaxis] * pos - radial[..., numpy.newaxis] * vel) / numpy.expand_dims(mu, -1)
+        e = numpy.linalg.norm(e_vec, axis=-1)
+        a = 1 / (2 / r - speed_sq / mu)
+        i = numpy.arccos(numpy.clip(h_vec[..., 2] / h, -1, 1))
+        # the ascending node lies along z cross h, undefined for equatorial orbits
+        equatorial = numpy.hypot(h_vec[..., 0], h_vec[..., 1]) < TOLERANCE * h
+        long_asc = numpy.where(equatorial, 0.0, numpy.arctan2(h_vec[..., 0], -h_vec[..., 1]))
+        node = numpy.stack((numpy.cos(long_asc), numpy.sin(long_asc), numpy.zeros_like(long_asc)), axis=-1)
+
+        # angles in the orbital plane are measured from the node, in the direction of motion
+        h_unit = h_vec / h[..., numpy.newaxis]
+        ahead = numpy.cross(h_unit, node)
+        circular = e < TOLERANCE
+        arg_peri = numpy.where(circular, 0.0, numpy.arctan2((e_vec * ahead).sum(axis=-1), (e_vec * node).sum(axis=-1)))
+        latitude = numpy.arctan2((pos * ahead).sum(axis=-1), (pos * node).sum(axis=-1))
+        true_anomaly = latitude - arg_peri
+
+        half = numpy.tan(true_anomaly / 2)
+        elliptic = numpy.sqrt(numpy.abs((1 - e) / (1 + e))) * half
+        eccentric = 2 * numpy.arctan(elliptic)
+        hyperbolic = 2 * numpy.arctanh(numpy.where(e > 1, elliptic, 0.0))
+        mean_anomaly = numpy.where(e < 1, eccentric - e * numpy.sin(eccentric), e * numpy.sinh(hyperbolic) - hyperbolic)
+
+    return {'a': a, 'e': e, 'i': i,
+            'long_asc': numpy.remainder(long_asc, 2 * numpy.pi),
+            'arg_peri': numpy.remainder(arg_peri, 2 * numpy.pi),
+            'true_anomaly': numpy.where(e < 1, numpy.remainder(true_anomaly, 2 * numpy.pi), wrap(true_anomaly)),
+            'mean_anomaly': numpy.where(e < 1, numpy.remainder(mean_anomaly, 2 * numpy.pi), mean_anomaly)}
+
+
+def wrap(angles):
+    """Wraps angles to [-pi, pi), used for hyperbolic orbits where anomalies are signed"""
+    return numpy.remainder(angles + numpy.pi, 2 * numpy.pi) - numpy.pi
+
+
+def element_columns(elements, epoch=0):
+    """Returns the elements at one epoch as an (n, len(ELEMENTS)) array, one row per object"""
+    return numpy.column_stack([elements[name][:, epoch] for name in ELEMENTS])
+
+
+def build_element_obj(elements, index, epoch=0):
+    """Builds the JSON elements of one object at one epoch, with None where they are not available"""
+    values = [elements[name][index, epoch] for name in ELEMENTS]
+    return {name: None if numpy.isnan(value) else float(value) for name, value in zip(ELEMENTS, values)}
+
+
+def element_query_ids(obj_ids):
+    """Returns the ids of the objects and of every body they orbit, and the id each object orbits"""
+    primary_ids = get_registry().get_primary_ids(obj_ids)
+    query_ids = list(obj_ids)
+    known = set(query_ids)
+    for primary_id in primary_ids.tolist():
+        if primary_id >= 0 and primary_id not in known:
+            query_ids.append(primary_id)
+            known.add(primary_id)
+    return query_ids, primary_ids
+
+
+def build_elements(obj_ids, query_ids, primary_ids, states):
+    """Computes elements from states fetched for element_query_ids(obj_ids), see get_element_batch"""
+    masses = get_registry().get_masses(query_ids)
+    rows = {id: row for row, id in enumerate(query_ids)}
+    primary_rows = numpy.array([rows.get(id, -1) for id in primary_ids.tolist()], dtype=numpy.intp)
+
+    relative = numpy.full((len(obj_ids),) + states.shape[1:], numpy.nan)
+    mu = numpy.full(len(obj_ids), numpy.nan)
+    orbiting = primary_rows >= 0
+    relative[orbiting] = states[:len(obj_ids)][orbiting] - states[primary_rows[orbiting]]
+    mu[orbiting] = G * (masses[:len(obj_ids)][orbiting] + masses[primary_rows[orbiting]])
+    return osculating_elements(relative, mu[:, numpy.newaxis])
+
+
+def get_element_batch(obj_ids, datetimes):
+    """Returns the osculating elements of multiple objects relative to the bodies they orbit at one or more dates
+    as a dict keyed by ELEMENTS of arrays of shape (len(obj_ids), len(datetimes)), NaN where data was not available
+    States for the objects and the bodies they orbit come from functions.get_state_batch in one batch"""
+    query_ids, primary_ids = element_query_ids(obj_ids)
+    return build_elements(obj_ids, query_ids, primary_ids, get_state_batch(query_ids, 0, datetimes))
+
+
+def get_element_series(obj_ids, datetimes):
+    """Returns osculating elements like get_element_batch at many dates in order, with states from
+    propagation.sample_states, which fetches the objects it must integrate once, at the first date"""
+    query_ids, primary_ids = element_query_ids(obj_ids)
+    return build_elements(obj_ids, query_ids, primary_ids, sample_states(query_ids, 0, datetimes[0], datetimes))
+
+
+async def get_element_batch_async(obj_ids, datetimes):
+    """Coroutine version of get_element_batch that awaits the upstream fetch instead of blocking on it"""
+    query_ids, primary_ids = await asyncio.to_thread(element_query_ids, obj_ids)
+    states = await get_state_batch_async(query_ids, 0, datetimes)
+    return await asyncio.to_thread(build_elements, obj_ids, query_ids, primary_ids, states)
@@ -0,0 +1,140 @@
+from registry import get_registry
+from functions import get_state_batch, cached_ids, build_states, STATE_TO_KM
+from chebyshev import evaluate_batch
+from bundle import get_bundle
+from julian import to_jd
+from kepler import SUN
+import datetime
+import numpy
+
+G = 6.67408e-20     # universal gravitational constant, km3/(kg*s2), same value as static/barnes-hut.js
+BLOCK_PAIRS = 2 ** 20   # body pairs evaluated at once by direct summation
+MAX_STEP = 600          # longest integration step in seconds for trajectory frames and sampled states
+
+# symplectic integrators as alternating drift (position) and kick (velocity) coefficients
+# each step drifts by c[0], kicks by d[0], drifts by c[1], ... and ends with a final drift by c[-1]
+_cbrt2 = 2 ** (1 / 3)
+_w1 = 1 / (2 - _cbrt2)
+_w0 = -_cbrt2 / (2 - _cbrt2)
+INTEGRATORS = {
+    'leapfrog': ([0.5, 0.5], [1.0]),
+    'yoshida4': ([_w1 / 2, (_w0 + _w1) / 2, (_w0 + _w1) / 2, _w1 / 2], [_w1, _w0, _w1])
+}
+
+
+def accelerations(pos, masses):
+    """Calculates the gravitational acceleration on every body from every other body by direct summation
+    pos is an (n, 3) array in km and masses an (n,) array in kg
+    Returns an (n, 3) array in km/s2"""
+    n = len(pos)
+    acc = numpy.empty((n, 3))
+    # bodies are handled in blocks so the pairwise arrays stay small for large n
+    block = max(1, BLOCK_PAIRS // max(n, 1))
+    for start in range(0, n, block):
+        rows = slice(start, min(start + block, n))
+        diff = pos[numpy.newaxis, :, :] - pos[rows, numpy.newaxis, :]   # diff[i, j] points from body i to body j
+        dist_sq = numpy.einsum('ijk,ijk->ij', diff, diff)
+        # a body exerts no gravitational force on itself
+        dist_sq[numpy.arange(rows.stop - start), numpy.arange(start, rows.stop)] = numpy.inf
+        acc[rows] = G * numpy.einsum('ijk,ij,j->ik', diff, dist_sq ** -1.5, masses)
+    return acc
+
+
+def step(pos, vel, masses, dt, integrator='yoshida4', accel=accelerations):
+    """Advances positions and velocities in place by dt seconds, which may be negative"""
+    drifts, kicks = INTEGRATORS[integrator]
+    for drift, kick in zip(drifts, kicks):
+        pos += drift * dt * vel
+        vel += kick * dt * accel(pos, masses)
+    pos += drifts[-1] * dt * vel
+
+
+def trajectory(states, masses, offsets, max_step, integrator='yoshida4', accel=accelerations):
+    """Integrates an (n, 6) array of states in km and km/s through a sequence of time offsets in seconds,
+    measured from the time of the initial states
+    Offsets may be negative to integrate backward; each is reached using steps no longer than max_step
+    Yields an (n, 6) array of states at each offset in turn"""
+    pos = numpy.array(states[:, :3], dtype=float)
+    vel = numpy.array(states[:, 3:], dtype=float)
+    masses = numpy.asarray(masses, dtype=float)
+    t = 0.0
+    for offset in offsets:
+        count = int(numpy.ceil(abs(offset - t) / max_step))
+        if count:
+            dt = (offset - t) / count
+            for i in range(count):
+                step(pos, vel, masses, dt, integrator, accel)
+        t = offset
+        yield numpy.hstack((pos, vel))
+
+
+def integration_steps(duration, step, max_step=MAX_STEP):
+    """Returns the number of integration steps taken to produce a state every step seconds over duration seconds"""
+    return int(abs(duration) // step) * int(numpy.ceil(step / max_step))
+
+
+def get_masses(obj_ids):
+    """Returns an array of masses in kg for multiple objects from the object registry"""
+    return get_registry().get_masses(obj_ids)
+
+
+def propagate_batch(obj_ids, center, start, datetimes, max_step=3600, integrator='yoshida4'):
+    """Seeds an N-body integration with a single ephemeris fetch at start
+    and returns states at each of datetimes as an array of shape (len(obj_ids), len(datetimes), 6)
+    in km and km/s, NaN for objects with no data at start
+    datetimes must be in order, and may fall before or after start"""
+    initial = get_state_batch(obj_ids, center, [start])[:, 0]
+    available = ~numpy.isnan(initial[:, 0])
+    masses = get_masses(obj_ids)
+
+    offsets = [(date_time - start).total_seconds() for date_time in datetimes]
+    states = numpy.full((len(obj_ids), len(datetimes), 6), numpy.nan)
+    frames = trajectory(initial[available], masses[available], offsets, max_step, integrator)
+    for i, frame in enumerate(frames):
+        states[available, i] = frame
+    return states
+
+
+def sample_states(obj_ids, center, start, datetimes, max_step=MAX_STEP, integrator='yoshida4'):
+    """Returns states like functions.get_state_batch at many datetimes, without querying the ephemeris at each of them
+    Objects with orbital elements are propagated analytically, and objects whose Chebyshev segments or offline bundle
+    cover every date are evaluated from them. The rest are integrated with propagate_batch from a single fetch at start,
+    along with the other objects and the Sun as perturbers
+    datetimes must be in order, and may fall before or after start"""
+    julians = [to_jd(date_time, fmt='jd') for date_time in datetimes]
+    elements = get_registry().elements
+    ids = cached_ids(obj_ids, center, elements)
+    bundle = get_bundle()
+    vectors = bundle.lookup(ids, center, julians) if bundle is not None else evaluate_batch(ids, center, julians)
+    integrated = [i for i, id in enumerate(ids) if vectors.get(id) is None]
+    if integrated:
+        perturbers = ids if SUN in ids or center == SUN else ids + [SUN]
+        states = propagate_batch(perturbers, center, start, datetimes, max_step, integrator) / STATE_TO_KM
+        for i in integrated:
+            vectors[ids[i]] = None if numpy.isnan(states[i]).any() else states[i].tolist()
+    return build_states(obj_ids, center, julians, vectors, elements)
+
+
+def trajectory_frames(obj_ids, center, start, end, step, max_step=MAX_STEP, integrator='yoshida4'):
+    """Seeds an N-body integration with a single ephemeris fetch at start
+    and lazily integrates it to end, producing a frame every step seconds
+    end may fall before start to integrate backward
+    Returns the ids of objects with data at start, and a generator of (datetime, states) frames
+    where states is an (n, 6) array in km and km/s in the same order as the ids"""
+    initial = get_state_batch(obj_ids, center, [start])[:, 0]
+    available = ~numpy.isnan(initial[:, 0])
+    masses = get_masses(obj_ids)
+    ids = [obj_id for obj_id, has_data in zip(obj_ids, available) if has_data]
+
+    duration = (end - start).total_seconds()
+    count = int(abs(duration) // step)
+    direction = 1 if duration >= 0 else -1
+    # offsets are generated as the frames are consumed, so memory use does not grow with the range
+    offsets = (direction * i * step for i in range(count + 1))
+    frames = trajectory(initial[available], masses[available], offsets, max_step, integrator)
+
+    def timed_frames():
+        for i, states in enumerate(frames):
+            yield start + datetime.timedelta(seconds=direction * i * step), states
+
+    return ids, timed_frames()
@@ -0,0 +1,207 @@
+from models import db, Object, System, AltName, ObjectSet, ObjectSetMember, OrbitalElements, RegistryVersion, system_aggregates
+from kepler import ElementTable, SUN
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import event
+import threading
+import datetime
+import numpy
+import time
+import os
+
+VERSION_CHECK = float(os.environ.get('REGISTRY_VERSION_CHECK', 5))    # seconds between checks for changes committed elsewhere
+
+# columns of the Objects table copied onto each record
+OBJECT_COLUMNS = [column.name for column in Object.__table__.columns]
+
+
+class ObjectRecord:
+    """Read-only copy of an Object row, with its system name and alternate names"""
+
+    __slots__ = OBJECT_COLUMNS + ['system_name', 'alt_names']
+
+    def __init__(self, row, alt_names=()):
+        for column in OBJECT_COLUMNS:
+            setattr(self, column, row[column])
+        self.system_name = row['system_name']
+        self.alt_names = tuple(alt_names)
+
+    def __repr__(self):
+        return f'<ObjectRecord id: {self.id}, name: {self.name}>'
+
+
+class SystemRecord:
+    """Aggregate properties of a System, precomputed from its member objects"""
+
+    __slots__ = ['id', 'name', 'mass', 'member_count', 'mean_radius', 'member_ids', 'primary_id']
+
+    def __init__(self, id, name, members):
+        self.id = id
+        self.name = name
+        self.member_count = len(members)
+        self.member_ids = numpy.array(sorted(record.id for record in members), dtype=numpy.int64)
+        self.member_ids.setflags(write=False)
+
+        masses = numpy.array([record.mass or 0.0 for record in members])
+        radii = numpy.array([numpy.mean([record.radius_x or 0.0, record.radius_y or 0.0, record.radius_z or 0.0])
+                             for record in members])
+        self.mass = float(masses.sum())                                                   # total mass, kg
+        self.mean_radius = float((masses * radii).sum() / self.mass) if self.mass else 0.0  # mass-weighted mean radius, km
+        self.primary_id = members[int(numpy.argmax(masses))].id                          # most massive member
+
+    def __repr__(self):
+        return f'<SystemRecord id: {self.id}, name: {self.name}, mass: {self.mass}, member_count: {self.member_count}>'
+
+
+class Registry:
+    """In-memory copy of every Object row, loaded in bulk, with aggregates for every System
+    and the orbital elements of every small body that has them
+    ids, masses, system_ids and primary_ids are sorted arrays for vectorized lookups by index"""
+
+    def __init__(self, records, version, elements=None):
+        self.records = records                                          # dict of id to ObjectRecord
+        self.version = version                                          # incremented every time the registry is reloaded
+        self.elements = elements or ElementTable([], [], [], [], [], [], [], [])
+        self.ids = numpy.array(sorted(records), dtype=numpy.int64)
+        self.masses = numpy.array([records[id].mass or 0.0 for id in self.ids])
+        # objects with no system get system id -1
+        self.system_ids = numpy.array([records[id].system_id or -1 for id in self.ids], dtype=numpy.int64)
+
+        members = {}
+        for record in records.values():
+            if record.system_id is not None:
+                members.setdefault((record.system_id, record.system_name), []).append(record)
+        self.systems = {id: SystemRecord(id, name, system_members) for (id, name), system_members in members.items()}
+
+        # each object orbits the primary of its system, and primaries and objects with no system orbit the Sun
+        primaries = {id: system.primary_id for id, system in self.systems.items()}
+        self.primary_ids = numpy.array([primaries.get(system_id, SUN) for system_id in self.system_ids], dtype=numpy.int64)
+        self.primary_ids[self.primary_ids == self.ids] = SUN
+        self.primary_ids[self.ids == SUN] = -1
+
+    def get(self, id):
+        """Returns the record for an id, or None"""
+        return self.records.get(id)
+
+    def get_masses(self, ids):
+        """Returns an array of masses in kg for multiple ids, 0 for unknown ids"""
+        return self.lookup(ids, self.masses, 0.0)
+
+    def get_system_ids(self, ids):
+        """Returns an array of system ids for multiple ids, -1 for objects with no system and unknown ids"""
+        return self.lookup(ids, self.system_ids, -1)
+
+    def get_primary_ids(self, ids):
+        """Returns an array with the id of the body each object orbits, -1 for the Sun and unknown ids"""
+        return self.lookup(ids, self.primary_ids, -1)
+
+    def lookup(self, ids, values, default):
+        """Returns the entries of an array aligned with self.ids for multiple ids, default for unknown ids"""
+        ids = numpy.asarray(ids, dtype=numpy.int64)
+        if not len(self.ids):
+            return numpy.full(len(ids), default, dtype=values.dtype)
+        index = numpy.minimum(numpy.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return numpy.where(self.ids[index] == ids, values[index], default)
+
+
+_registry = None
+_version = 0
+_stored_version = None      # version row the registry was loaded at
+_checked = 0.0              # time.monotonic() of the last check of the version row
+_lock = threading.Lock()
+
+
+def load_registry():
+    """Loads every Object row with its system name, every alternate name and every set of orbital elements
+    into a new registry, using one column query per table rather than building ORM objects,
+    which keeps loading fast for catalogues with hundreds of thousands of small bodies"""
+    global _version
+    rows = db.session.query(*Object.__table__.columns, System.name.label('system_name')) \
+        .outerjoin(System, Object.system_id == System.id).all()
+    alt_names = {}
+    for obj_id, name in db.session.query(AltName.obj_id, AltName.name).order_by(AltName.id):
+        alt_names.setdefault(obj_id, []).append(name)
+    elements = db.session.query(OrbitalElements.obj_id, OrbitalElements.epoch, OrbitalElements.a, OrbitalElements.e,
+                                OrbitalElements.i, OrbitalElements.long_asc, OrbitalElements.arg_peri,
+                                OrbitalElements.mean_anomaly).all()
+
+    _version += 1
+    records = {row.id: ObjectRecord(row._mapping, alt_names.get(row.id, ())) for row in rows}
+    return Registry(records, _version, ElementTable(*zip(*elements)) if elements else None)
+
+
+def stored_version():
+    """Returns the version row's count of committed registry changes, 0 if there is no row yet
+    or None if the table cannot be read"""
+    try:
+        return db.session.query(RegistryVersion.version).filter_by(id=1).scalar() or 0
+    except SQLAlchemyError:
+        db.session.rollback()
+        return None
+
+
+def bump_version(session):
+    """Increments the version row in the session's transaction, so every process reloads its registry
+    once the transaction commits"""
+    table = RegistryVersion.__table__
+    now = datetime.datetime.utcnow()
+    connection = session.connection()
+    updated = connection.execute(table.update().where(table.c.id == 1).values(version=table.c.version + 1, updated=now))
+    if not updated.rowcount:
+        connection.execute(table.insert().values(id=1, version=1, updated=now))
+
+
+def get_registry():
+    """Returns the object registry, loading it on first use
+    and again once the version row shows changes committed by another process, checked every VERSION_CHECK seconds
+    Publishes the system aggregates to System.mass"""
+    global _registry, _stored_version, _checked
+    with _lock:
+        if _registry is not None and time.monotonic() - _checked > VERSION_CHECK:
+            _checked = time.monotonic()
+            if stored_version() != _stored_version:
+                _registry = None
+        if _registry is None:
+            # the version is read first, so changes committed during the load are picked up by the next check
+            _stored_version = stored_version()
+            _checked = time.monotonic()
+            _registry = load_registry()
+            system_aggregates.clear()
+            system_aggregates.update(_registry.systems)
+        return _registry
+
+
+def reset_registry():
+    """Discards the object registry and system aggregates so they are reloaded on next use"""
+    global _registry
+    with _lock:
+        _registry = None
+        system_aggregates.clear()
+
+
+@event.listens_for(Session, 'after_flush')
+def track_changes(session, flush_context):
+    """Marks the session if it wrote any Object, System, AltName, OrbitalElements or object set rows,
+    and bumps the version row once per transaction that does"""
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(instance, (Object, System, AltName, OrbitalElements, ObjectSet, ObjectSetMember)) for instance in changed):
+        session.info['registry_changed'] = True
+        if not session.info.get('version_bumped'):
+            bump_version(session)
+            session.info['version_bumped'] = True
+
+
+@event.listens_for(Session, 'after_rollback')
+def forget_changes(session):
+    """Clears the marks left by track_changes when the transaction is rolled back"""
+    session.info.pop('registry_changed', None)
+    session.info.pop('version_bumped', None)
+
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_on_commit(session):
+    """Discards the registry once changes to Object, System, AltName, OrbitalElements or object set rows are committed
+    Anything derived from the registry, such as resolved object sets, is rebuilt when its version changes"""
+    session.info.pop('version_bumped', None)
+    if session.info.pop('registry_changed', False):
+        reset_registry()
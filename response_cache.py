@@ -0,0 +1,179 @@
+"""Cache of serialized /bodies responses, keyed on the request with its epoch quantized
+
+A /bodies response depends only on the object set, center, frame, epoch and output format, so with
+RESPONSE_CACHE=True the requested epoch is rounded to RESPONSE_CACHE_RESOLUTION seconds and the finished
+payload is stored along with its gzip and, if the brotli package is installed, brotli encodings.
+Repeat requests for the same rounded epoch are answered from a bounded in-memory LRU cache, or from
+an on-disk tier shared by every worker if RESPONSE_CACHE_DIR is set, without touching the ephemeris cache
+or serializing anything. Entries expire after RESPONSE_CACHE_TTL seconds and are keyed on the ids the
+object set resolves to, so a set that gains or loses objects gets new entries"""
+from cache import LRUCache
+import threading
+import datetime
+import hashlib
+import json
+import numpy
+import gzip
+import time
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENABLED = os.environ.get('RESPONSE_CACHE', 'False') == 'True'
+RESOLUTION = float(os.environ.get('RESPONSE_CACHE_RESOLUTION', 60))         # seconds epochs are rounded to
+SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 256))                      # max responses held in memory
+TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 3600))                     # seconds a response stays valid
+DISK_DIR = os.environ.get('RESPONSE_CACHE_DIR')                             # no disk tier if unset
+DISK_SIZE = int(os.environ.get('RESPONSE_CACHE_DISK_SIZE', 10000))          # max responses held on disk
+PRUNE_INTERVAL = 100    # disk writes between checks of the disk tier's size
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+EPOCH = datetime.datetime(1970, 1, 1)
+# content codings in order of preference, identity last
+ENCODINGS = (['br'] if brotli else []) + ['gzip', 'identity']
+
+
+def quantize(date_time, resolution=RESOLUTION):
+    """Rounds a datetime to the nearest multiple of resolution seconds since 1970"""
+    seconds = (date_time - EPOCH).total_seconds()
+    return EPOCH + datetime.timedelta(seconds=round(seconds / resolution) * resolution)
+
+
+def cache_key(ids, *parts):
+    """Returns a hex digest identifying a response from the ids it covers and the other values it depends on"""
+    digest = hashlib.sha256(numpy.asarray(ids, dtype=numpy.int64).tobytes())
+    digest.update(json.dumps(parts, default=str).encode())
+    return digest.hexdigest()
+
+
+class CachedResponse:
+    """A serialized response body in every supported encoding, with its mimetype, extra headers and ETag"""
+
+    __slots__ = ['mimetype', 'headers', 'etag', 'bodies']
+
+    def __init__(self, mimetype, headers, etag, bodies):
+        self.mimetype = mimetype
+        self.headers = headers      # dict of header name to value
+        self.etag = etag
+        self.bodies = bodies        # dict of content coding to bytes
+
+    @classmethod
+    def encode(cls, mimetype, headers, body):
+        """Compresses a body into every supported encoding"""
+        bodies = {'identity': body, 'gzip': gzip.compress(body, GZIP_LEVEL, mtime=0)}
+        if brotli:
+            bodies['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+        return cls(mimetype, headers, hashlib.sha256(body).hexdigest()[:32], bodies)
+
+    def negotiate(self, accept_encodings):
+        """Returns the preferred content coding the client accepts, and the body in that coding"""
+        for encoding in ENCODINGS:
+            if encoding in self.bodies and (encoding == 'identity' or accept_encodings[encoding]):
+                return encoding, self.bodies[encoding]
+
+    def dump(self):
+        """Serializes the response as a JSON header line followed by the bodies"""
+        encodings = sorted(self.bodies)
+        header = {'mimetype': self.mimetype, 'headers': self.headers, 'etag': self.etag,
+                  'lengths': [[encoding, len(self.bodies[encoding])] for encoding in encodings]}
+        return json.dumps(header).encode() + b'\n' + b''.join(self.bodies[encoding] for encoding in encodings)
+
+    @classmethod
+    def load(cls, data):
+        """Reads a response written by dump"""
+        line, _, rest = data.partition(b'\n')
+        header = json.loads(line)
+        bodies, offset = {}, 0
+        for encoding, length in header['lengths']:
+            bodies[encoding] = rest[offset:offset + length]
+            offset += length
+        return cls(header['mimetype'], header['headers'], header['etag'], bodies)
+
+
+class ResponseCache:
+    """Memory tier backed by an optional directory of response files shared between processes"""
+
+    def __init__(self, size, ttl, directory=None, disk_size=DISK_SIZE):
+        self.memory = LRUCache(size, ttl)
+        self.ttl = ttl
+        self.directory = directory
+        self.disk_size = disk_size
+        self.lock = threading.Lock()
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.writes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """Returns the CachedResponse stored for key, or None"""
+        response = self.memory.get(key)
+        if response is not None or not self.directory:
+            return response
+        path = os.path.join(self.directory, key)
+        try:
+            if os.path.getmtime(path) + self.ttl >= time.time():
+                with open(path, 'rb') as file:
+                    response = CachedResponse.load(file.read())
+        except (OSError, ValueError):
+            response = None
+        with self.lock:
+            if response is None:
+                self.disk_misses += 1
+            else:
+                self.disk_hits += 1
+        if response is not None:
+            self.memory.set(key, response)
+        return response
+
+    def set(self, key, response):
+        """Stores a CachedResponse in memory and on disk"""
+        self.memory.set(key, response)
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, key)
+        # written under a unique name and renamed, so other processes never read a partial file
+        temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temporary, 'wb') as file:
+                file.write(response.dump())
+            os.replace(temporary, path)
+        except OSError:
+            return
+        with self.lock:
+            self.writes += 1
+            prune = self.writes % PRUNE_INTERVAL == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Deletes expired response files and the oldest ones beyond the disk tier's size"""
+        files = []
+        for entry in os.scandir(self.directory):
+            try:
+                files.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                pass
+        files.sort(reverse=True)
+        expired = time.time() - self.ttl
+        for i, (mtime, path) in enumerate(files):
+            if i >= self.disk_size or mtime < expired:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Removes every response from memory, leaving the disk tier to expire"""
+        self.memory.clear()
+
+    def stats(self):
+        """Returns the memory tier's counters and the disk tier's hits and misses"""
+        return {'enabled': ENABLED, 'resolution': RESOLUTION, 'memory': self.memory.stats(),
+                'disk': {'directory': self.directory, 'hits': self.disk_hits, 'misses': self.disk_misses, 'writes': self.writes}}
+
+
+responses = ResponseCache(SIZE, TTL, DISK_DIR)
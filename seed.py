@@ -1,939 +1,127 @@
-from models import System, Object, AltName, db
-from app import app
-from math import radians, pi
-
-db.drop_all()
-db.create_all()
-
-System.query.delete()
-Object.query.delete()
-AltName.query.delete()
-
-# Add systems
-mercury = System(id=1, name='Mercury')
-venus = System(id=2, name='Venus')
-earth = System(id=3, name='Earth')
-mars = System(id=4, name='Mars')
-jupiter = System(id=5, name='Jupiter')
-saturn = System(id=6, name='Saturn')
-uranus = System(id=7, name='Uranus')
-neptune = System(id=8, name='Neptune')
-pluto = System(id=9, name='Pluto')
-
-db.session.add(mercury)
-db.session.add(venus)
-db.session.add(earth)
-db.session.add(mars)
-db.session.add(jupiter)
-db.session.add(saturn)
-db.session.add(uranus)
-db.session.add(neptune)
-db.session.add(pluto)
-
-db.session.commit()
-
-# Add planets and dwarf planets
-sun = Object(id=10, name='Sun', obj_type='G-type main-sequence star', mass=1.9884e+30, radius_x=6.96342e+5, radius_y=6.96342e+5, radius_z=6.96335732933e+5, rotation_period=2192831.568, axial_tilt=radians(7.25), color_map='/images/sun/sunmap.jpg', specular_map='/images/sun/sunspecmap.jpg')
-mercury = Object(id=199, name='Mercury', obj_type='Terrestrial planet', mass=3.3011e+23, radius_x=2.4397e+3, radius_y=2.4397e+3, radius_z=2.4397e+3, rotation_period=5067031.68, solstice_angle=-2.167614191960711, axial_tilt=radians(2.11), inclination=radians(7.003232997362427), long_asc=radians(48.18807057934031), color_map='/images/mercury/8k_mercury.jpg', bump_map='/images/mercury/8k_mercury_bump.jpg', bump_scale=9.86, system_id=1)
-venus = Object(id=299, name='Venus', obj_type='Terrestrial planet', mass=4.8675e+24, radius_x=6.0518e+3, radius_y=6.0518e+3, radius_z=6.0518e+3, rotation_period=20996815.68, solstice_angle=-0.5657559019491896, axial_tilt=radians(177.36), inclination=radians(3.404597285478062), long_asc=radians(76.60373240372998), color_map='/images/venus/venusmap.jpg', bump_map='/images/venus/venusbump.jpg', cloud_map='/images/venus/4k_venus_atmosphere.jpg', cloud_transparency='/images/venus/4k_venus_atmosphere_trans.jpg', bump_scale=13.7, system_id=2)
-earth = Object(id=399, name='Earth', obj_type='Terrestrial planet', mass=5.97237e+24, radius_x=6.3781e+3, radius_y=6.3781e+3, radius_z=6.35671550632e+3, rotation_period=86164.100352, solstice_angle=-1.5708282814333765, axial_tilt=radians(23.4392911), inclination=radians(0.01072007716484287), long_asc=radians(187.5105442282772), color_map='/images/earth/earthmap1k.jpg', bump_map='/images/earth/earthbump1k.jpg', specular_map='/images/earth/earthspec1k.jpg', cloud_map='/images/earth/earthcloudmap.jpg', cloud_transparency='/images/earth/earthcloudmaptrans.jpg', bump_scale=8.8480392, system_id=3)
-mars = Object(id=499, name='Mars', obj_type='Terrestrial planet', mass=6.5171e+23, radius_x=3.3962e+3, radius_y=3.3962e+3, radius_z=3.376196382e+3, rotation_period=88642.6632, solstice_angle=3.0561212705194043, axial_tilt=radians(25.19), inclination=radians(1.853291364475502), long_asc=radians(49.66536254196473), color_map='/images/mars/mars_1k_color.jpg', bump_map='/images/mars/mars_1k_topo.jpg', bump_scale=28.4394, system_id=4)
-ceres = Object(id=1, name='Ceres', obj_type='Dwarf planet', mass=9.3835e+20, radius_x=4.822e+2, radius_y=4.821e+2, radius_z=4.459e+2, rotation_period=32667.012, axial_tilt=radians(4), inclination=radians(10.56293761857503), long_asc=radians(80.49235626141704), color_map='/images/ceres/ceres_rgb_cyl.png')
-jupiter = Object(id=599, name='Jupiter', obj_type='Gas giant', mass=1.8982e+27, radius_x=7.1492e+4, radius_y=7.1492e+4, radius_z=6.685431396e+4, rotation_period=35430.048, solstice_angle=0.8214213224272117, axial_tilt=radians(3.13), inclination=radians(1.304212079581554), long_asc=radians(100.4882552293594), ring_inner_radius=1.225e5, ring_outer_radius=1.29e5, color_map='/images/jupiter/jupitermap.jpg', system_id=5)
-saturn = Object(id=699, name='Saturn', obj_type='Gas giant', mass=5.6834e+26, radius_x=6.0268e+4, radius_y=6.0268e+4, radius_z=5.436414672e+4, rotation_period=36806.4, solstice_angle=-1.683060991450823, axial_tilt=radians(26.73), inclination=radians(2.487185868139706), long_asc=radians(113.5949195036573), ring_inner_radius=6.7268e4, ring_outer_radius=1.40268e5, color_map='/images/saturn/saturnmap.jpg', ring_color='/images/saturn/saturnringcolor.jpg', ring_transparency='/images/saturn/saturnringpattern.gif', system_id=6)
-uranus = Object(id=799, name='Uranus', obj_type='Ice giant', mass=8.681e+25, radius_x=2.5559e+4, radius_y=2.5559e+4, radius_z=2.49736989e+4, rotation_period=62063.712, solstice_angle=1.3376203884131093, axial_tilt=radians(97.77), inclination=radians(0.7718902684009591), long_asc=radians(74.00492279110598), ring_inner_radius=2.684e4, ring_outer_radius=5.1149e4, color_map='/images/uranus/uranusmap.jpg', ring_color='/images/uranus/uranusringcolor.jpg', ring_transparency='/images/uranus/uranusringtrans.jpg', system_id=7)
-# neptune = Object(id=899, name='Neptune', obj_type='Ice giant', mass=1.02413e+26, radius_x=2.4764e+4, radius_y=2.4764e+4, radius_z=2.43405356e+4, rotation_period=57996, solstice_angle=2.382239896614771, axial_tilt=radians(28.32), inclination=radians(1.776885574018811), long_asc=radians(131.8005943801955), ring_inner_radius=5.32e4, ring_outer_radius=5.72e4, color_map='/images/neptune/neptunemap.jpg', system_id=8)
-neptune = Object(id=899, name='Neptune', obj_type='Ice giant', mass=1.02413e+26, radius_x=2.4764e+4, radius_y=2.4764e+4, radius_z=2.43405356e+4, rotation_period=57996, solstice_angle=-1.4683365670819482, axial_tilt=radians(28.32), inclination=radians(1.776885574018811), long_asc=radians(131.8005943801955), ring_inner_radius=5.32e4, ring_outer_radius=5.72e4, color_map='/images/neptune/neptunemap.jpg', system_id=8)
-pluto = Object(id=999, name='Pluto', obj_type='Dwarf planet', mass=1.303e+22, radius_x=1.1883e+3, radius_y=1.1883e+3, radius_z=1.1883e+3, rotation_period=551852.352, solstice_angle=2.2492884123904697, axial_tilt=radians(122.53), inclination=radians(16.99202899363719), long_asc=radians(110.1219887185963), color_map='/images/pluto/pluto_rgb_cyl_8k.png', system_id=9)
-haumea = Object(id=136108, name='Haumea', obj_type='Dwarf planet', mass=4.006e+21, radius_x=1.05e+3, radius_y=8.4e+2, radius_z=5.38e+2, rotation_period=14095.44, inclination=radians(28.20492723455196), long_asc=radians(121.9476581962163), ring_inner_radius=2.252e+3, ring_outer_radius=2.322e+3, color_map='/images/haumea/4k_haumea_fictional.jpg')
-makemake = Object(id=136472, name='Makemake', obj_type='Dwarf planet', mass=3.1e+21, radius_x=7.51e+2, radius_y=7.51e+2, radius_z=7.15e2, rotation_period=82175.76, inclination=radians(29.00198153135763), long_asc=radians(79.44295655686767), color_map='/images/makemake/4k_makemake_fictional.jpg')
-eris = Object(id=136199, name='Eris', obj_type='Dwarf planet', mass=1.66e+22, radius_x=1.163e+3, radius_y=1.163e+3, radius_z=1.163e+3, rotation_period=93312, axial_tilt=radians(78), inclination=radians(43.99281210776094), long_asc=radians(35.97654140659549), color_map='/images/eris/4k_eris_fictional.jpg')
-
-db.session.add(sun)
-db.session.add(mercury)
-db.session.add(venus)
-db.session.add(earth)
-db.session.add(mars)
-db.session.add(ceres)
-db.session.add(jupiter)
-db.session.add(saturn)
-db.session.add(uranus)
-db.session.add(neptune)
-db.session.add(pluto)
-db.session.add(haumea)
-db.session.add(eris)
-db.session.add(makemake)
-
-db.session.commit()
-
-# Add Earth's moon
-moon = Object(id=301, name='Moon', obj_type='Terrestrial satellite', mass=7.342e+22, radius_x=1.7381e+3, radius_y=1.7381e+3, radius_z=1.73601428e+3, rotation_period=2360591.5104, color_map='/images/moon/moonmap4k.jpg', bump_map='/images/moon/moonbump4k.jpg', bump_scale=18.379, system_id=3)
-
-db.session.add(moon)
-
-db.session.commit()
-
-# Add Mars moons
-phobos = Object(id=401, name='Phobos', obj_type='Martian satellite', mass=1.0659e+16, radius_x=1.35e+1, radius_y=1.1e+1, radius_z=9, rotation_period=27553.843872, axial_tilt=0, inclination=radians(27.68711526800838), long_asc=radians(81.96440771712894), bump_map='/images/phobos/phobosbump.jpg', bump_scale=1.35, system_id=4)
-deimos = Object(id=402, name='Deimos', obj_type='Martian satellite', mass=1.4762e+15, radius_x=7.5, radius_y=6.1, radius_z=5.5, rotation_period=109123.2, inclination=radians(27.6043793097424), long_asc=radians(83.25641695162784), bump_map='/images/deimos/deimosbump.jpg', bump_scale=0.75, system_id=4)
-
-db.session.add(phobos)
-db.session.add(deimos)
-
-db.session.commit()
-
-# Add Jupiter moons
-io = Object(id=501, name='Io', obj_type='Jovian satellite', sat_type='Galilean satellite', mass=8.931938e+22, radius_x=1.83e+3, radius_y=1.8187e+3, radius_z=1.8153e+3, rotation_period=152853.5047104, inclination=radians(2.202038560423455), long_asc=radians(336.8619078233351), color_map='/images/io/io_rgb_cyl.jpg', system_id=5)
-europa = Object(id=502, name='Europa', obj_type='Jovian satellite', sat_type='Galilean satellite', mass=4.799844e+22, radius_x=1.5608e+3, radius_y=1.5608e+3, radius_z=1.5608e+3, rotation_period=306822.0384, axial_tilt=radians(0.1), inclination=radians(1.778118601924317), long_asc=radians(333.4487449631573), color_map='/images/europa/europa2_out.jpg', system_id=5)
-ganymede = Object(id=503, name='Ganymede', obj_type='Jovian satellite', sat_type='Galilean satellite', mass=1.4819e+23, radius_x=2.6341e+3, radius_y=2.6341e+3, radius_z=2.6341e+3, color_map='/images/ganymede/ganymedemap2k.jpg', bump_map='/images/ganymede/ganymedebump2k.jpg', bump_scale=20, system_id=5)
-callisto = Object(id=504, name='Callisto', obj_type='Jovian satellite', sat_type='Galilean satellite', mass=1.075938e+23, radius_x=2.4103e+3, radius_y=2.4103e+3, radius_z=2.4103e+3, rotation_period=1441931.18976, inclination=radians(2.015203376506772), long_asc=radians(337.8756111378342), system_id=5)
-amalthea = Object(id=505, name='Amalthea', obj_type='Jovian satellite', sat_type='Inner group satellite', mass=2.08e+18, radius_x=1.25e+2, radius_y=7.3e+1, radius_z=6.4e+1, rotation_period=43042.702752, inclination=radians(2.590818803895528), long_asc=radians(338.7201345587398), system_id=5)
-himalia = Object(id=506, name='Himalia', obj_type='Jovian satellite', sat_type='Himalia group satellite', mass=4.2e+18, radius_x=1.028e+2, radius_y=1.028e+2, radius_z=7.07e+1, rotation_period=28014.84, inclination=radians(30.45195981630237), long_asc=radians(63.8769552953523), system_id=5)
-elara = Object(id=507, name='Elara', obj_type='Jovian satellite', sat_type='Himalia group satellite', mass=8.7e+17, radius_x=3.995e+1, radius_y=3.995e+1, radius_z=3.995e+1, rotation_period=43200, inclination=radians(28.96226563518162), long_asc=radians(111.8768835605571), system_id=5)
-pasiphae = Object(id=508, name='Pasiphae', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=3e+17, radius_x=2.89e+1, radius_y=2.89e+1, radius_z=2.89e+1, inclination=radians(140.4685710871078), long_asc=radians(318.7726438750796), system_id=5)
-sinope = Object(id=509, name='Sinope', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=7.5e+16, radius_x=1.75e+1, radius_y=1.75e+1, radius_z=1.75e+1, rotation_period=47376, inclination=radians(152.3526776696048), long_asc=radians(308.3171612173212), system_id=5)
-lysithea = Object(id=510, name='Lysithea', obj_type='Jovian satellite', sat_type='Himalia group satellite', mass=6.3e+16, radius_x=2.11e+1, radius_y=2.11e+1, radius_z=2.11e+1, rotation_period=46008, inclination=radians(27.63635573900796), long_asc=radians(9.099725948658884), system_id=5)
-carme = Object(id=511, name='Carme', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.3e+17, radius_x=2.335e+1, radius_y=2.335e+1, radius_z=2.335e+1, rotation_period=37440, inclination=radians(164.8306344981734), long_asc=radians(121.3262041516631), system_id=5)
-ananke = Object(id=512, name='Ananke', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=3e+17, radius_x=1.455e+1, radius_y=1.455e+1, radius_z=1.455e+1, rotation_period=29880, inclination=radians(150.9582319024649), long_asc=radians(14.29277825811966), system_id=5)
-leda = Object(id=513, name='Leda', obj_type='Jovian satellite', sat_type='Himalia group satellite', mass=1.1e+16, radius_x=1.075e+1, radius_y=1.075e+1, radius_z=1.075e+1, inclination=radians(27.56883482658192), long_asc=radians(216.8720417619267), system_id=5)
-thebe = Object(id=514, name='Thebe', obj_type='Jovian satellite', sat_type='Inner group satellite', mass=4.3e+17, radius_x=5.8e+1, radius_y=4.9e+1, radius_z=4.2e+1, rotation_period= 58279.9104, inclination=radians(1.461295065940621), long_asc=radians(313.5765881281393), system_id=5)
-adrastea = Object(id=515, name='Adrastea', obj_type='Jovian satellite', sat_type='Inner group satellite', mass=2e+17, radius_x=1e+1, radius_y=8, radius_z=7, rotation_period=25769.664, inclination=radians(2.21949500670213), long_asc=radians(337.662361298094), system_id=5)
-metis = Object(id=516, name='Metis', obj_type='Jovian satellite', sat_type='Inner group satellite', mass=3.6e+16, radius_x=3e+1, radius_y=2e+1, radius_z=1.7e+1, rotation_period=25468.992, inclination=radians(2.216222596466354), long_asc=radians(337.7564710862183), system_id=5)
-callirrhoe = Object(id=517, name='Callirrhoe', designation='1999J1', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=8.7e+14, radius_x=4.8, radius_y=4.8, radius_z=4.8, inclination=radians(140.8206317320401), long_asc=radians(278.0223708777144), system_id=5)
-themisto = Object(id=518, name='Themisto', designation='1975J1', obj_type='Jovian satellite', sat_type='Themisto group satellite', mass=6.89e+14, radius_x=4.5, radius_y=4.5, radius_z=4.5, inclination=radians(45.86338131852993), long_asc=radians(202.5807010747776), system_id=5)
-megaclite = Object(id=519, name='Megaclite', designation='2000J8', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=2.1e+14, radius_x=3, radius_y=3, radius_z=3, inclination=radians(150.1944539106737), long_asc=radians(299.6705282738345), system_id=5)
-taygete = Object(id=520, name='Taygete', designation='2000J9', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.6e+14, radius_x=2.5, radius_y=2.5, radius_z=2.5, inclination=radians(162.7579230525465), long_asc=radians(301.5500007637778), system_id=5)
-chaldene = Object(id=521, name='Chaldene', designation='2000J10', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=9e+13, radius_x=1.9, radius_y=1.9, radius_z=1.9, inclination=radians(165.265656851007), long_asc=radians(135.9452328726407), system_id=5)
-harpalyke = Object(id=522, name='Harpalyke', designation='2000J5', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=9e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(149.8314008170701), long_asc=radians(35.48244412553125), system_id=5)
-kalyke = Object(id=523, name='Kalyke', designation='2000J2', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=4e+14, radius_x=3.45, radius_y=3.45, radius_z=3.45, inclination=radians(166.4329631299247), long_asc=radians(37.7486394056039), system_id=5)
-iocaste = Object(id=524, name='Iocaste', designation='2000J3', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.9483e+14, radius_x=2.5, radius_y=2.5, radius_z=2.5, inclination=radians(148.7646210236758), long_asc=radians(270.4939895796292), system_id=5)
-erinome = Object(id=525, name='Erinome', designation='2000J4', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=4.5e+13, radius_x=1.6, radius_y=1.6, radius_z=1.6, inclination=radians(161.3325518133928), long_asc=radians(315.0631987172114), system_id=5)
-isonoe = Object(id=526, name='Isonoe', designation='2000J6', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=9e+13, radius_x=1.9, radius_y=1.9, radius_z=1.9, inclination=radians(165.4590011269005), long_asc=radians(141.4771272838159), system_id=5)
-praxidike = Object(id=527, name='Praxidike', designation='2000J7', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=4.3e+14, radius_x=3.5, radius_y=3.5, radius_z=3.5, inclination=radians(144.269805961704), long_asc=radians(281.3454827294052), system_id=5)
-autonoe = Object(id=528, name='Autonoe', designation='2001J1', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=9e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(151.9214876327727), long_asc=radians(268.7875180925526), system_id=5)
-thyone = Object(id=529, name='Thyone', designation='2001J2', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=9e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(146.6529386788323), long_asc=radians(265.5298851974447), system_id=5)
-hermippe = Object(id=530, name='Hermippe', designation='2001J3', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=9e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(149.029652893641), long_asc=radians(335.4508913756193), system_id=5)
-aitne = Object(id=531, name='Aitne', designation='2001J11', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=4.5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(165.921177720331), long_asc=radians(359.6077731499955), system_id=5)
-eurydome = Object(id=532, name='Eurydome', designation='2001J4', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=4.5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(145.8576856349043), long_asc=radians(298.5105859441268), system_id=5)
-euanthe = Object(id=533, name='Euanthe', designation='2001J7', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=4.5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(146.6529386788323), long_asc=radians(265.5298851974447), system_id=5)
-euporie = Object(id=534, name='Euporie', designation='2001J10', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(147.7879151021417), long_asc=radians(64.27076053136555), system_id=5)
-orthosie = Object(id=535, name='Orthosie', designation='2001J9', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(144.2362113447092), long_asc=radians(212.2390715960511), system_id=5)
-sponde = Object(id=536, name='Sponde', designation='2001J5', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(152.993295968899), long_asc=radians(117.6267057710469), system_id=5)
-kale = Object(id=537, name='Kale', designation='2001J8', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(166.7740264691607), long_asc=radians(57.69005565307003), system_id=5)
-pasithee = Object(id=538, name='Pasithee', designation='2001J6', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(163.3267510815519), long_asc=radians(324.0376379879319), system_id=5)
-hegemone = Object(id=539, name='Hegemone', designation='2003J8', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=4.5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(147.6071503608913), long_asc=radians(316.3018686736555), system_id=5)
-mneme = Object(id=540, name='Mneme', designation='2003J21', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(147.4626212938789), long_asc=radians(3.018195689244483), system_id=5)
-aoede = Object(id=541, name='Aoede', designation='2003J7', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=9e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(157.5415906896867), long_asc=radians(162.8225311319742), system_id=5)
-thelxinoe = Object(id=542, name='Thelxinoe', designation='2003J22', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(150.8985096157172), long_asc=radians(175.5394931469741), system_id=5)
-arche = Object(id=543, name='Arche', designation='2002J1', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=4.5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(162.6753567340982), long_asc=radians(336.3762596433556), system_id=5)
-kallichore = Object(id=544, name='Kallichore', designation='2003J11', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(165.6327485142618), long_asc=radians(24.61856797433168), system_id=5)
-helike = Object(id=545, name='Helike', designation='2003J6', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=9e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(156.1812652193946), long_asc=radians(96.85758150062311), system_id=5)
-carpo = Object(id=546, name='Carpo', designation='2003J20', obj_type='Jovian satellite', sat_type='Carpo group satellite', mass=4.5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(58.84629526450489), long_asc=radians(52.03138709400083), system_id=5)
-eukelade = Object(id=547, name='Eukelade', designation='2003J1', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=9e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(165.1295171398916), long_asc=radians(200.9393197082872), system_id=5)
-cyllene = Object(id=548, name='Cyllene', designation='2003J13', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(143.7628827748087), long_asc=radians(253.4193756015499), system_id=5)
-kore = Object(id=549, name='Kore', designation='2003J14', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(137.9656094529033), long_asc=radians(326.2127051813102), system_id=5)
-herse = Object(id=550, name='Herse', designation='2003J17', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(160.9027778980883), long_asc=radians(301.0608242339231), system_id=5)
-j551 = Object(id=551, designation='2010J1', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(162.2730531505603), long_asc=radians(286.1877940016311), system_id=5)
-j552 = Object(id=552, designation='2010J2', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+12, radius_x=5e-1, radius_y=5e-1, radius_z=5e-1, inclination=radians(146.0110766725107), long_asc=radians(358.0037264438795), system_id=5)
-dia = Object(id=553, name='Dia', designation='2000J11', obj_type='Jovian satellite', sat_type='Himalia group satellite', mass=9e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(27.66354308813494), long_asc=radians(292.9825272411697), system_id=5)
-j554 = Object(id=554, designation='2016J1', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+12, radius_x=5e-1, radius_y=5e-1, radius_z=5e-1, inclination=radians(145.9207476033445), long_asc=radians(247.0310078591745), system_id=5)
-j555 = Object(id=555, designation='2003J18', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(144.8219336101064), long_asc=radians(166.9658839200055), system_id=5)
-j556 = Object(id=556, designation='2011J2', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+12, radius_x=5e-1, radius_y=5e-1, radius_z=5e-1, inclination=radians(156.8793319496299), long_asc=radians(24.99948313222629), system_id=5)
-eirene = Object(id=557, name='Eirene', designation='2003J5', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=9e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(165.8514202355866), long_asc=radians(181.3408231704818), system_id=5)
-philophrosyne = Object(id=558, name='Philophrosyne', designation='2003J15', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(145.6696803802699), long_asc=radians(234.0660900058406), system_id=5)
-j559 = Object(id=559, designation='2017J1', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(145.8606737892223), long_asc=radians(251.3950217402238), system_id=5)
-eupheme = Object(id=560, name='Eupheme', designation='2003J3', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(149.6336117460497), long_asc=radians(227.5350731563619), system_id=5)
-j561 = Object(id=561, designation='2003J19', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(164.9366888631194), long_asc=radians(21.37914021579604), system_id=5)
-valetudo = Object(id=562, name='Valetudo', designation='2016J2', obj_type='Jovian satellite', sat_type='Valetudo group satellite', mass=1.5e+12, radius_x=5e-1, radius_y=5e-1, radius_z=5e-1, inclination=radians(32.46178507913805), long_asc=radians(287.8122837129974), system_id=5)
-j563 = Object(id=563, designation='2017J2', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(164.3869358905398), long_asc=radians(0.6672356408388377), system_id=5)
-j564 = Object(id=564, designation='2017J3', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(149.0889871776131), long_asc=radians(28.02693710627719), system_id=5)
-pandia = Object(id=565, name='Pandia', designation='2017J4', obj_type='Jovian satellite', sat_type='Himalia group satellite', mass=4.5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(28.41258215108068), long_asc=radians(249.7479345159647), system_id=5)
-j566 = Object(id=566, designation='2017J5', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(167.0095643794104), long_asc=radians(42.66545093004198), system_id=5)
-j567 = Object(id=567, designation='2017J6', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(143.3534589080306), long_asc=radians(313.6113165007077), system_id=5)
-j568 = Object(id=568, designation='2017J7', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(148.7639989930466), long_asc=radians(265.1952547620845), system_id=5)
-j569 = Object(id=569, designation='2017J8', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+12, radius_x=5e-1, radius_y=5e-1, radius_z=5e-1, inclination=radians(165.5256441507154), long_asc=radians(97.99157874261304), system_id=5)
-j570 = Object(id=570, designation='2017J9', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=4.5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(156.5666574644904), long_asc=radians(244.9423268675112), system_id=5)
-ersa = Object(id=571, name='Ersa', designation='2018J1', obj_type='Jovian satellite', sat_type='Himalia group satellite', mass=4.5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(30.0388384494988), long_asc=radians(113.2367645419284), system_id=5)
-j572 = Object(id=572, designation='2011J1', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(164.1601295339567), long_asc=radians(254.3967432037037), system_id=5)
-j55501 = Object(id=55501, designation='2003J2', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(149.4552908915925), long_asc=radians(343.0042751754921), system_id=5)
-j55502 = Object(id=55502, designation='2003J4', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(143.2663189048671), long_asc=radians(172.8696581101384), system_id=5)
-j55503 = Object(id=55503, designation='2003J9', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+12, radius_x=5e-1, radius_y=5e-1, radius_z=5e-1, inclination=radians(167.1458454565394), long_asc=radians(46.19636161515386), system_id=5)
-j55504 = Object(id=55504, designation='2003J10', obj_type='Jovian satellite', sat_type='Carme group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(159.8439404621078), long_asc=radians(155.7907712044102), system_id=5)
-j55505 = Object(id=55505, designation='2003J12', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+12, radius_x=5e-1, radius_y=5e-1, radius_z=5e-1, inclination=radians(145.2067486086939), long_asc=radians(60.81100772626042), system_id=5)
-j55506 = Object(id=55506, designation='2003J16', obj_type='Jovian satellite', sat_type='Ananke group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(148.9945721482876), long_asc=radians(5.587067267711493), system_id=5)
-j55507 = Object(id=55507, designation='2003J23', obj_type='Jovian satellite', sat_type='Pasiphae group satellite', mass=1.5e+13, radius_x=1, radius_y=1, radius_z=1, inclination=radians(150.2361030854122), long_asc=radians(30.71066870893187), system_id=5)
-
-db.session.add(io)
-db.session.add(europa)
-db.session.add(ganymede)
-db.session.add(callisto)
-db.session.add(amalthea)
-db.session.add(himalia)
-db.session.add(elara)
-db.session.add(pasiphae)
-db.session.add(sinope)
-db.session.add(lysithea)
-db.session.add(carme)
-db.session.add(ananke)
-db.session.add(leda)
-db.session.add(thebe)
-db.session.add(adrastea)
-db.session.add(metis)
-db.session.add(callirrhoe)
-db.session.add(themisto)
-db.session.add(megaclite)
-db.session.add(taygete)
-db.session.add(chaldene)
-db.session.add(harpalyke)
-db.session.add(kalyke)
-db.session.add(iocaste)
-db.session.add(erinome)
-db.session.add(isonoe)
-db.session.add(praxidike)
-db.session.add(autonoe)
-db.session.add(thyone)
-db.session.add(hermippe)
-db.session.add(aitne)
-db.session.add(eurydome)
-db.session.add(euanthe)
-db.session.add(euporie)
-db.session.add(orthosie)
-db.session.add(sponde)
-db.session.add(kale)
-db.session.add(pasithee)
-db.session.add(hegemone)
-db.session.add(mneme)
-db.session.add(aoede)
-db.session.add(thelxinoe)
-db.session.add(arche)
-db.session.add(kallichore)
-db.session.add(helike)
-db.session.add(carpo)
-db.session.add(eukelade)
-db.session.add(cyllene)
-db.session.add(kore)
-db.session.add(herse)
-db.session.add(j551)
-db.session.add(j552)
-db.session.add(dia)
-db.session.add(j554)
-db.session.add(j555)
-db.session.add(j556)
-db.session.add(eirene)
-db.session.add(philophrosyne)
-db.session.add(j559)
-db.session.add(eupheme)
-db.session.add(j561)
-db.session.add(valetudo)
-db.session.add(j563)
-db.session.add(j564)
-db.session.add(pandia)
-db.session.add(j566)
-db.session.add(j567)
-db.session.add(j568)
-db.session.add(j569)
-db.session.add(j570)
-db.session.add(ersa)
-db.session.add(j572)
-db.session.add(j55501)
-db.session.add(j55502)
-db.session.add(j55503)
-db.session.add(j55504)
-db.session.add(j55505)
-db.session.add(j55506)
-db.session.add(j55507)
-
-db.session.commit()
-
-# Add Saturn moons
-mimas = Object(id=601, name='Mimas', obj_type='Saturnian satellite', sat_type='Major icy satellite', mass=3.7493e+19, radius_x=2.078e+2, radius_y=1.967e+2, radius_z=1.906e+2, color_map='/images/mimas/mimas_rgb_cyl_www.jpg', rotation_period=81388.8, inclination=radians(29.57785388169319), long_asc=radians(170.2661368716824), system_id=6)
-enceladus = Object(id=602, name='Enceladus', obj_type='Saturnian satellite', sat_type='Major icy satellite', mass=1.08022e+20, radius_x=2.566e+2, radius_y=2.514e+2, radius_z=2.483e+2, color_map='/images/enceladus/enceladus_rgb_cyl_www.jpg', rotation_period=118386.8352, inclination=radians(28.03926909714446), long_asc=radians(169.5186041483658), system_id=6)
-tethys = Object(id=603, name='Tethys', obj_type='Saturnian satellite', sat_type='Major icy satellite', mass=6.17449e+20, radius_x=5.384e+2, radius_y=5.287e+2, radius_z=5.263e+2, color_map='/images/tethys/tethys_rgb_cyl_www.jpg', rotation_period=163106.0928, inclination=radians(27.05477014522443), long_asc=radians(168.5621733598212), system_id=6)
-dione = Object(id=604, name='Dione', obj_type='Saturnian satellite', sat_type='Major icy satellite', mass=1.095452e+21, radius_x=5.644e+2, radius_y=5.613e+2, radius_z=5.596e+2, color_map='/images/dione/dione_rgb_cyl_www.jpg', rotation_period=236469.456, inclination=radians(28.06025916984478), long_asc=radians(169.469213252759), system_id=6)
-rhea = Object(id=605, name='Rhea', obj_type='Saturnian satellite', sat_type='Major icy satellite', mass=2.306518e+21, radius_x=7.662e+2, radius_y=7.628e+2, radius_z=7.622e+2, color_map='/images/rhea/rhea_rgb_cyl_www.jpg', rotation_period=390373.5168, inclination=radians(27.73492967787025), long_asc=radians(169.1581351095858), system_id=6)
-titan = Object(id=606, name='Titan', obj_type='Saturnian satellite', mass=1.3452e+23, radius_x=2.57473e+3, radius_y=2.57473e+3, radius_z=2.57473e+3, color_map='/images/titan/titan_texture_map_8k.jpg', rotation_period=1377648, inclination=radians(27.72877078654767), long_asc=radians(169.1463184891261), system_id=6)
-hyperion = Object(id=607, name='Hyperion', obj_type='Saturnian satellite', sat_type='Major icy satellite', mass=5.6199e+18, radius_x=1.801e+2, radius_y=1.33e+2, radius_z=1.027e+2, rotation_period=1123200, inclination=radians(27.08653577990734), long_asc=radians(168.6944332633099), system_id=6)
-iapetus = Object(id=608, name='Iapetus', obj_type='Saturnian satellite', sat_type='Major icy satellite', mass=1.805635e+21, radius_x=7.46e+2, radius_y=7.46e+2, radius_z=7.12e+2, color_map='/images/iapetus/iapetus_rgb_cyl_www.jpg', rotation_period=6853377.6, inclination=radians(17.18029401338858), long_asc=radians(139.3543300636956), system_id=6)
-phoebe = Object(id=609, name='Phoebe', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=8.292e+18, radius_x=1.094e+2, radius_y=1.085e+2, radius_z=1.018e+2, rotation_period=33384.6, axial_tilt=radians(152.14), inclination=radians(172.9786309895883), long_asc=radians(266.5822102149536), system_id=6)
-janus = Object(id=610, name='Janus', obj_type='Saturnian satellite', sat_type='Epimetheus co-orbital', mass=1.8975e+18, radius_x=1.015e+2, radius_y=9.25e+1, radius_z=7.63e+1, rotation_period=60018.6535488, inclination=radians(28.12898633774667), long_asc=radians(169.8364931858291), system_id=6)
-epimetheus = Object(id=611, name='Epimetheus', obj_type='Saturnian satellite', sat_type='Janus co-orbital', mass=5.266e+17, radius_x=6.49e+1, radius_y=5.7e+1, radius_z=5.31e+1, rotation_period=59990.4158688, inclination=radians(27.98119214620142), long_asc=radians(170.2628734689248), system_id=6)
-helene = Object(id=612, name='Helene', obj_type='Saturnian satellite', sat_type='Dione trojan (leading)', mass=2.45e+16, radius_x=2.17e+1, radius_y=1.91e+1, radius_z=1.3e+1, rotation_period=236469.456, inclination=radians(27.83740453473239), long_asc=radians(169.6029301299592), system_id=6)
-telesto = Object(id=613, name='Telesto', obj_type='Saturnian satellite', sat_type='Tethys trojan (leading)', mass=9.41e+15, radius_x=1.63e+1, radius_y=1.18e+1, radius_z=1e+1, rotation_period=163106.0928, inclination=radians(26.87974157401090), long_asc=radians(169.8434102321356), system_id=6)
-calypso = Object(id=614, name='Calypso', obj_type='Saturnian satellite', sat_type='Tethys trojan (trailing)', mass=6.3e+15, radius_x=1.51e+1, radius_y=1.25e+1, radius_z=7, rotation_period=163106.0928, inclination=radians(27.77651583075884), long_asc=radians(166.3736888109915), system_id=6)
-atlas = Object(id=615, name='Atlas', obj_type='Saturnian satellite', sat_type='Outer A Ring shepherd', mass=6.6e+15, radius_x=2.04e+1, radius_y=1.77e+1, radius_z=9.4, rotation_period=51986.42970912, inclination=radians(28.05336600855825), long_asc=radians(169.5216527482517), system_id=6)
-prometheus = Object(id=616, name='Prometheus', obj_type='Saturnian satellite', sat_type='Inner F Ring shepherd', mass=1.595e+17, radius_x=6.78e+1, radius_y=3.97e+1, radius_z=2.97e+1, rotation_period=52962.3392832, inclination=radians(28.04517773037001), long_asc=radians(169.5358556434842), system_id=6)
-pandora = Object(id=617, name='Pandora', obj_type='Saturnian satellite', sat_type='Outer F Ring shepherd', mass=1.371e+17, radius_x=5.2e+1, radius_y=4.05e+1, radius_z=3.2e+1, rotation_period=54302.7640032, inclination=radians(28.00311105495848), long_asc=radians(169.4960962174603), system_id=6)
-pan = Object(id=618, name='Pan', obj_type='Saturnian satellite', sat_type='Encke Division satellite', mass=4.95e+15, radius_x=1.72e+1, radius_y=1.57e+1, radius_z=1.04e+1, rotation_period=49684.3812, inclination=radians(28.05115075539186), long_asc=radians(169.5256301325251), system_id=6)
-ymir = Object(id=619, name='Ymir', designation='2000S1', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=3.97e+15, radius_x=9, radius_y=9, radius_z=9, rotation_period=42919.92, inclination=radians(172.8778021068313), long_asc=radians(223.8572206167137), system_id=6)
-paaliaq = Object(id=620, name='Paaliaq', designation='2000S2', obj_type='Saturnian satellite', sat_type='Inuit group satellite', mass=7.25e+15, radius_x=1.25e+1, radius_y=1.25e+1, radius_z=1.25e+1, rotation_period=67644, inclination=radians(46.69275546372847), long_asc=radians(345.4425633885828), system_id=6)
-tarvos = Object(id=621, name='Tarvos', designation='2000S4', obj_type='Saturnian satellite', sat_type='Gallic group satellite', mass=2.3e+15, radius_x=7.5, radius_y=7.5, radius_z=7.5, rotation_period=38487.6, inclination=radians(35.79977823770525), long_asc=radians(77.14507154274148), system_id=6)
-ijiraq = Object(id=622, name='Ijiraq', designation='2000S6', obj_type='Saturnian satellite', sat_type='Inuit group satellite', mass=1.18e+15, radius_x=6.5, radius_y=6.5, radius_z=6.5, rotation_period=46908, inclination=radians(50.00076051997522), long_asc=radians(148.7094683592991), system_id=6)
-suttungr = Object(id=623, name='Suttungr', designation='2000S12', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=2.3e+14, radius_x=3.5, radius_y=3.5, radius_z=3.5, rotation_period=27612, inclination=radians(174.2322848175319), long_asc=radians(260.1012358738237), system_id=6)
-kiviuq = Object(id=624, name='Kiviuq', designation='2000S5', obj_type='Saturnian satellite', sat_type='Inuit group satellite', mass=2.79e+15, radius_x=8.5, radius_y=8.5, radius_z=8.5, rotation_period=79092, inclination=radians(49.59968350975178), long_asc=radians(349.1361779236632), system_id=6)
-mundilfari = Object(id=625, name='Mundilfari', designation='2000S9', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=2.3e+14, radius_x=3.5, radius_y=3.5, radius_z=3.5, rotation_period=24264, inclination=radians(168.8687184594416), long_asc=radians(88.15951891588247), system_id=6)
-albiorix = Object(id=626, name='Albiorix', designation='2000S11', obj_type='Saturnian satellite', sat_type='Gallic group satellite', mass=2.23e+16, radius_x=1.43e+1, radius_y=1.43e+1, radius_z=1.43e+1, rotation_period=47988, inclination=radians(34.6354730879117), long_asc=radians(98.42179012229973), system_id=6)
-skathi = Object(id=627, name='Skathi', designation='2000S8', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=3.5e+14, radius_x=4, radius_y=4, radius_z=4, rotation_period=39960, inclination=radians(147.809311085199), long_asc=radians(288.0923787355651), system_id=6)
-erriapus = Object(id=628, name='Erriapus', designation='2000S10', obj_type='Saturnian satellite', sat_type='Gallic group satellite', mass=6.8e+14, radius_x=5, radius_y=5, radius_z=5, rotation_period=101340, inclination=radians(37.01594488223461), long_asc=radians(130.573644757327), system_id=6)
-siarnaq = Object(id=629, name='Siarnaq', designation='2000S3', obj_type='Saturnian satellite', sat_type='Inuit group satellite', mass=4.35e+16, radius_x=1.965e+1, radius_y=1.965e+1, radius_z=1.965e+1, rotation_period=36676.26, inclination=radians(44.93598912459253), long_asc=radians(48.96403527331287), system_id=6)
-thrymr = Object(id=630, name='Thrymr', designation='2000S7', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=2.3e+14, radius_x=3.5, radius_y=3.5, radius_z=3.5, rotation_period=139644, inclination=radians(174.4486621102085), long_asc=radians(261.7459982680558), system_id=6)
-narvi = Object(id=631, name='Narvi', designation='2003S1', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=2.3e+14, radius_x=3.5, radius_y=3.5, radius_z=3.5, rotation_period=36756, inclination=radians(139.7478121579994), long_asc=radians(187.6036032405677), system_id=6)
-methone = Object(id=632, name='Methone', designation='2004S1', obj_type='Saturnian satellite', sat_type='Alkyonides group satellite', mass=2e+13, radius_x=1.94, radius_y=1.29, radius_z=1.21, rotation_period=87227.19144, inclination=radians(28.05442635370205), long_asc=radians(169.5100960901631), system_id=6)
-pallene = Object(id=633, name='Pallene', designation='2004S2', obj_type='Saturnian satellite', sat_type='Alkyonides group satellite', mass=5e+13, radius_x=2.88, radius_y=2.08, radius_z=1.84, rotation_period=99683.6396256, inclination=radians(27.99981208257061), long_asc=radians(169.8961812882705), system_id=6)
-polydeuces = Object(id=634, name='Polydeuces', designation='2004S5', obj_type='Saturnian satellite', sat_type='Dione trojan (trailing)', mass=3e+13, radius_x=1.5, radius_y=1.25, radius_z=1, rotation_period=236469.456, inclination=radians(28.09485753576173), long_asc=radians(169.8797254358712), system_id=6)
-daphnis = Object(id=635, name='Daphnis', designation='2005S1', obj_type='Saturnian satellite', sat_type='Keeler Gap satellite', mass=7.7e+13, radius_x=4.3, radius_y=4.1, radius_z=3.2, rotation_period=51328.494, inclination=radians(28.05023104484873), long_asc=radians(169.5208978346024), system_id=6)
-aegir = Object(id=636, name='Aegir', designation='2004S10', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, inclination=radians(168.0689184899179), long_asc=radians(200.070293854932), system_id=6)
-bebhionn = Object(id=637, name='Bebhionn', designation='2004S11', obj_type='Saturnian satellite', sat_type='Gallic group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, rotation_period=58788, inclination=radians(43.74646765151462), long_asc=radians(190.3679282771992), system_id=6)
-bergelmir = Object(id=638, name='Bergelmir', designation='2004S15', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=2.5, radius_y=2.5, radius_z=2.5, rotation_period=29268, inclination=radians(158.1788649228882), long_asc=radians(220.6731488693152), system_id=6)
-bestla = Object(id=639, name='Bestla', designation='2004S18', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=2.3e+14, radius_x=3.5, radius_y=3.5, radius_z=3.5, rotation_period=52645.68, inclination=radians(146.0931588448248), long_asc=radians(298.459169750326), system_id=6)
-farbauti = Object(id=640, name='Farbauti', designation='2004S9', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=9e+13, radius_x=2.5, radius_y=2.5, radius_z=2.5, inclination=radians(157.7917833285386), long_asc=radians(146.3391748973581), system_id=6)
-fenrir = Object(id=641, name='Fenrir', designation='2004S16', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(162.9736508230397), long_asc=radians(247.8874564534088), system_id=6)
-fornjot = Object(id=642, name='Fornjot', designation='2004S8', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, rotation_period=25200, inclination=radians(166.9817449303403), long_asc=radians(277.639675187457), system_id=6)
-hati = Object(id=643, name='Hati', designation='2004S14', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=2.5, radius_y=2.5, radius_z=2.5, rotation_period=19620, inclination=radians(162.8971589893063), long_asc=radians(324.0442565306987), system_id=6)
-hyrrokkin = Object(id=644, name='Hyrrokkin', designation='2004S19', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=3.5e+14, radius_x=4, radius_y=4, radius_z=4, rotation_period=45936, inclination=radians(153.4374337484976), long_asc=radians(58.34763484763559), system_id=6)
-kari = Object(id=645, name='Kari', designation='2006S2', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=2.3e+14, radius_x=3, radius_y=3, radius_z=3, rotation_period=27720, inclination=radians(145.0871036938287), long_asc=radians(292.9469476548898), system_id=6)
-loge = Object(id=646, name='Loge', designation='2006S5', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=2.5, radius_y=2.5, radius_z=2.5, rotation_period=24840, inclination=radians(166.9927229208883), long_asc=radians(345.0084125207305), system_id=6)
-skoll = Object(id=647, name='Skoll', designation='2006S8', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=2.5, radius_y=2.5, radius_z=2.5, rotation_period=26136, inclination=radians(154.0670551137778), long_asc=radians(298.2943325138856), system_id=6)
-surtur = Object(id=648, name='Surtur', designation='2006S7', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, inclination=radians(165.4410091244593), long_asc=radians(266.5876955664045), system_id=6)
-anthe = Object(id=649, name='Anthe', designation='2007S4', obj_type='Saturnian satellite', sat_type='Alkyonides group satellite', mass=1.5e+12, radius_x=9e-1, radius_y=9e-1, radius_z=9e-1, rotation_period=90796.896, inclination=radians(28.03287286692691), long_asc=radians(169.5417163745414), system_id=6)
-jarnsaxa = Object(id=650, name='Jarnsaxa', designation='2006S6', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, inclination=radians(164.1420771698105), long_asc=radians(24.17939706586715), system_id=6)
-greip = Object(id=651, name='Greip', designation='2006S4', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=2.5, radius_y=2.5, radius_z=2.5, rotation_period=45900, inclination=radians(173.0437433657323), long_asc=radians(343.7461498779598), system_id=6)
-tarqeq = Object(id=652, name='Tarqeq', designation='2007S1', obj_type='Saturnian satellite', sat_type='Inuit group satellite', mass=2.3e+14, radius_x=3, radius_y=3, radius_z=3, rotation_period=274068, inclination=radians(48.61923098311991), long_asc=radians(88.71385275970326), system_id=6)
-aegaeon = Object(id=653, name='Aegaeon', designation='2008S1', obj_type='Saturnian satellite', sat_type='G Ring moonlet', mass=1e+11, radius_x=7e-1, radius_y=2.5e-1, radius_z=2e-1, inclination=radians(28.05243470904053), long_asc=radians(169.5251893730166), system_id=6)
-s65035 = Object(id=65035, designation='2004S7', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, inclination=radians(165.8532313655328), long_asc=radians(342.3173239068016), system_id=6)
-s65040 = Object(id=65040, designation='2004S12', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=9e+13, radius_x=2.5, radius_y=2.5, radius_z=2.5, inclination=radians(163.9117323964494), long_asc=radians(315.5418479565936), system_id=6)
-s65041 = Object(id=65041, designation='2004S13', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, inclination=radians(167.7529996779712), long_asc=radians(228.7434921455518), system_id=6)
-s65045 = Object(id=65045, designation='2004S17', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(168.0799596177722), long_asc=radians(25.42365655581625), system_id=6)
-s65048 = Object(id=65048, designation='2006S1', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=2.5, radius_y=2.5, radius_z=2.5, inclination=radians(155.4382497390137), long_asc=radians(342.2218784001755), system_id=6)
-s65050 = Object(id=65050, designation='2006S3', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, inclination=radians(153.9692032336305), long_asc=radians(224.2560904976748), system_id=6)
-s65055 = Object(id=65055, designation='2007S2', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, inclination=radians(176.4259520111934), long_asc=radians(117.0656451959869), system_id=6)
-s65056 = Object(id=65056, designation='2007S3', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=9e+13, radius_x=2.5, radius_y=2.5, radius_z=2.5, inclination=radians(176.7507428406876), long_asc=radians(105.0491965290628), system_id=6)
-s65065 = Object(id=65065, designation='2004S27', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=3, radius_y=3, radius_z=3, inclination=radians(166.7515836160191), long_asc=radians(93.4651774083664), system_id=6)
-s65066 = Object(id=65066, designation='2004S29', obj_type='Saturnian satellite', sat_type='Inuit group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(43.33685715832576), long_asc=radians(147.2322354242916), system_id=6)
-s65067 = Object(id=65067, designation='2004S31', obj_type='Saturnian satellite', sat_type='Inuit group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(47.55160181674772), long_asc=radians(76.38982814648871), system_id=6)
-s65068 = Object(id=65068, designation='2004S26', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(171.7110582207335), long_asc=radians(341.782182773409), system_id=6)
-s65069 = Object(id=65069, designation='2004S35', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=1.5e+14, radius_x=2.5, radius_y=2.5, radius_z=2.5, inclination=radians(176.5731810413037), long_asc=radians(327.9315687221836), system_id=6)
-s65070 = Object(id=65070, designation='2004S24', obj_type='Saturnian satellite', sat_type='Gallic group satellite', mass=3e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(36.85807428596475), long_asc=radians(343.956477996092), system_id=6)
-s65071 = Object(id=65071, designation='2004S23', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(177.761718869464), long_asc=radians(210.5409747221465), system_id=6)
-s65072 = Object(id=65072, designation='2004S25', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(172.8603310281285), long_asc=radians(272.0543647587857), system_id=6)
-s65073 = Object(id=65073, designation='2004S22', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=3e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(177.3736729873713), long_asc=radians(280.0314728766004), system_id=6)
-s65075 = Object(id=65075, designation='2004S33', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(158.4008986131884), long_asc=radians(89.28604027660658), system_id=6)
-s65076 = Object(id=65076, designation='2004S34', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=3e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(164.6546736605993), long_asc=radians(298.7610817248147), system_id=6)
-s65074 = Object(id=65074, designation='2004S32', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(157.6291414376739), long_asc=radians(300.6426026571435), system_id=6)
-s65077 = Object(id=65077, designation='2004S28', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(170.4602655124006), long_asc=radians(139.0519312201132), system_id=6)
-s65078 = Object(id=65078, designation='2004S30', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=3e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(156.052677653761), long_asc=radians(266.4232568147968), system_id=6)
-s65079 = Object(id=65079, designation='2004S21', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=3e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(152.7026091440882), long_asc=radians(120.4164730085645), system_id=6)
-s65080 = Object(id=65080, designation='2004S20', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(163.2861872889146), long_asc=radians(341.4757271401118), system_id=6)
-s65081 = Object(id=65081, designation='2004S36', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=3e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(153.3558033835691), long_asc=radians(227.9776509310095), system_id=6)
-s65082 = Object(id=65082, designation='2004S37', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(164.0467773260115), long_asc=radians(149.0650809452967), system_id=6)
-s65083 = Object(id=65083, designation='2004S38', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=5e+13, radius_x=2, radius_y=2, radius_z=2, inclination=radians(153.0393797747259), long_asc=radians(132.9552026674204), system_id=6)
-s65084 = Object(id=65084, designation='2004S39', obj_type='Saturnian satellite', sat_type='Norse group satellite', mass=3e+13, radius_x=1.5, radius_y=1.5, radius_z=1.5, inclination=radians(168.0595510906315), long_asc=radians(185.2466850862819), system_id=6)
-
-db.session.add(mimas)
-db.session.add(enceladus)
-db.session.add(tethys)
-db.session.add(dione)
-db.session.add(rhea)
-db.session.add(titan)
-db.session.add(hyperion)
-db.session.add(iapetus)
-db.session.add(phoebe)
-db.session.add(janus)
-db.session.add(epimetheus)
-db.session.add(helene)
-db.session.add(telesto)
-db.session.add(calypso)
-db.session.add(atlas)
-db.session.add(prometheus)
-db.session.add(pandora)
-db.session.add(pan)
-db.session.add(ymir)
-db.session.add(paaliaq)
-db.session.add(tarvos)
-db.session.add(ijiraq)
-db.session.add(suttungr)
-db.session.add(kiviuq)
-db.session.add(mundilfari)
-db.session.add(albiorix)
-db.session.add(skathi)
-db.session.add(erriapus)
-db.session.add(siarnaq)
-db.session.add(thrymr)
-db.session.add(narvi)
-db.session.add(methone)
-db.session.add(pallene)
-db.session.add(polydeuces)
-db.session.add(daphnis)
-db.session.add(aegir)
-db.session.add(bebhionn)
-db.session.add(bergelmir)
-db.session.add(bestla)
-db.session.add(farbauti)
-db.session.add(fenrir)
-db.session.add(fornjot)
-db.session.add(hati)
-db.session.add(hyrrokkin)
-db.session.add(kari)
-db.session.add(loge)
-db.session.add(skoll)
-db.session.add(surtur)
-db.session.add(anthe)
-db.session.add(jarnsaxa)
-db.session.add(greip)
-db.session.add(tarqeq)
-db.session.add(aegaeon)
-db.session.add(s65035)
-db.session.add(s65040)
-db.session.add(s65041)
-db.session.add(s65045)
-db.session.add(s65048)
-db.session.add(s65050)
-db.session.add(s65055)
-db.session.add(s65056)
-db.session.add(s65065)
-db.session.add(s65066)
-db.session.add(s65067)
-db.session.add(s65068)
-db.session.add(s65069)
-db.session.add(s65070)
-db.session.add(s65071)
-db.session.add(s65072)
-db.session.add(s65073)
-db.session.add(s65074)
-db.session.add(s65075)
-db.session.add(s65076)
-db.session.add(s65077)
-db.session.add(s65078)
-db.session.add(s65079)
-db.session.add(s65080)
-db.session.add(s65081)
-db.session.add(s65082)
-db.session.add(s65083)
-db.session.add(s65084)
-
-db.session.commit()
-
-# Add Uranus moons
-ariel = Object(id=701, name='Ariel', obj_type='Uranian satellite', sat_type='Major satellite', mass=1.251e+21, radius_x=5.811e+2, radius_y=5.779e+2, radius_z=5.777e+2, color_map='/images/ariel/ariel_rgb_cyl_www.jpg', rotation_period=217728, inclination=radians(97.71155241294541), long_asc=radians(167.652809345759), system_id=7)
-umbriel = Object(id=702, name='Umbriel', obj_type='Uranian satellite', sat_type='Major satellite', mass=1.275e+21, radius_x=5.847e+2, radius_y=5.847e+2, radius_z=5.847e+2, rotation_period=59673.6, inclination=radians(97.68773993827445), long_asc=radians(167.6715396992317), system_id=7)
-titania = Object(id=703, name='Titania', obj_type='Uranian satellite', sat_type='Major satellite', mass=3.4e+21, radius_x=7.884e+2, radius_y=7.884e+2, radius_z=7.884e+2, color_map='/images/titania/titania_rgb_cyl_www.jpg', rotation_period=752218.6176, inclination=radians(97.80260099327313), long_asc=radians(167.6163425635686), system_id=7)
-oberon = Object(id=704, name='Oberon', obj_type='Uranian satellite', sat_type='Major satellite', mass=3.076e+21, radius_x=7.614e+2, radius_y=7.614e+2, radius_z=7.614e+2, color_map='/images/oberon/oberon_rgb_cyl_www.jpg', rotation_period=1163223.4176, inclination=radians(97.9028482024903), long_asc=radians(167.7412476164812), system_id=7)
-miranda = Object(id=705, name='Miranda', obj_type='Uranian satellite', sat_type='Major satellite', mass=6.4e+19, radius_x=2.4e+2, radius_y=2.342e+2, radius_z=2.329e+2, rotation_period=122124.5856, inclination=radians(96.15088859461385), long_asc=radians(163.4967051866236), system_id=7)
-cordelia = Object(id=706, name='Cordelia', obj_type='Uranian satellite', sat_type='Inner satellite', mass=4.4e+16, radius_x=2.5e+1, radius_y=1.8e+1, radius_z=1.8e+1, rotation_period=28946.9238, inclination=radians(97.74411572778241), long_asc=radians(167.8186790266971), system_id=7)
-ophelia = Object(id=707, name='Ophelia', obj_type='Uranian satellite', sat_type='Inner satellite', mass=5.3e+16, radius_x=2.7e+1, radius_y=1.9e+1, radius_z=1.9e+1, rotation_period=32520.9937, inclination=radians(97.77439612121856), long_asc=radians(167.6146347337326), system_id=7)
-bianca = Object(id=708, name='Bianca', obj_type='Uranian satellite', sat_type='Inner satellite', mass=9.2e+16, radius_x=3.2e+1, radius_y=2.3e+1, radius_z=2.3e+1, rotation_period=37547.6243904, inclination=radians(97.754917195871), long_asc=radians(167.7426327683588), system_id=7)
-cressida = Object(id=709, name='Cressida', obj_type='Uranian satellite', sat_type='Inner satellite', mass=2.5e+17, radius_x=4.6e+1, radius_y=3.7e+1, radius_z=3.7e+1, rotation_period=40052.4135264, inclination=radians(97.68426282359533), long_asc=radians(167.6072032972966), system_id=7)
-desdemona = Object(id=710, name='Desdemona', obj_type='Uranian satellite', sat_type='Inner satellite', mass=1.8e+17, radius_x=4.5e+1, radius_y=2.7e+1, radius_z=2.7e+1, rotation_period=40923.3251808, inclination=radians(97.72507948062976), long_asc=radians(167.7256579965663), system_id=7)
-juliet = Object(id=711, name='Juliet', obj_type='Uranian satellite', sat_type='Inner satellite', mass=5.6e+17, radius_x=7.5e+1, radius_y=3.7e+1, radius_z=3.7e+1, rotation_period=42600.858336, inclination=radians(97.69455978441637), long_asc=radians(167.6573489812628), system_id=7)
-portia = Object(id=712, name='Portia', obj_type='Uranian satellite', sat_type='Inner satellite', mass=1.7e+18, radius_x=7.8e+1, radius_y=6.3e+1, radius_z=6.3e+1, rotation_period=44340.12749664, inclination=radians(97.72412466212556), long_asc=radians(167.6905500723409), system_id=7)
-rosalind = Object(id=713, name='Rosalind', obj_type='Uranian satellite', sat_type='Inner satellite', mass=2.5e+17, radius_x=3.6e+1, radius_y=3.6e+1, radius_z=3.6e+1, rotation_period=48250.9033056, inclination=radians(97.76494090165258), long_asc=radians(167.6275442728303), system_id=7)
-belinda = Object(id=714, name='Belinda', obj_type='Uranian satellite', sat_type='Inner satellite', mass=3.6e+17, radius_x=6.4e+1, radius_y=3.2e+1, radius_z=3.2e+1, rotation_period=53872.773408, inclination=radians(97.7252926723169), long_asc=radians(167.6349032145021), system_id=7)
-puck = Object(id=715, name='Puck', obj_type='Uranian satellite', sat_type='Inner satellite', mass=2.9e+18, radius_x=8.1e+1, radius_y=8.1e+1, radius_z=8.1e+1, rotation_period=65822.359968, inclination=radians(97.62357130867801), long_asc=radians(167.9666007042577), system_id=7)
-caliban = Object(id=716, name='Caliban', obj_type='Uranian satellite', sat_type='Irregular retrograde satellite', mass=2.5e+17, radius_x=2.1e+1, radius_y=2.1e+1, radius_z=2.1e+1, rotation_period=9576, inclination=radians(139.9862295553247), long_asc=radians(175.2012046855283), system_id=7)
-sycorax = Object(id=717, name='Sycorax', obj_type='Uranian satellite', sat_type='Irregular retrograde satellite', mass=2.5e+18, radius_x=8.25e+1, radius_y=8.25e+1, radius_z=8.25e+1, rotation_period=12960, inclination=radians(152.6397974335034), long_asc=radians(257.3283690815107), system_id=7)
-prospero = Object(id=718, name='Prospero', designation='1999U3', obj_type='Uranian satellite', sat_type='Irregular retrograde satellite', mass=8.5e+16, radius_x=1.25e+1, radius_y=1.25e+1, radius_z=1.25e+1, inclination=radians(145.444589935911), long_asc=radians(320.6044707226431), system_id=7)
-setebos = Object(id=719, name='Setebos', designation='1999U1', obj_type='Uranian satellite', sat_type='Irregular retrograde satellite', mass=7.5e+16, radius_x=1.2e+1, radius_y=1.2e+1, radius_z=1.2e+1, inclination=radians(146.4066316979652), long_asc=radians(252.3676825654132), system_id=7)
-stephano = Object(id=720, name='Stephano', designation='1999U2', obj_type='Uranian satellite', sat_type='Irregular retrograde satellite', mass=2.2e+16, radius_x=1.6e+1, radius_y=1.6e+1, radius_z=1.6e+1, inclination=radians(141.9605529911889), long_asc=radians(189.7997451244586), system_id=7)
-trinculo = Object(id=721, name='Trinculo', designation='2001U1', obj_type='Uranian satellite', sat_type='Irregular retrograde satellite', mass=3.9e+15, radius_x=9, radius_y=9, radius_z=9, inclination=radians(166.30524782645), long_asc=radians(199.4819181803178), system_id=7)
-francisco = Object(id=722, name='Francisco', designation='2001U3', obj_type='Uranian satellite', sat_type='Irregular retrograde satellite', mass=7.2e+15, radius_x=1.1e+1, radius_y=1.1e+1, radius_z=1.1e+1, inclination=radians(147.407169289684), long_asc=radians(103.3973568538887), system_id=7)
-margaret = Object(id=723, name='Margaret', designation='2003U3', obj_type='Uranian satellite', sat_type='Irregular prograde satellite', mass=5.5e+15, radius_x=5, radius_y=5, radius_z=5, inclination=radians(51.24525492245719), long_asc=radians(22.54288809308585), system_id=7)
-ferdinand = Object(id=724, name='Ferdinand', designation='2001U2', obj_type='Uranian satellite', sat_type='Irregular retrograde satellite', mass=5.4e+15, radius_x=3, radius_y=3, radius_z=3, inclination=radians(167.3466878047643), long_asc=radians(227.598679598492), system_id=7)
-perdita = Object(id=725, name='Perdita', designation='1986U10', obj_type='Uranian satellite', sat_type='Inner satellite', mass=1.8e+16, radius_x=1.5e+1, radius_y=1.5e+1, radius_z=1.5e+1, rotation_period=55125.0144, inclination=radians(97.75626079057146), long_asc=radians(167.6648471370242), system_id=7)
-mab = Object(id=726, name='Mab', designation='2003U1', obj_type='Uranian satellite', sat_type='Inner satellite', mass=1e+15, radius_x=9, radius_y=9, radius_z=9, rotation_period=79747.2, inclination=radians(97.84180861049931), long_asc=radians(167.6302062708502), system_id=7)
-cupid = Object(id=727, name='Cupid', designation='2003U2', obj_type='Uranian satellite', sat_type='Inner satellite', mass=3.8e+15, radius_x=4.5, radius_y=4.5, radius_z=4.5, rotation_period=53395.2, inclination=radians(97.83623518562896), long_asc=radians(167.7292856747809), system_id=7)
-
-db.session.add(ariel)
-db.session.add(umbriel)
-db.session.add(titania)
-db.session.add(oberon)
-db.session.add(miranda)
-db.session.add(cordelia)
-db.session.add(ophelia)
-db.session.add(bianca)
-db.session.add(cressida)
-db.session.add(desdemona)
-db.session.add(juliet)
-db.session.add(portia)
-db.session.add(rosalind)
-db.session.add(belinda)
-db.session.add(puck)
-db.session.add(caliban)
-db.session.add(sycorax)
-db.session.add(prospero)
-db.session.add(setebos)
-db.session.add(stephano)
-db.session.add(trinculo)
-db.session.add(francisco)
-db.session.add(margaret)
-db.session.add(ferdinand)
-db.session.add(perdita)
-db.session.add(mab)
-db.session.add(cupid)
-
-db.session.commit()
-
-# Add Neptune moons
-triton = Object(id=801, name='Triton', obj_type='Neptunian satellite', sat_type='Irregular retrograde satellite', mass=2.139e+22, radius_x=1.3534e+3, radius_y=1.3534e+3, radius_z=1.3534e+3, color_map='/images/triton/triton_rgb_cyl_www.jpg', rotation_period=507773, inclination=radians(129.7287135077434), long_asc=radians(218.5070545018846), system_id=8)
-nereid = Object(id=802, name='Nereid', obj_type='Neptunian satellite', sat_type='Irregular prograde satellite', mass=2.7e+19, radius_x=1.785e+2, radius_y=1.785e+2, radius_z=1.785e+2, rotation_period=41738.4, inclination=radians(5.064494723379523), long_asc=radians(319.4407745007653), system_id=8)
-naiad = Object(id=803, name='Naiad', obj_type='Neptunian satellite', sat_type='Inner satellite', mass=1.9e+20, radius_x=4.8e+1, radius_y=3e+1, radius_z=2.6e+1, rotation_period=25435.79712, inclination=radians(26.49099193852193), long_asc=radians(58.2670252544591), system_id=8)
-thalassa = Object(id=804, name='Thalassa', obj_type='Neptunian satellite', sat_type='Inner satellite', mass=3.5e+20, radius_x=5.4e+1, radius_y=5e+1, radius_z=2.6e+1, rotation_period=26912.255616, inclination=radians(28.46772495192366), long_asc=radians(48.63149140935627), system_id=8)
-despina = Object(id=805, name='Despina', obj_type='Neptunian satellite', sat_type='Inner satellite', mass=2.2e+18, radius_x=9e+1, radius_y=7.4e+1, radius_z=6.4e+1, rotation_period=28914.236064, inclination=radians(28.53598973242792), long_asc=radians(48.88735476246207), system_id=8)
-galatea = Object(id=806, name='Galatea', obj_type='Neptunian satellite', sat_type='Inner satellite', mass=2.12e+18, radius_x=1.02e+2, radius_y=9.2e+1, radius_z=7.2e+1, rotation_period=37043.508384, inclination=radians(28.52987027828539), long_asc=radians(48.92867827074477), system_id=8)
-larissa = Object(id=807, name='Larissa', obj_type='Neptunian satellite', sat_type='Inner satellite', mass=4.2e+18, radius_x=1.08e+2, radius_y=1.02e+2, radius_z=8.4e+1, rotation_period=47922.046848, inclination=radians(28.51816066806717), long_asc=radians(48.41692306501051), system_id=8)
-proteus = Object(id=808, name='Proteus', obj_type='Neptunian satellite', sat_type='Inner satellite', mass=4.4e+19, radius_x=2.12e+2, radius_y=1.95e+2, radius_z=1.98e+2, rotation_period=96967.996128, inclination=radians(29.04658590186969), long_asc=radians(48.50327040787048), system_id=8)
-halimede = Object(id=809, name='Halimede', designation='2002N1', obj_type='Neptunian satellite', sat_type='Irregular retrograde satellite', mass=1.6e+17, radius_x=3.1e+1, radius_y=3.1e+1, radius_z=3.1e+1, inclination=radians(111.9801174128132), long_asc=radians(217.775238742704), system_id=8)
-psamathe = Object(id=810, name='Psamathe', designation='2003N1', obj_type='Neptunian satellite', sat_type='Irregular retrograde satellite', mass=4e+16, radius_x=1.9e+1, radius_y=1.9e+1, radius_z=1.9e+1, inclination=radians(124.3887585736594), long_asc=radians(319.5455847241252), system_id=8)
-sao = Object(id=811, name='Sao', designation='2002N2', obj_type='Neptunian satellite', sat_type='Irregular prograde satellite', mass=6e+16, radius_x=2.2e+1, radius_y=2.2e+1, radius_z=2.2e+1, inclination=radians(52.6739460421239), long_asc=radians(61.25009395353386), system_id=8)
-laomedeia = Object(id=812, name='Laomedeia', designation='2002N3', obj_type='Neptunian satellite', sat_type='Irregular prograde satellite', mass=5e+16, radius_x=2.1e+1, radius_y=2.1e+1, radius_z=2.1e+1, inclination=radians(37.94178251819729), long_asc=radians(51.14587684093806), system_id=8)
-neso = Object(id=813, name='Neso', designation='2002N4', obj_type='Neptunian satellite', sat_type='Irregular retrograde satellite', mass=2e+17, radius_x=3e+1, radius_y=3e+1, radius_z=3e+1, inclination=radians(140.1512601949612), long_asc=radians(46.74899359894611), system_id=8)
-hippocamp = Object(id=814, name='Hippocamp', designation='2004N1', obj_type='Neptunian satellite', sat_type='Inner satellite', mass=1.59495e+16, radius_x=1.74e+1, radius_y=1.74e+1, radius_z=1.74e+1, rotation_period=82080, inclination=radians(28.82707620224548), long_asc=radians(48.58304540762949), system_id=8)
-
-db.session.add(triton)
-db.session.add(nereid)
-db.session.add(naiad)
-db.session.add(thalassa)
-db.session.add(despina)
-db.session.add(galatea)
-db.session.add(larissa)
-db.session.add(proteus)
-db.session.add(halimede)
-db.session.add(psamathe)
-db.session.add(sao)
-db.session.add(laomedeia)
-db.session.add(neso)
-db.session.add(hippocamp)
-
-db.session.commit()
-
-# Add Pluto moons
-charon = Object(id=901, name='Charon', obj_type='Plutonian satellite', mass=1.586e+21, radius_x=6.06e+2, radius_y=6.06e+2, radius_z=6.06e+2, rotation_period=551856.707, inclination=radians(112.897003230831), long_asc=radians(227.4015028532247), system_id=9)
-nix = Object(id=902, name='Nix', obj_type='Plutonian satellite', mass=4.5e+16, radius_x=2.49e+1, radius_y=1.66e+1, radius_z=1.555e+1, rotation_period=158025.6, axial_tilt=radians(132), inclination=radians(112.901149192928), long_asc=radians(227.4125752005125), system_id=9)
-hydra = Object(id=903, name='Hydra', obj_type='Plutonian satellite', mass=4.8e+16, radius_x=2.545e+1, radius_y=1.805e+1, radius_z=1.545e+1, rotation_period=37108.8, axial_tilt=radians(110), inclination=radians(112.7240872834051), long_asc=radians(227.1568765098196), system_id=9)
-kerberos = Object(id=904, name='Kerberos', designation='2011P1', obj_type='Plutonian satellite', mass=1.65e+16, radius_x=9.5, radius_y=5, radius_z=4.5, rotation_period=458784, axial_tilt=radians(96), inclination=radians(113.0254085030138), long_asc=radians(226.9667376493978), system_id=9)
-styx = Object(id=905, name='Styx', designation='2012P1', obj_type='Plutonian satellite', mass=7.5e+15, radius_x=8, radius_y=4.5, radius_z=4, rotation_period=279936, axial_tilt=radians(82), inclination=radians(112.8539112216469), long_asc=radians(227.3998321181041), system_id=9)
-
-db.session.add(charon)
-db.session.add(nix)
-db.session.add(hydra)
-db.session.add(kerberos)
-db.session.add(styx)
-
-db.session.commit()
-
-# Add alternate names/designations
-sol = AltName(name='Sol', obj_id=10)
-helios = AltName(name='Helios', obj_id=10)
-earth1 = AltName(name='Earth I', obj_id=301)
-luna = AltName(name='Luna', obj_id=301)
-selene = AltName(name='Selene', obj_id=301)
-cynthia = AltName(name='Cynthia', obj_id=301)
-terra = AltName(name='Terra', obj_id=399)
-tellus = AltName(name='Tellus', obj_id=399)
-gaia = AltName(name='Gaia', obj_id=399)
-gaea = AltName(name='Gaea', obj_id=399)
-world = AltName(name='World', obj_id=399)
-globe = AltName(name='Globe', obj_id=399)
-mars1 = AltName(name='Mars I', obj_id=401)
-mars2 = AltName(name='Mars II', obj_id=402)
-jupiter1 = AltName(name='Jupiter I', obj_id=501)
-jupiter2 = AltName(name='Jupiter II', obj_id=502)
-jupiter3 = AltName(name='Jupiter III', obj_id=503)
-jupiter4 = AltName(name='Jupiter IV', obj_id=504)
-jupiter5 = AltName(name='Jupiter V', obj_id=505)
-jupiter6 = AltName(name='Jupiter VI', obj_id=506)
-jupiter7 = AltName(name='Jupiter VII', obj_id=507)
-jupiter8 = AltName(name='Jupiter VIII', obj_id=508)
-jupiter9 = AltName(name='Jupiter IX', obj_id=509)
-jupiter10 = AltName(name='Jupiter X', obj_id=510)
-jupiter11 = AltName(name='Jupiter XI', obj_id=511)
-jupiter12 = AltName(name='Jupiter XII', obj_id=512)
-jupiter13 = AltName(name='Jupiter XIII', obj_id=513)
-jupiter14 = AltName(name='Jupiter XIV', obj_id=514)
-jupiter15 = AltName(name='Jupiter XV', obj_id=515)
-jupiter16 = AltName(name='Jupiter XVI', obj_id=516)
-jupiter17 = AltName(name='Jupiter XVII', obj_id=517)
-jupiter18 = AltName(name='Jupiter XVIII', obj_id=518)
-jupiter182 = AltName(name='2000J1', obj_id=518)
-jupiter19 = AltName(name='Jupiter XIX', obj_id=519)
-jupiter20 = AltName(name='Jupiter XX', obj_id=520)
-jupiter21 = AltName(name='Jupiter XXI', obj_id=521)
-jupiter22 = AltName(name='Jupiter XXII', obj_id=522)
-jupiter23 = AltName(name='Jupiter XXIII', obj_id=523)
-jupiter24 = AltName(name='Jupiter XXIV', obj_id=524)
-jupiter25 = AltName(name='Jupiter XXV', obj_id=525)
-jupiter26 = AltName(name='Jupiter XXVI', obj_id=526)
-jupiter27 = AltName(name='Jupiter XXVII', obj_id=527)
-jupiter28 = AltName(name='Jupiter XXVIII', obj_id=528)
-jupiter29 = AltName(name='Jupiter XXIX', obj_id=529)
-jupiter30 = AltName(name='Jupiter XXX', obj_id=530)
-jupiter31 = AltName(name='Jupiter XXXI', obj_id=531)
-jupiter32 = AltName(name='Jupiter XXXII', obj_id=532)
-jupiter33 = AltName(name='Jupiter XXXIII', obj_id=533)
-jupiter34 = AltName(name='Jupiter XXXIV', obj_id=534)
-jupiter35 = AltName(name='Jupiter XXXV', obj_id=535)
-jupiter36 = AltName(name='Jupiter XXXVI', obj_id=536)
-jupiter37 = AltName(name='Jupiter XXXVII', obj_id=537)
-jupiter38 = AltName(name='Jupiter XXXVIII', obj_id=538)
-jupiter39 = AltName(name='Jupiter XXXIX', obj_id=539)
-jupiter40 = AltName(name='Jupiter XL', obj_id=540)
-jupiter41 = AltName(name='Jupiter XLI', obj_id=541)
-jupiter42 = AltName(name='Jupiter XLII', obj_id=542)
-jupiter43 = AltName(name='Jupiter XLIII', obj_id=543)
-jupiter44 = AltName(name='Jupiter XLIV', obj_id=544)
-jupiter45 = AltName(name='Jupiter XLV', obj_id=545)
-jupiter46 = AltName(name='Jupiter XLVI', obj_id=546)
-jupiter47 = AltName(name='Jupiter XLVII', obj_id=547)
-jupiter48 = AltName(name='Jupiter XLVIII', obj_id=548)
-jupiter49 = AltName(name='Jupiter XLIX', obj_id=549)
-jupiter50 = AltName(name='Jupiter L', obj_id=550)
-jupiter51 = AltName(name='Jupiter LI', obj_id=551)
-jupiter52 = AltName(name='Jupiter LII', obj_id=552)
-jupiter53 = AltName(name='Jupiter LIII', obj_id=553)
-jupiter54 = AltName(name='Jupiter LIV', obj_id=554)
-jupiter55 = AltName(name='Jupiter LV', obj_id=555)
-jupiter552 = AltName(name='55069', obj_id=555)
-jupiter56 = AltName(name='Jupiter LVI', obj_id=556)
-jupiter562 = AltName(name='55075', obj_id=556)
-jupiter57 = AltName(name='Jupiter LVII', obj_id=557)
-jupiter572 = AltName(name='55063', obj_id=557)
-jupiter58 = AltName(name='Jupiter LVIII', obj_id=558)
-jupiter582 = AltName(name='55067', obj_id=558)
-jupiter59 = AltName(name='Jupiter LIX', obj_id=559)
-jupiter60 = AltName(name='Jupiter LX', obj_id=560)
-jupiter602 = AltName(name='55061', obj_id=560)
-jupiter61 = AltName(name='55070', obj_id=561)
-jupiter62 = AltName(name='55078', obj_id=562)
-jupiter63 = AltName(name='55079', obj_id=563)
-jupiter64 = AltName(name='55080', obj_id=564)
-jupiter65 = AltName(name='Jupiter LXV', obj_id=565)
-jupiter652 = AltName(name='55081', obj_id=565)
-jupiter66 = AltName(name='55082', obj_id=566)
-jupiter67 = AltName(name='55083', obj_id=567)
-jupiter68 = AltName(name='55084', obj_id=568)
-jupiter69 = AltName(name='55085', obj_id=569)
-jupiter70 = AltName(name='Jupiter LXX', obj_id=570)
-jupiter702 = AltName(name='55086', obj_id=570)
-jupiter71 = AltName(name='55087', obj_id=571)
-jupiter72 = AltName(name='55074', obj_id=572)
-jupiter73 = AltName(name='55060', obj_id=55501)
-jupiter74 = AltName(name='55062', obj_id=55502)
-jupiter75 = AltName(name='55064', obj_id=55503)
-jupiter76 = AltName(name='55065', obj_id=55504)
-jupiter77 = AltName(name='55066', obj_id=55505)
-jupiter78 = AltName(name='55068', obj_id=55506)
-jupiter79 = AltName(name='55071', obj_id=55507)
-saturn1 = AltName(name='Saturn I', obj_id=601)
-saturn2 = AltName(name='Saturn II', obj_id=602)
-saturn3 = AltName(name='Saturn III', obj_id=603)
-saturn4 = AltName(name='Saturn IV', obj_id=604)
-saturn5 = AltName(name='Saturn V', obj_id=605)
-saturn6 = AltName(name='Saturn VI', obj_id=606)
-saturn7 = AltName(name='Saturn VII', obj_id=607)
-saturn8 = AltName(name='Saturn VIII', obj_id=608)
-saturn9 = AltName(name='Saturn IX', obj_id=609)
-saturn10 = AltName(name='Saturn X', obj_id=610)
-saturn11 = AltName(name='Saturn XI', obj_id=611)
-saturn12 = AltName(name='Saturn XII', obj_id=612)
-saturn13 = AltName(name='Saturn XIII', obj_id=613)
-saturn14 = AltName(name='Saturn XIV', obj_id=614)
-saturn15 = AltName(name='Saturn XV', obj_id=615)
-saturn16 = AltName(name='Saturn XVI', obj_id=616)
-saturn17 = AltName(name='Saturn XVII', obj_id=617)
-saturn18 = AltName(name='Saturn XVIII', obj_id=618)
-saturn19 = AltName(name='Saturn XIX', obj_id=619)
-saturn20 = AltName(name='Saturn XX', obj_id=620)
-saturn21 = AltName(name='Saturn XXI', obj_id=621)
-saturn22 = AltName(name='Saturn XXII', obj_id=622)
-saturn23 = AltName(name='Saturn XXIII', obj_id=623)
-saturn24 = AltName(name='Saturn XXIV', obj_id=624)
-saturn25 = AltName(name='Saturn XXV', obj_id=625)
-saturn26 = AltName(name='Saturn XXVI', obj_id=626)
-saturn27 = AltName(name='Saturn XXVII', obj_id=627)
-saturn28 = AltName(name='Saturn XXVIII', obj_id=628)
-saturn29 = AltName(name='Saturn XXIX', obj_id=629)
-saturn30 = AltName(name='Saturn XXX', obj_id=630)
-saturn31 = AltName(name='Saturn XXXI', obj_id=631)
-saturn32 = AltName(name='Saturn XXXII', obj_id=632)
-saturn33 = AltName(name='Saturn XXXIII', obj_id=633)
-saturn34 = AltName(name='Saturn XXXIV', obj_id=634)
-saturn35 = AltName(name='Saturn XXXV', obj_id=635)
-saturn36 = AltName(name='Saturn XXXVI', obj_id=636)
-saturn362 = AltName(name='65038', obj_id=636)
-saturn37 = AltName(name='Saturn XXXVII', obj_id=637)
-saturn372 = AltName(name='65039', obj_id=637)
-saturn38 = AltName(name='Saturn XXXVIII', obj_id=638)
-saturn382 = AltName(name='65043', obj_id=638)
-saturn39 = AltName(name='Saturn XXXIX', obj_id=639)
-saturn392 = AltName(name='65046', obj_id=639)
-saturn40 = AltName(name='Saturn XL', obj_id=640)
-saturn402 = AltName(name='65037', obj_id=640)
-saturn41 = AltName(name='Saturn XLI', obj_id=641)
-saturn412 = AltName(name='65044', obj_id=641)
-saturn42 = AltName(name='Saturn XLII', obj_id=642)
-saturn422 = AltName(name='65036', obj_id=642)
-saturn43 = AltName(name='Saturn XLIII', obj_id=643)
-saturn44 = AltName(name='Saturn XLIV', obj_id=644)
-saturn45 = AltName(name='Saturn XLV', obj_id=645)
-saturn46 = AltName(name='Saturn XLVI', obj_id=646)
-saturn47 = AltName(name='Saturn XLVII', obj_id=647)
-saturn48 = AltName(name='Saturn XLVIII', obj_id=648)
-saturn49 = AltName(name='Saturn XLIX', obj_id=649)
-saturn50 = AltName(name='Saturn L', obj_id=650)
-saturn51 = AltName(name='Saturn LI', obj_id=651)
-saturn52 = AltName(name='Saturn LII', obj_id=652)
-saturn53 = AltName(name='Saturn LIII', obj_id=653)
-uranus1 = AltName(name='Uranus I', obj_id=701)
-uranus2 = AltName(name='Uranus II', obj_id=702)
-uranus3 = AltName(name='Uranus III', obj_id=703)
-uranus4 = AltName(name='Uranus IV', obj_id=704)
-uranus5 = AltName(name='Uranus V', obj_id=705)
-uranus6 = AltName(name='Uranus VI', obj_id=706)
-uranus7 = AltName(name='Uranus VII', obj_id=707)
-uranus8 = AltName(name='Uranus VIII', obj_id=708)
-uranus9 = AltName(name='Uranus IX', obj_id=709)
-uranus10 = AltName(name='Uranus X', obj_id=710)
-uranus11 = AltName(name='Uranus XI', obj_id=711)
-uranus12 = AltName(name='Uranus XII', obj_id=712)
-uranus13 = AltName(name='Uranus XIII', obj_id=713)
-uranus14 = AltName(name='Uranus XIV', obj_id=714)
-uranus15 = AltName(name='Uranus XV', obj_id=715)
-uranus16 = AltName(name='Uranus XVI', obj_id=716)
-uranus17 = AltName(name='Uranus XVII', obj_id=717)
-uranus18 = AltName(name='Uranus XVIII', obj_id=718)
-uranus19 = AltName(name='Uranus XIX', obj_id=719)
-uranus20 = AltName(name='Uranus XX', obj_id=720)
-uranus21 = AltName(name='Uranus XXI', obj_id=721)
-uranus22 = AltName(name='Uranus XXII', obj_id=722)
-uranus23 = AltName(name='Uranus XXIII', obj_id=723)
-uranus24 = AltName(name='Uranus XXIV', obj_id=724)
-uranus25 = AltName(name='Uranus XXV', obj_id=725)
-uranus26 = AltName(name='Uranus XXVI', obj_id=726)
-uranus27 = AltName(name='Uranus XXVII', obj_id=727)
-neptune1 = AltName(name='Neptune I', obj_id=801)
-neptune2 = AltName(name='Neptune II', obj_id=802)
-neptune3 = AltName(name='Neptune III', obj_id=803)
-neptune4 = AltName(name='Neptune IV', obj_id=804)
-neptune5 = AltName(name='Neptune V', obj_id=805)
-neptune6 = AltName(name='Neptune VI', obj_id=806)
-neptune7 = AltName(name='Neptune VII', obj_id=807)
-neptune8 = AltName(name='Neptune VIII', obj_id=808)
-neptune9 = AltName(name='Neptune IX', obj_id=809)
-neptune10 = AltName(name='Neptune X', obj_id=810)
-neptune11 = AltName(name='Neptune XI', obj_id=811)
-neptune12 = AltName(name='Neptune XII', obj_id=812)
-neptune13 = AltName(name='Neptune XIII', obj_id=813)
-neptune14 = AltName(name='Neptune XIV', obj_id=814)
-pluto1 = AltName(name='Pluto I', obj_id=901)
-pluto2 = AltName(name='Pluto II', obj_id=902)
-pluto3 = AltName(name='Pluto III', obj_id=903)
-pluto4 = AltName(name='Pluto IV', obj_id=904)
-pluto5 = AltName(name='Pluto V', obj_id=905)
-
-db.session.add(sol)
-db.session.add(helios)
-db.session.add(earth1)
-db.session.add(luna)
-db.session.add(selene)
-db.session.add(cynthia)
-db.session.add(terra)
-db.session.add(tellus)
-db.session.add(gaia)
-db.session.add(gaea)
-db.session.add(world)
-db.session.add(globe)
-db.session.add(mars1)
-db.session.add(mars2)
-db.session.add(jupiter1)
-db.session.add(jupiter2)
-db.session.add(jupiter3)
-db.session.add(jupiter4)
-db.session.add(jupiter5)
-db.session.add(jupiter6)
-db.session.add(jupiter7)
-db.session.add(jupiter8)
-db.session.add(jupiter9)
-db.session.add(jupiter10)
-db.session.add(jupiter11)
-db.session.add(jupiter12)
-db.session.add(jupiter13)
-db.session.add(jupiter14)
-db.session.add(jupiter15)
-db.session.add(jupiter16)
-db.session.add(jupiter17)
-db.session.add(jupiter18)
-db.session.add(jupiter182)
-db.session.add(jupiter19)
-db.session.add(jupiter20)
-db.session.add(jupiter21)
-db.session.add(jupiter22)
-db.session.add(jupiter23)
-db.session.add(jupiter24)
-db.session.add(jupiter25)
-db.session.add(jupiter26)
-db.session.add(jupiter27)
-db.session.add(jupiter28)
-db.session.add(jupiter29)
-db.session.add(jupiter30)
-db.session.add(jupiter31)
-db.session.add(jupiter32)
-db.session.add(jupiter33)
-db.session.add(jupiter34)
-db.session.add(jupiter35)
-db.session.add(jupiter36)
-db.session.add(jupiter37)
-db.session.add(jupiter38)
-db.session.add(jupiter39)
-db.session.add(jupiter40)
-db.session.add(jupiter41)
-db.session.add(jupiter42)
-db.session.add(jupiter43)
-db.session.add(jupiter44)
-db.session.add(jupiter45)
-db.session.add(jupiter46)
-db.session.add(jupiter47)
-db.session.add(jupiter48)
-db.session.add(jupiter49)
-db.session.add(jupiter50)
-db.session.add(jupiter51)
-db.session.add(jupiter52)
-db.session.add(jupiter53)
-db.session.add(jupiter54)
-db.session.add(jupiter55)
-db.session.add(jupiter552)
-db.session.add(jupiter56)
-db.session.add(jupiter562)
-db.session.add(jupiter57)
-db.session.add(jupiter572)
-db.session.add(jupiter58)
-db.session.add(jupiter582)
-db.session.add(jupiter59)
-db.session.add(jupiter60)
-db.session.add(jupiter602)
-db.session.add(jupiter61)
-db.session.add(jupiter62)
-db.session.add(jupiter63)
-db.session.add(jupiter64)
-db.session.add(jupiter65)
-db.session.add(jupiter652)
-db.session.add(jupiter66)
-db.session.add(jupiter67)
-db.session.add(jupiter68)
-db.session.add(jupiter69)
-db.session.add(jupiter70)
-db.session.add(jupiter702)
-db.session.add(jupiter71)
-db.session.add(jupiter72)
-db.session.add(jupiter73)
-db.session.add(jupiter74)
-db.session.add(jupiter75)
-db.session.add(jupiter76)
-db.session.add(jupiter77)
-db.session.add(jupiter78)
-db.session.add(jupiter79)
-db.session.add(saturn1)
-db.session.add(saturn2)
-db.session.add(saturn3)
-db.session.add(saturn4)
-db.session.add(saturn5)
-db.session.add(saturn6)
-db.session.add(saturn7)
-db.session.add(saturn8)
-db.session.add(saturn9)
-db.session.add(saturn10)
-db.session.add(saturn11)
-db.session.add(saturn12)
-db.session.add(saturn13)
-db.session.add(saturn14)
-db.session.add(saturn15)
-db.session.add(saturn16)
-db.session.add(saturn17)
-db.session.add(saturn18)
-db.session.add(saturn19)
-db.session.add(saturn20)
-db.session.add(saturn21)
-db.session.add(saturn22)
-db.session.add(saturn23)
-db.session.add(saturn24)
-db.session.add(saturn25)
-db.session.add(saturn26)
-db.session.add(saturn27)
-db.session.add(saturn28)
-db.session.add(saturn29)
-db.session.add(saturn30)
-db.session.add(saturn31)
-db.session.add(saturn32)
-db.session.add(saturn33)
-db.session.add(saturn34)
-db.session.add(saturn35)
-db.session.add(saturn36)
-db.session.add(saturn362)
-db.session.add(saturn37)
-db.session.add(saturn372)
-db.session.add(saturn38)
-db.session.add(saturn382)
-db.session.add(saturn39)
-db.session.add(saturn392)
-db.session.add(saturn40)
-db.session.add(saturn402)
-db.session.add(saturn41)
-db.session.add(saturn412)
-db.session.add(saturn42)
-db.session.add(saturn422)
-db.session.add(saturn43)
-db.session.add(saturn44)
-db.session.add(saturn45)
-db.session.add(saturn46)
-db.session.add(saturn47)
-db.session.add(saturn48)
-db.session.add(saturn49)
-db.session.add(saturn50)
-db.session.add(saturn51)
-db.session.add(saturn52)
-db.session.add(saturn53)
-db.session.add(uranus1)
-db.session.add(uranus2)
-db.session.add(uranus3)
-db.session.add(uranus4)
-db.session.add(uranus5)
-db.session.add(uranus6)
-db.session.add(uranus7)
-db.session.add(uranus8)
-db.session.add(uranus9)
-db.session.add(uranus10)
-db.session.add(uranus11)
-db.session.add(uranus12)
-db.session.add(uranus13)
-db.session.add(uranus14)
-db.session.add(uranus15)
-db.session.add(uranus16)
-db.session.add(uranus17)
-db.session.add(uranus18)
-db.session.add(uranus19)
-db.session.add(uranus20)
-db.session.add(uranus21)
-db.session.add(uranus22)
-db.session.add(uranus23)
-db.session.add(uranus24)
-db.session.add(uranus25)
-db.session.add(uranus26)
-db.session.add(uranus27)
-db.session.add(neptune1)
-db.session.add(neptune2)
-db.session.add(neptune3)
-db.session.add(neptune4)
-db.session.add(neptune5)
-db.session.add(neptune6)
-db.session.add(neptune7)
-db.session.add(neptune8)
-db.session.add(neptune9)
-db.session.add(neptune10)
-db.session.add(neptune11)
-db.session.add(neptune12)
-db.session.add(neptune13)
-db.session.add(neptune14)
-db.session.add(pluto1)
-db.session.add(pluto2)
-db.session.add(pluto3)
-db.session.add(pluto4)
-db.session.add(pluto5)
-
-db.session.commit()
\ No newline at end of file
+"""Loads systems, objects and alternate names from data files into the database
+
+Usage: python seed.py [data directory] [--prune]
+
+Each table is read from <name>.csv or <name>.json in the data directory (data/ by default):
+systems (id, name), objects (one field per column of the Objects table) and alt_names (obj_id, name).
+Systems and objects are upserted by id in bulk and everything is written in a single transaction,
+so the loader can be rerun to apply incremental updates while the app keeps serving requests.
+The alternate names of every object listed in alt_names are replaced by the ones in the file.
+With --prune, systems and objects missing from the files are deleted, except the small bodies
+with orbital elements loaded by catalogue.py, which are never listed in these files"""
+from models import System, Object, AltName, ObjectSet, ObjectSetMember, OrbitalElements, db
+from registry import reset_registry, bump_version
+from object_sets import sync_builtin_sets
+from db_utils import upsert, chunks, create_indexes
+import argparse
+import time
+import json
+import csv
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def read_table(directory, name, table):
+    """Reads <name>.csv or <name>.json from directory as a list of dicts, one per row
+    Empty CSV fields become None and every value is converted to the type of its column"""
+    csv_path = os.path.join(directory, f'{name}.csv')
+    json_path = os.path.join(directory, f'{name}.json')
+    if os.path.exists(csv_path):
+        with open(csv_path, newline='') as file:
+            rows = list(csv.DictReader(file))
+    elif os.path.exists(json_path):
+        with open(json_path) as file:
+            rows = json.load(file)
+    else:
+        return []
+
+    types = {column.name: column.type.python_type for column in table.columns}
+    return [{key: None if value in [None, ''] else types[key](value) for key, value in row.items()} for row in rows]
+
+
+def read_catalogue(directory=DATA_DIR):
+    """Reads the systems, objects and alt_names data files from directory"""
+    return {'systems': read_table(directory, 'systems', System.__table__),
+            'objects': read_table(directory, 'objects', Object.__table__),
+            'alt_names': read_table(directory, 'alt_names', AltName.__table__)}
+
+
+def replace_alt_names(rows):
+    """Replaces the alternate names of every object that has rows"""
+    obj_ids = sorted(set(row['obj_id'] for row in rows))
+    for chunk in chunks(obj_ids):
+        db.session.execute(AltName.__table__.delete().where(AltName.obj_id.in_(chunk)))
+    for chunk in chunks(rows):
+        db.session.execute(AltName.__table__.insert(), chunk)
+
+
+def prune(catalogue):
+    """Deletes the systems and objects missing from the catalogue, along with their alternate names,
+    object set memberships and object set filters
+    Objects with orbital elements belong to catalogue.py and are kept"""
+    object_ids = set(row['id'] for row in catalogue['objects'])
+    system_ids = set(row['id'] for row in catalogue['systems'])
+    with_elements = db.session.query(OrbitalElements.obj_id)
+    stale_objects = [id for (id,) in db.session.query(Object.id).filter(Object.id.notin_(with_elements))
+                     if id not in object_ids]
+    stale_systems = [id for (id,) in db.session.query(System.id) if id not in system_ids]
+    for chunk in chunks(stale_objects):
+        db.session.execute(AltName.__table__.delete().where(AltName.obj_id.in_(chunk)))
+        db.session.execute(ObjectSetMember.__table__.delete().where(ObjectSetMember.obj_id.in_(chunk)))
+        db.session.execute(Object.__table__.delete().where(Object.id.in_(chunk)))
+    for chunk in chunks(stale_systems):
+        db.session.execute(ObjectSet.__table__.update().where(ObjectSet.system_id.in_(chunk)).values(system_id=None))
+        db.session.execute(System.__table__.delete().where(System.id.in_(chunk)))
+    return len(stale_objects), len(stale_systems)
+
+
+def load_catalogue(catalogue, prune_missing=False):
+    """Writes a catalogue read by read_catalogue to the database in one transaction
+    Returns the number of rows written or deleted for each table and the time taken by each step, in seconds"""
+    report = {}
+    start = time.perf_counter()
+    try:
+        upsert(System, catalogue['systems'])
+        report['systems'] = len(catalogue['systems'])
+        upsert(Object, catalogue['objects'])
+        report['objects'] = len(catalogue['objects'])
+        replace_alt_names(catalogue['alt_names'])
+        report['alt_names'] = len(catalogue['alt_names'])
+        if prune_missing:
+            report['pruned_objects'], report['pruned_systems'] = prune(catalogue)
+        report['write_time'] = time.perf_counter() - start
+        # the bulk statements bypass the session's change tracking, so other processes are told here
+        bump_version(db.session)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    report['commit_time'] = time.perf_counter() - start - report['write_time']
+
+    # the bulk statements bypass the session's change tracking, so the registry is reset here
+    reset_registry()
+    sets_start = time.perf_counter()
+    sync_builtin_sets()
+    report['sets_time'] = time.perf_counter() - sets_start
+    report['total_time'] = time.perf_counter() - start
+    return report
+
+
+if __name__ == '__main__':
+    from app import app
+
+    parser = argparse.ArgumentParser(description='Load systems, objects and alternate names from data files')
+    parser.add_argument('directory', nargs='?', default=DATA_DIR)
+    parser.add_argument('--prune', action='store_true', help='delete systems and objects missing from the files, except bodies with orbital elements')
+    args = parser.parse_args()
+
+    read_start = time.perf_counter()
+    catalogue = read_catalogue(args.directory)
+    read_time = time.perf_counter() - read_start
+    db.create_all()
+    create_indexes()
+    report = load_catalogue(catalogue, args.prune)
+    print(f'read {args.directory} in {read_time:.2f} s')
+    for key, value in report.items():
+        print(f'{key}: {value:.2f} s' if key.endswith('_time') else f'{key}: {value}')
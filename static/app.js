@@ -792,6 +792,17 @@ $(async function () {
             $('#object-system-container').empty();
         }
 
+        // static object information is requested once per set and cached by the browser using its ETag
+        const metadataRes = await axios.get(`${BASE_URL}/bodies/metadata`, {
+            params: {
+                'object_set': bodySet,
+            }
+        });
+        const metadata = {};
+        for (let obj of metadataRes.data) {
+            metadata[obj.id] = obj;
+        }
+
         const totalObjects = bodyList.length;
         let i = 0;
         for (let queryObj of bodyList) {
@@ -818,7 +829,7 @@ $(async function () {
                     'second': second,
                 }
             });
-            const body = res.data;
+            const body = { ...metadata[queryObj.id], ...res.data };
 
             // create a new Body and add it to the scene if available
             const nextBody = new Body(body);
@@ -0,0 +1,82 @@
+"""Tests for the close-approach search in approaches.py, run with python -m unittest"""
+import os
+import sys
+import unittest
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from approaches import find_approaches, CellGrid
+
+
+def straight_line(start, velocity, times):
+    """Returns the (n_times, 6) states of a body moving in a straight line from start, in km and km/s"""
+    start, velocity = numpy.asarray(start, dtype=float), numpy.asarray(velocity, dtype=float)
+    return numpy.column_stack((start + numpy.outer(times, velocity), numpy.tile(velocity, (len(times), 1))))
+
+
+class FindApproachesTest(unittest.TestCase):
+
+    def test_straight_line_pass(self):
+        # a body passes a fixed target at 10 km/s with a miss distance of 500 km, 1234.5 s after the start
+        times = numpy.arange(0, 3601, 600.0)
+        states = numpy.stack((straight_line([0, 0, 0], [0, 0, 0], times),
+                              straight_line([-12345, 500, 0], [10, 0, 0], times)))
+        found = find_approaches(states, times, [0], 1000)
+        self.assertEqual(found['body'].tolist(), [1])
+        self.assertAlmostEqual(found['time'][0], 1234.5, places=3)
+        self.assertAlmostEqual(found['distance'][0], 500, places=6)
+        self.assertAlmostEqual(found['speed'][0], 10, places=9)
+
+    def test_distance_is_respected(self):
+        times = numpy.arange(0, 3601, 600.0)
+        states = numpy.stack((straight_line([0, 0, 0], [0, 0, 0], times),
+                              straight_line([-12345, 500, 0], [10, 0, 0], times)))
+        self.assertEqual(len(find_approaches(states, times, [0], 499)['time']), 0)
+
+    def test_unavailable_bodies_are_skipped(self):
+        times = numpy.arange(0, 3601, 600.0)
+        states = numpy.stack((straight_line([0, 0, 0], [0, 0, 0], times),
+                              straight_line([-12345, 500, 0], [10, 0, 0], times)))
+        states[1, 2] = numpy.nan
+        self.assertEqual(len(find_approaches(states, times, [0], 1000)['time']), 0)
+
+    def test_target_pairs_found_once(self):
+        times = numpy.arange(0, 3601, 600.0)
+        states = numpy.stack((straight_line([0, 0, 0], [0, 0, 0], times),
+                              straight_line([-12345, 500, 0], [10, 0, 0], times)))
+        found = find_approaches(states, times, [0, 1], 1000)
+        self.assertEqual(len(found['time']), 1)
+
+    def test_matches_brute_force(self):
+        rng = numpy.random.default_rng(0)
+        times = numpy.arange(0, 7201, 600.0)
+        states = numpy.stack([straight_line(rng.uniform(-2e5, 2e5, 3), rng.uniform(-20, 20, 3), times) for _ in range(60)])
+        found = find_approaches(states, times, [0, 1, 2], 60000)
+        fine = numpy.linspace(0, 7200, 72001)
+        expected = set()
+        for target in range(3):
+            for body in range(60):
+                if body == target or body < 3 and body < target:
+                    continue
+                relative = (states[body, 0, :3] - states[target, 0, :3]) + numpy.outer(fine, states[body, 0, 3:] - states[target, 0, 3:])
+                if numpy.linalg.norm(relative, axis=1).min() <= 60000:
+                    expected.add((target, body))
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(set(zip(found['target'].tolist(), found['body'].tolist())), expected)
+
+
+class CellGridTest(unittest.TestCase):
+
+    def test_query_never_misses(self):
+        rng = numpy.random.default_rng(1)
+        lo = rng.uniform(-100, 100, (500, 3))
+        hi = lo + rng.uniform(0, 10, (500, 3))
+        grid = CellGrid(lo, hi, 8.0)
+        query, member = grid.query(lo[:20] - 5, hi[:20] + 5)
+        found = set(zip(query.tolist(), member.tolist()))
+        overlap = ((lo[:20, None] - 5 <= hi[None]) & (hi[:20, None] + 5 >= lo[None])).all(axis=2)
+        self.assertTrue(set(zip(*numpy.nonzero(overlap))) <= found)
+
+
+if __name__ == '__main__':
+    unittest.main()
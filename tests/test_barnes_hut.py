@@ -0,0 +1,48 @@
+"""Tests for the Barnes-Hut octree in barnes_hut.py against direct summation, run with python -m unittest"""
+import os
+import sys
+import unittest
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import barnes_hut
+from propagation import accelerations as direct_accelerations
+
+
+def bodies(n, seed=0):
+    """Returns random positions in km and masses in kg for n bodies"""
+    rng = numpy.random.default_rng(seed)
+    return rng.normal(size=(n, 3)) * 1e8, rng.uniform(1e18, 1e25, n)
+
+
+class BarnesHutTest(unittest.TestCase):
+
+    def test_theta_zero_matches_direct_summation(self):
+        pos, masses = bodies(300)
+        numpy.testing.assert_allclose(barnes_hut.accelerations(pos, masses, theta=0),
+                                      direct_accelerations(pos, masses), rtol=1e-12, atol=0)
+
+    def test_default_theta_is_close(self):
+        pos, masses = bodies(1000, seed=1)
+        expected = direct_accelerations(pos, masses)
+        error = numpy.linalg.norm(barnes_hut.accelerations(pos, masses) - expected, axis=1)
+        self.assertLess(numpy.median(error / numpy.linalg.norm(expected, axis=1)), 1e-2)
+
+    def test_chunked_traversal(self):
+        pos, masses = bodies(200, seed=2)
+        expected = barnes_hut.accelerations(pos, masses, theta=0.5)
+        chunk_size = barnes_hut.CHUNK_SIZE
+        barnes_hut.CHUNK_SIZE = 7
+        try:
+            numpy.testing.assert_allclose(barnes_hut.accelerations(pos, masses, theta=0.5), expected, rtol=1e-12)
+        finally:
+            barnes_hut.CHUNK_SIZE = chunk_size
+
+    def test_coincident_bodies(self):
+        pos = numpy.array([[1e6, 0, 0], [1e6, 0, 0], [-1e6, 0, 0]])
+        acc = barnes_hut.accelerations(pos, numpy.array([1e20, 1e20, 1e22]), theta=0)
+        self.assertTrue(numpy.isfinite(acc).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
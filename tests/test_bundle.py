@@ -0,0 +1,85 @@
+"""Tests for writing offline ephemeris bundles and looking up states in them in bundle.py, run with python -m unittest"""
+import os
+import sys
+import tempfile
+import unittest
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bundle import Bundle, create
+from chebyshev import SegmentTable
+
+START = 2451545.0
+DAYS = 8
+DEGREE = 5
+IDS = [399, 301, 499]
+SEGMENT_DAYS = [2, 0.5, 4]      # per object, so each has its own number of segments
+CENTER = 10
+
+
+class BundleTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'test.bundle')
+        rng = numpy.random.default_rng(0)
+        offsets, covered, coeffs = create(self.path, IDS, CENTER, START, START + DAYS, SEGMENT_DAYS, DEGREE)
+        coeffs[:] = rng.normal(size=coeffs.shape)
+        covered[:] = True
+        # the second segment of the first object is left uncovered
+        covered[int(offsets[0]) + 1] = False
+        self.tables = {}
+        for row, (id, days) in enumerate(zip(IDS, SEGMENT_DAYS)):
+            starts = [START + k * days for k in range(int(offsets[row + 1] - offsets[row]))]
+            self.tables[id] = SegmentTable(starts, [start + days for start in starts],
+                                           [numpy.array(c) for c in coeffs[offsets[row]:offsets[row + 1]]])
+        coeffs.flush()
+        covered.flush()
+        del offsets, covered, coeffs
+        self.bundle = Bundle(self.path)
+
+    def test_header(self):
+        self.assertEqual(self.bundle.ids.tolist(), IDS)
+        self.assertEqual((self.bundle.start, self.bundle.end, self.bundle.center), (START, START + DAYS, CENTER))
+        self.assertEqual(numpy.diff(self.bundle.offsets).tolist(), [4, 16, 2])
+
+    def test_lookup_matches_segment_tables(self):
+        epochs = [START, START + 0.3, START + 4.9, START + 7.25, START + DAYS]
+        results = self.bundle.lookup(IDS[1:], CENTER, epochs)
+        for id in IDS[1:]:
+            expected = [self.tables[id].evaluate(epoch) for epoch in epochs]
+            numpy.testing.assert_allclose(results[id], expected, rtol=1e-12, atol=1e-12)
+
+    def test_uncovered_segment_is_unavailable(self):
+        results = self.bundle.lookup(IDS, CENTER, [START + 3])
+        self.assertIsNone(results[399])
+        self.assertIsNotNone(results[301])
+        self.assertIsNotNone(self.bundle.lookup([399], CENTER, [START + 1])[399])
+
+    def test_dates_outside_span_are_unavailable(self):
+        for epoch in [START - 0.1, START + DAYS + 0.1]:
+            self.assertIsNone(self.bundle.lookup([301], CENTER, [START + 1, epoch])[301])
+
+    def test_unknown_ids_are_unavailable(self):
+        results = self.bundle.lookup([12345, 301], CENTER, [START + 1])
+        self.assertIsNone(results[12345])
+        self.assertIsNotNone(results[301])
+        self.assertEqual(self.bundle.stats()['misses'], 1)
+
+    def test_relative_to_another_center(self):
+        epochs = [START + 0.5, START + 6.1]
+        results = self.bundle.lookup([301], 499, epochs)
+        expected = [numpy.subtract(self.tables[301].evaluate(epoch), self.tables[499].evaluate(epoch)) for epoch in epochs]
+        numpy.testing.assert_allclose(results[301], expected, rtol=1e-12, atol=1e-12)
+        self.assertIsNone(self.bundle.lookup([301], 12345, epochs)[301])
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'r+b') as file:
+            file.write(b'NOTABNDL')
+        with self.assertRaises(ValueError):
+            Bundle(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Tests for fitting and evaluating Chebyshev ephemeris segments in chebyshev.py, run with python -m unittest"""
+import os
+import sys
+import unittest
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chebyshev import SegmentTable, fit_segments, segment_grid, AU
+
+START = 2451545.0
+DEGREE = 11
+
+
+def circular_orbit(julians, radius, period):
+    """Returns (n, 6) rows in au and au/d of a circular orbit of radius au and period days in the xy plane"""
+    angle = 2 * numpy.pi * (julians - START) / period
+    speed = 2 * numpy.pi * radius / period
+    zeros = numpy.zeros_like(angle)
+    return numpy.column_stack((radius * numpy.cos(angle), radius * numpy.sin(angle), zeros,
+                               -speed * numpy.sin(angle), speed * numpy.cos(angle), zeros))
+
+
+class FitSegmentsTest(unittest.TestCase):
+
+    def test_slow_orbit_is_fitted(self):
+        julians = segment_grid(START, 4, 2, DEGREE)
+        segments = fit_segments(julians, circular_orbit(julians, 1.0, 365.25), 2, DEGREE)
+        self.assertEqual(len(segments), 4)
+        self.assertTrue(all(coeffs is not None for _, _, coeffs in segments))
+
+        table = SegmentTable(*(list(values) for values in zip(*segments)))
+        epochs = START + numpy.array([0.3, 2.9, 5.5, 7.99])
+        fitted = numpy.array([table.evaluate(epoch) for epoch in epochs])
+        error = numpy.linalg.norm(fitted[:, :3] - circular_orbit(epochs, 1.0, 365.25)[:, :3], axis=1) * AU
+        self.assertLess(error.max(), 1e-3)
+
+    def test_fast_orbit_is_rejected(self):
+        # an inner moon goes round several times in a segment, which no degree 11 polynomial can follow
+        julians = segment_grid(START, 2, 2, DEGREE)
+        segments = fit_segments(julians, circular_orbit(julians, 9378 / AU, 0.319), 2, DEGREE)
+        self.assertTrue(all(coeffs is None for _, _, coeffs in segments))
+
+    def test_short_segments_fit_fast_orbit(self):
+        julians = segment_grid(START, 16, 0.03125, DEGREE)
+        segments = fit_segments(julians, circular_orbit(julians, 9378 / AU, 0.319), 0.03125, DEGREE)
+        self.assertTrue(all(coeffs is not None for _, _, coeffs in segments))
+
+    def test_tolerance_decides_rejection(self):
+        julians = segment_grid(START, 1, 8, DEGREE)
+        rows = circular_orbit(julians, 1.0, 60)
+        self.assertIsNotNone(fit_segments(julians, rows, 8, DEGREE, tolerance=1e6)[0][2])
+        self.assertIsNone(fit_segments(julians, rows, 8, DEGREE, tolerance=1e-9)[0][2])
+
+    def test_too_few_samples(self):
+        julians = START + numpy.linspace(0, 2, DEGREE + 1)
+        with self.assertRaises(ValueError):
+            fit_segments(julians, circular_orbit(julians, 1.0, 365.25), 2, DEGREE)
+
+
+class SegmentTableTest(unittest.TestCase):
+
+    def test_outside_span(self):
+        table = SegmentTable([START], [START + 2], [numpy.zeros((6, DEGREE + 1))])
+        self.assertIsNone(table.evaluate(START - 0.1))
+        self.assertIsNone(table.evaluate(START + 2.1))
+        self.assertEqual(table.evaluate(START + 1), (0.0,) * 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Tests for the circuit breaker and retry handling in horizons.py, run with python -m unittest"""
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from horizons import CircuitBreaker, UpstreamClient, CircuitOpenError, DeadlineExceeded, NoDataError
+
+RESET = 0.05
+
+
+class FailingTransport:
+    """Transport that raises error on every query, or returns one row per epoch for every id if error is None"""
+
+    max_batch = 10
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def vectors(self, ids, id_type, center, epochs, timeout):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return {id: [(0.0,) * 6 for _ in epochs] for id in ids}
+
+
+def open_breaker(threshold=2):
+    """Returns a breaker opened by threshold failures"""
+    breaker = CircuitBreaker(threshold, RESET)
+    for _ in range(threshold):
+        breaker.record_failure()
+    return breaker
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_opens_after_threshold_failures(self):
+        breaker = CircuitBreaker(3, RESET)
+        for _ in range(2):
+            breaker.record_failure()
+        self.assertEqual(breaker.state(), 'closed')
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state(), 'open')
+        self.assertFalse(breaker.allow())
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(2, RESET)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state(), 'closed')
+
+    def test_half_open_allows_one_trial(self):
+        breaker = open_breaker()
+        time.sleep(RESET * 1.5)
+        self.assertEqual(breaker.state(), 'half-open')
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+    def test_trial_success_closes(self):
+        breaker = open_breaker()
+        time.sleep(RESET * 1.5)
+        breaker.allow()
+        breaker.record_success()
+        self.assertEqual(breaker.state(), 'closed')
+        self.assertTrue(breaker.allow())
+
+    def test_trial_failure_reopens(self):
+        breaker = open_breaker()
+        time.sleep(RESET * 1.5)
+        breaker.allow()
+        breaker.record_failure()
+        self.assertEqual(breaker.state(), 'open')
+        self.assertFalse(breaker.allow())
+        time.sleep(RESET * 1.5)
+        self.assertTrue(breaker.allow())
+
+
+class UpstreamClientTest(unittest.TestCase):
+
+    def test_deadline_does_not_claim_trial(self):
+        breaker = open_breaker()
+        time.sleep(RESET * 1.5)
+        client = UpstreamClient(FailingTransport(), retries=0, breaker=breaker)
+        with self.assertRaises(DeadlineExceeded):
+            client.vectors([1], 'id', 0, [0.0], 1, deadline=time.monotonic() - 1)
+        # the half-open circuit still lets a trial through, and its success closes it
+        self.assertEqual(len(client.vectors([1], 'id', 0, [0.0], 1)), 1)
+        self.assertEqual(breaker.state(), 'closed')
+
+    def test_open_circuit_refuses_without_querying(self):
+        transport = FailingTransport()
+        client = UpstreamClient(transport, breaker=open_breaker())
+        with self.assertRaises(CircuitOpenError):
+            client.vectors([1, 2], 'id', 0, [0.0], 1)
+        self.assertEqual(transport.calls, 0)
+        self.assertEqual(client.stats()['circuit_open'], 2)
+
+    def test_retries_then_raises(self):
+        transport = FailingTransport(ConnectionError('refused'))
+        client = UpstreamClient(transport, retries=2, backoff=0.001, breaker=CircuitBreaker(10, RESET))
+        with self.assertRaises(ConnectionError):
+            client.vectors([1], 'id', 0, [0.0], 1)
+        self.assertEqual(transport.calls, 3)
+        self.assertEqual(client.stats()['retries'], 2)
+        self.assertEqual(client.stats()['upstream_error'], 1)
+
+    def test_no_data_is_not_a_failure(self):
+        breaker = CircuitBreaker(1, RESET)
+        client = UpstreamClient(FailingTransport(NoDataError('No ephemeris for target')), breaker=breaker)
+        self.assertEqual(client.vectors([1], 'id', 0, [0.0], 1), {})
+        self.assertEqual(breaker.state(), 'closed')
+        self.assertEqual(client.stats()['no_data'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
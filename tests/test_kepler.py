@@ -0,0 +1,96 @@
+"""Tests for Kepler's equation solvers and analytic propagation from orbital elements in kepler.py, run with python -m unittest"""
+import os
+import sys
+import unittest
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kepler import ElementTable, propagate, solve_elliptic, solve_hyperbolic, GM_SUN
+
+EPOCH = 2451545.0
+
+
+def orbits(a, e):
+    """Returns propagate arguments for orbits with the given semi-major axes and eccentricities,
+    in tilted planes and starting at various mean anomalies"""
+    n = len(a)
+    rng = numpy.random.default_rng(0)
+    return (numpy.asarray(a, dtype=float), numpy.asarray(e, dtype=float), rng.uniform(0, numpy.pi, n),
+            rng.uniform(0, 2 * numpy.pi, n), rng.uniform(0, 2 * numpy.pi, n), rng.uniform(-1, 1, n), numpy.full(n, EPOCH))
+
+
+class SolverTest(unittest.TestCase):
+
+    def test_elliptic_solves_keplers_equation(self):
+        e = numpy.repeat([0.0, 0.1, 0.5, 0.9, 0.99, 0.999999], 200)
+        mean = numpy.tile(numpy.linspace(-20, 20, 200), 6)
+        anomaly = solve_elliptic(mean, e)
+        wrapped = numpy.remainder(mean + numpy.pi, 2 * numpy.pi) - numpy.pi
+        numpy.testing.assert_allclose(anomaly - e * numpy.sin(anomaly), wrapped, rtol=0, atol=1e-11)
+
+    def test_elliptic_circular_orbit(self):
+        mean = numpy.linspace(-3, 3, 7)
+        numpy.testing.assert_allclose(solve_elliptic(mean, numpy.zeros(7)), mean, atol=1e-15)
+
+    def test_hyperbolic_solves_keplers_equation(self):
+        e = numpy.repeat([1.0001, 1.2, 2.0, 10.0, 100.0], 200)
+        mean = numpy.tile(numpy.concatenate((-numpy.logspace(-6, 4, 100), numpy.logspace(-6, 4, 100))), 5)
+        anomaly = solve_hyperbolic(mean, e)
+        numpy.testing.assert_allclose(e * numpy.sinh(anomaly) - anomaly, mean, rtol=1e-10, atol=1e-12)
+
+    def test_does_not_modify_arguments(self):
+        mean, e = numpy.array([4.0, -4.0]), numpy.array([0.5, 0.5])
+        solve_elliptic(mean, e)
+        self.assertEqual(mean.tolist(), [4.0, -4.0])
+
+
+class PropagateTest(unittest.TestCase):
+
+    def check_integrals(self, a, e):
+        elements = orbits(a, e)
+        states = propagate(*elements, EPOCH + numpy.linspace(-3000, 3000, 41))
+        r = numpy.linalg.norm(states[:, :, :3], axis=2)
+        v2 = (states[:, :, 3:] ** 2).sum(axis=2)
+        # vis-viva: the specific orbital energy is -mu / 2a for every orbit, bound or not
+        numpy.testing.assert_allclose(v2 / 2 - GM_SUN / r, numpy.broadcast_to(-GM_SUN / (2 * elements[0][:, None]), r.shape),
+                                      rtol=1e-9)
+        momentum = numpy.cross(states[:, :, :3], states[:, :, 3:])
+        numpy.testing.assert_allclose(momentum, numpy.broadcast_to(momentum[:, :1], momentum.shape), rtol=1e-9, atol=1e-14)
+        expected = numpy.sqrt(GM_SUN * numpy.abs(elements[0]) * numpy.abs(1 - elements[1] ** 2))
+        numpy.testing.assert_allclose(numpy.linalg.norm(momentum[:, 0], axis=1), expected, rtol=1e-9)
+
+    def test_elliptic_integrals_conserved(self):
+        self.check_integrals([0.4, 1.0, 2.7, 30.0, 17.8], [0.0, 0.0167, 0.3, 0.75, 0.967])
+
+    def test_hyperbolic_integrals_conserved(self):
+        self.check_integrals([-0.5, -2.0, -40.0], [1.2, 2.5, 10.0])
+
+    def test_periapsis_at_zero_mean_anomaly(self):
+        a, e = numpy.array([2.0, -1.0]), numpy.array([0.5, 3.0])
+        states = propagate(a, e, numpy.zeros(2), numpy.zeros(2), numpy.zeros(2), numpy.zeros(2), numpy.full(2, EPOCH), [EPOCH])
+        numpy.testing.assert_allclose(states[:, 0, 0], numpy.abs(a) * numpy.abs(1 - e), rtol=1e-12)
+        numpy.testing.assert_allclose(states[:, 0, [1, 2, 3, 5]], 0, atol=1e-15)
+
+    def test_parabolic_is_nan(self):
+        states = propagate(*orbits([1.0], [1.0]), [EPOCH])
+        self.assertTrue(numpy.isnan(states).all())
+
+
+class ElementTableTest(unittest.TestCase):
+
+    def test_find_and_states(self):
+        a, e, i, long_asc, arg_peri, mean_anomaly, epoch = orbits([1.0, 2.0, 3.0], [0.1, 0.2, 0.3])
+        table = ElementTable([30, 10, 20], epoch, a, e, i, long_asc, arg_peri, mean_anomaly)
+        self.assertEqual(table.find([10, 20, 30, 40]).tolist(), [0, 1, 2, -1])
+        states = table.states(table.find([30]), [EPOCH, EPOCH + 1])
+        expected = propagate(a[:1], e[:1], i[:1], long_asc[:1], arg_peri[:1], mean_anomaly[:1], epoch[:1], [EPOCH, EPOCH + 1])
+        numpy.testing.assert_array_equal(states, expected)
+
+    def test_empty_table(self):
+        table = ElementTable([], [], [], [], [], [], [], [])
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.find([1, 2]).tolist(), [-1, -1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Tests for osculating elements from state vectors in osculating.py, run with python -m unittest"""
+import os
+import sys
+import unittest
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from osculating import osculating_elements, element_columns, build_element_obj, wrap, ELEMENTS
+from kepler import propagate, GM_SUN
+
+EPOCH = 2451545.0
+
+
+def states_from(a, e, i, long_asc, arg_peri, mean_anomaly):
+    """Returns the (n, 1, 6) states at EPOCH of orbits with the given elements"""
+    columns = [numpy.asarray(value, dtype=float) for value in (a, e, i, long_asc, arg_peri, mean_anomaly)]
+    return propagate(*columns, numpy.full(len(columns[0]), EPOCH), [EPOCH])
+
+
+def angle_difference(first, second):
+    """Returns the difference of two angles wrapped to [-pi, pi)"""
+    return wrap(numpy.asarray(first) - numpy.asarray(second))
+
+
+class OsculatingElementsTest(unittest.TestCase):
+
+    def assert_recovers(self, a, e, i, long_asc, arg_peri, mean_anomaly):
+        elements = osculating_elements(states_from(a, e, i, long_asc, arg_peri, mean_anomaly), GM_SUN)
+        self.assertEqual(elements['a'].shape, (len(a), 1))
+        numpy.testing.assert_allclose(elements['a'][:, 0], a, rtol=1e-9)
+        numpy.testing.assert_allclose(elements['e'][:, 0], e, atol=1e-9)
+        numpy.testing.assert_allclose(elements['i'][:, 0], i, atol=1e-9)
+        for name, expected in [('long_asc', long_asc), ('arg_peri', arg_peri), ('mean_anomaly', mean_anomaly)]:
+            numpy.testing.assert_allclose(angle_difference(elements[name][:, 0], expected), 0, atol=1e-7, err_msg=name)
+
+    def test_elliptic_orbits_round_trip(self):
+        rng = numpy.random.default_rng(0)
+        n = 50
+        self.assert_recovers(rng.uniform(0.3, 40, n), rng.uniform(0.01, 0.95, n), rng.uniform(0.05, numpy.pi - 0.05, n),
+                             rng.uniform(0, 2 * numpy.pi, n), rng.uniform(0, 2 * numpy.pi, n), rng.uniform(0, 2 * numpy.pi, n))
+
+    def test_hyperbolic_orbits_round_trip(self):
+        rng = numpy.random.default_rng(1)
+        n = 50
+        elements = (-rng.uniform(0.5, 20, n), rng.uniform(1.05, 5, n), rng.uniform(0.05, numpy.pi - 0.05, n),
+                    rng.uniform(0, 2 * numpy.pi, n), rng.uniform(0, 2 * numpy.pi, n), rng.uniform(-3, 3, n))
+        self.assert_recovers(*elements)
+        recovered = osculating_elements(states_from(*elements), GM_SUN)
+        self.assertTrue((recovered['a'] < 0).all())
+        # hyperbolic anomalies are signed rather than wrapped to [0, 2 pi)
+        numpy.testing.assert_allclose(recovered['mean_anomaly'][:, 0], elements[5], atol=1e-7)
+        self.assertTrue((numpy.abs(recovered['true_anomaly']) < numpy.pi).all())
+
+    def test_elliptic_angles_in_range(self):
+        rng = numpy.random.default_rng(2)
+        n = 50
+        elements = osculating_elements(states_from(rng.uniform(1, 5, n), rng.uniform(0.1, 0.5, n), rng.uniform(0.1, 3, n),
+                                                   rng.uniform(-10, 10, n), rng.uniform(-10, 10, n), rng.uniform(-10, 10, n)), GM_SUN)
+        for name in ['long_asc', 'arg_peri', 'true_anomaly', 'mean_anomaly']:
+            self.assertTrue(((elements[name] >= 0) & (elements[name] < 2 * numpy.pi)).all(), name)
+
+    def test_circular_equatorial_orbit(self):
+        # the node is placed on the x axis and the periapsis at the node, so the anomaly is the longitude
+        elements = osculating_elements(numpy.array([[0.0, 2.0, 0.0, -numpy.sqrt(GM_SUN / 2), 0.0, 0.0]]), GM_SUN)
+        for name, expected in [('a', 2.0), ('e', 0.0), ('i', 0.0), ('long_asc', 0.0), ('arg_peri', 0.0)]:
+            self.assertAlmostEqual(float(elements[name][0]), expected, places=12, msg=name)
+        self.assertAlmostEqual(float(elements['true_anomaly'][0]), numpy.pi / 2, places=12)
+        self.assertAlmostEqual(float(elements['mean_anomaly'][0]), numpy.pi / 2, places=12)
+
+    def test_retrograde_orbit(self):
+        elements = osculating_elements(numpy.array([[1.0, 0.0, 0.0, 0.0, -numpy.sqrt(GM_SUN), 0.0]]), GM_SUN)
+        self.assertAlmostEqual(float(elements['i'][0]), numpy.pi, places=12)
+
+    def test_mu_broadcasts_per_body(self):
+        states = numpy.array([[1.0, 0.0, 0.0, 0.0, 1.0, 0.0]] * 2)
+        elements = osculating_elements(states, numpy.array([1.0, 2.0]))
+        numpy.testing.assert_allclose(elements['a'], [1.0, 2.0 / 3])
+        numpy.testing.assert_allclose(elements['e'], [0.0, 0.5])
+
+
+class ElementOutputTest(unittest.TestCase):
+
+    def test_element_columns_and_json(self):
+        elements = {name: numpy.array([[1.0, 2.0], [numpy.nan, 3.0]]) + index for index, name in enumerate(ELEMENTS)}
+        columns = element_columns(elements, epoch=1)
+        self.assertEqual(columns.shape, (2, len(ELEMENTS)))
+        numpy.testing.assert_array_equal(columns[:, 0], [2.0, 3.0])
+        obj = build_element_obj(elements, 1)
+        self.assertEqual(list(obj), ELEMENTS)
+        self.assertIsNone(obj['a'])
+        self.assertIsNone(obj['e'])
+        self.assertEqual(build_element_obj(elements, 0)['i'], 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Tests for the N-body integrators in propagation.py, run with python -m unittest"""
+import os
+import sys
+import unittest
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import propagation
+from propagation import accelerations, trajectory, integration_steps, G
+
+SUN_MASS = 1.989e30
+AU = 149597870.7
+YEAR = 365.25 * 86400
+
+
+def sun_and_planet():
+    """Returns states in km and km/s and masses of a Sun and an Earth-mass planet on a circular orbit at 1 au"""
+    mass = 5.97e24
+    speed = numpy.sqrt(G * (SUN_MASS + mass) / AU)
+    states = numpy.array([[0, 0, 0, 0, -speed * mass / SUN_MASS, 0], [AU, 0, 0, 0, speed, 0]], dtype=float)
+    return states, numpy.array([SUN_MASS, mass])
+
+
+def energy(states, masses):
+    """Returns the total kinetic and potential energy of a two-body system"""
+    kinetic = 0.5 * (masses * (states[:, 3:] ** 2).sum(axis=1)).sum()
+    return kinetic - G * masses[0] * masses[1] / numpy.linalg.norm(states[0, :3] - states[1, :3])
+
+
+class AccelerationsTest(unittest.TestCase):
+
+    def test_inverse_square(self):
+        pos = numpy.array([[0.0, 0, 0], [1e6, 0, 0]])
+        acc = accelerations(pos, numpy.array([1e24, 1e20]))
+        self.assertAlmostEqual(acc[0, 0], G * 1e20 / 1e12, delta=1e-20)
+        self.assertAlmostEqual(acc[1, 0], -G * 1e24 / 1e12, delta=1e-16)
+        self.assertEqual(acc[:, 1:].tolist(), [[0, 0], [0, 0]])
+
+    def test_blocks_match_single_pass(self):
+        rng = numpy.random.default_rng(1)
+        pos = rng.normal(size=(50, 3)) * 1e6
+        masses = rng.uniform(1e20, 1e24, 50)
+        expected = accelerations(pos, masses)
+        block_pairs = propagation.BLOCK_PAIRS
+        propagation.BLOCK_PAIRS = 120
+        try:
+            numpy.testing.assert_allclose(accelerations(pos, masses), expected, rtol=1e-12)
+        finally:
+            propagation.BLOCK_PAIRS = block_pairs
+
+
+class TrajectoryTest(unittest.TestCase):
+
+    def test_circular_orbit_returns_after_a_period(self):
+        states, masses = sun_and_planet()
+        period = 2 * numpy.pi * numpy.sqrt(AU ** 3 / (G * masses.sum()))
+        final = list(trajectory(states, masses, [period], 3600))[-1]
+        self.assertLess(numpy.linalg.norm(final[1, :3] - states[1, :3]), 1e-4 * AU)
+
+    def test_energy_conserved(self):
+        states, masses = sun_and_planet()
+        for integrator in ['leapfrog', 'yoshida4']:
+            frames = list(trajectory(states, masses, numpy.linspace(0, YEAR, 13)[1:], 86400, integrator))
+            drift = max(abs(energy(frame, masses) / energy(states, masses) - 1) for frame in frames)
+            self.assertLess(drift, 1e-6, integrator)
+
+    def test_backward_integration_retraces(self):
+        states, masses = sun_and_planet()
+        frames = list(trajectory(states, masses, [30 * 86400, 0], 3600))
+        numpy.testing.assert_allclose(frames[-1], states, atol=1e-3)
+
+    def test_integration_steps(self):
+        self.assertEqual(integration_steps(86400, 3600, 600), 24 * 6)
+        self.assertEqual(integration_steps(-86400, 60, 600), 1440)
+
+
+if __name__ == '__main__':
+    unittest.main()
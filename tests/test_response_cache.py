@@ -0,0 +1,115 @@
+"""Tests for epoch quantization, keys, encoding negotiation and the disk tier in response_cache.py, run with python -m unittest"""
+import datetime
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+from werkzeug.datastructures import Accept
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from response_cache import CachedResponse, ResponseCache, quantize, cache_key, ENCODINGS
+
+BODY = b'{"bodies": []}' * 100
+
+
+def accept(*encodings):
+    """Returns the parsed Accept-Encoding header of a client accepting encodings"""
+    return Accept([(encoding, 1) for encoding in encodings])
+
+
+class QuantizeTest(unittest.TestCase):
+
+    def test_rounds_to_nearest_multiple(self):
+        base = datetime.datetime(2024, 3, 1, 12, 0, 0)
+        self.assertEqual(quantize(base + datetime.timedelta(seconds=29), 60), base)
+        self.assertEqual(quantize(base + datetime.timedelta(seconds=31), 60), base + datetime.timedelta(minutes=1))
+        self.assertEqual(quantize(base - datetime.timedelta(seconds=29), 60), base)
+        self.assertEqual(quantize(base + datetime.timedelta(minutes=7), 3600), base)
+
+    def test_nearby_epochs_share_a_key(self):
+        base = datetime.datetime(2024, 3, 1, 12, 0, 0)
+        first = cache_key([1, 2], 'set', 10, quantize(base + datetime.timedelta(seconds=10), 60))
+        second = cache_key([1, 2], 'set', 10, quantize(base - datetime.timedelta(seconds=10), 60))
+        self.assertEqual(first, second)
+
+
+class CacheKeyTest(unittest.TestCase):
+
+    def test_depends_on_ids_and_parts(self):
+        key = cache_key([1, 2, 3], 'default', 10, 'json')
+        self.assertEqual(key, cache_key([1, 2, 3], 'default', 10, 'json'))
+        self.assertNotEqual(key, cache_key([1, 2], 'default', 10, 'json'))
+        self.assertNotEqual(key, cache_key([1, 2, 3], 'default', 0, 'json'))
+        self.assertNotEqual(key, cache_key([1, 2, 3], 'default', 10, 'binary'))
+
+
+class CachedResponseTest(unittest.TestCase):
+
+    def test_encodings_decode_to_body(self):
+        response = CachedResponse.encode('application/json', {}, BODY)
+        self.assertEqual(response.bodies['identity'], BODY)
+        self.assertEqual(gzip.decompress(response.bodies['gzip']), BODY)
+        self.assertEqual(set(response.bodies), set(ENCODINGS))
+        self.assertEqual(response.etag, CachedResponse.encode('application/json', {}, BODY).etag)
+
+    def test_negotiate_prefers_compressed(self):
+        response = CachedResponse.encode('application/json', {}, BODY)
+        self.assertEqual(response.negotiate(accept('gzip', 'br')), (ENCODINGS[0], response.bodies[ENCODINGS[0]]))
+        self.assertEqual(response.negotiate(accept('gzip'))[0], 'gzip')
+        self.assertEqual(response.negotiate(accept()), ('identity', BODY))
+
+    def test_negotiate_skips_refused_encoding(self):
+        response = CachedResponse.encode('application/json', {}, BODY)
+        self.assertEqual(response.negotiate(Accept([('gzip', 0), ('br', 0)]))[0], 'identity')
+
+    def test_dump_load_round_trip(self):
+        response = CachedResponse.encode('application/octet-stream', {'X-Epoch': '2024-03-01T12:00:00'}, BODY)
+        loaded = CachedResponse.load(response.dump())
+        self.assertEqual(loaded.mimetype, response.mimetype)
+        self.assertEqual(loaded.headers, response.headers)
+        self.assertEqual(loaded.etag, response.etag)
+        self.assertEqual(loaded.bodies, response.bodies)
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_disk_tier_shared_between_caches(self):
+        writer = ResponseCache(4, 60, self.directory.name)
+        reader = ResponseCache(4, 60, self.directory.name)
+        key = cache_key([1], 'json')
+        self.assertIsNone(reader.get(key))
+        writer.set(key, CachedResponse.encode('application/json', {}, BODY))
+        self.assertEqual(reader.get(key).bodies['identity'], BODY)
+        self.assertEqual(reader.stats()['disk']['hits'], 1)
+        self.assertEqual(reader.stats()['disk']['misses'], 1)
+        # the disk hit was promoted to the memory tier
+        reader.get(key)
+        self.assertEqual(reader.stats()['disk']['hits'], 1)
+
+    def test_expired_files_are_ignored(self):
+        cache = ResponseCache(4, 60, self.directory.name)
+        key = cache_key([1], 'json')
+        cache.set(key, CachedResponse.encode('application/json', {}, BODY))
+        path = os.path.join(self.directory.name, key)
+        old = os.path.getmtime(path) - 120
+        os.utime(path, (old, old))
+        self.assertIsNone(ResponseCache(4, 60, self.directory.name).get(key))
+
+    def test_prune_keeps_newest_files(self):
+        cache = ResponseCache(4, 60, self.directory.name, disk_size=2)
+        for index in range(4):
+            key = cache_key([index], 'json')
+            cache.set(key, CachedResponse.encode('application/json', {}, BODY))
+            path = os.path.join(self.directory.name, key)
+            os.utime(path, (os.path.getmtime(path) + index, os.path.getmtime(path) + index))
+        cache.prune()
+        self.assertEqual(sorted(os.listdir(self.directory.name)), sorted([cache_key([2], 'json'), cache_key([3], 'json')]))
+
+
+if __name__ == '__main__':
+    unittest.main()
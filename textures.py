@@ -0,0 +1,189 @@
+"""Downscaled and compressed variants of the textures served from /images
+
+Usage: python textures.py [--sizes 512,1024,2048,4096] [--force]
+
+Run as a build step. For every texture named in the map columns of the Objects table and every
+background image, it writes mip levels of each width in TEXTURE_SIZES that is smaller than the original,
+re-encoded as progressive JPEG (or optimized PNG for sources that are not JPEG), plus a WebP copy
+of every level including the original size, into TEXTURE_BUILD_DIR along with a manifest.
+Textures whose source has not changed since the last build are skipped.
+/images serves the variants listed in the manifest and falls back to the original file for anything else.
+Metadata payloads add a version of each texture's built variants to its URL, so those URLs can be cached as immutable"""
+from PIL import Image
+import argparse
+import hashlib
+import json
+import os
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = os.path.join(ROOT, 'images')
+BUILD_DIR = os.environ.get('TEXTURE_BUILD_DIR', os.path.join(ROOT, 'build', 'textures'))
+MANIFEST = os.path.join(BUILD_DIR, 'manifest.json')
+SIZES = [int(size) for size in os.environ.get('TEXTURE_SIZES', '512,1024,2048,4096').split(',')]
+DEFAULT_SIZE = os.environ.get('TEXTURE_DEFAULT_SIZE', 'full')    # width served when a request names no size, full for the original
+MAP_COLUMNS = ['color_map', 'bump_map', 'specular_map', 'cloud_map', 'cloud_transparency', 'ring_color', 'ring_transparency']
+EXTRA_DIRS = ['background']     # image directories built in full, since they are not named in the Objects table
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+MIMETYPES = {'jpg': 'image/jpeg', 'png': 'image/png', 'webp': 'image/webp'}
+
+_manifest = {'entries': None, 'mtime': None}
+
+
+def file_hash(path):
+    """Returns a short hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def texture_paths(registry):
+    """Returns the image paths relative to IMAGE_DIR of every texture named by an object and every background image"""
+    paths = set()
+    for record in registry.records.values():
+        for column in MAP_COLUMNS:
+            url = getattr(record, column)
+            if url and url.startswith('/images/'):
+                paths.add(url[len('/images/'):])
+    for directory in EXTRA_DIRS:
+        for name in os.listdir(os.path.join(IMAGE_DIR, directory)):
+            paths.add(f'{directory}/{name}')
+    return sorted(paths)
+
+
+def save(image, path, format):
+    """Encodes an image as jpg, png or webp, creating its directory"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if format == 'jpg':
+        image.convert('L' if image.mode == 'L' else 'RGB').save(path, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    elif format == 'png':
+        image.save(path, 'PNG', optimize=True)
+    else:
+        image.save(path, 'WEBP', quality=WEBP_QUALITY, method=6)
+
+
+def variant(path, mimetype):
+    """Returns the manifest entry for a file written by the build"""
+    return {'path': os.path.relpath(path, ROOT), 'etag': file_hash(path), 'mimetype': mimetype,
+            'bytes': os.path.getsize(path)}
+
+
+def build_texture(image_path, sizes, source_hash):
+    """Writes the variants of one texture and returns its manifest entry"""
+    source = os.path.join(IMAGE_DIR, image_path)
+    base = os.path.join(BUILD_DIR, os.path.splitext(image_path)[0])
+    image = Image.open(source)
+    if image.mode not in ['L', 'RGB', 'RGBA']:
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ['LA', 'PA'] else 'RGB')
+    format = 'jpg' if image_path.lower().endswith(('.jpg', '.jpeg')) else 'png'
+    width, height = image.size
+
+    levels = {}
+    for size in sorted(sizes):
+        if size >= width:
+            break
+        level = image.resize((size, max(1, round(height * size / width))), Image.LANCZOS)
+        save(level, f'{base}/{size}.{format}', format)
+        save(level, f'{base}/{size}.webp', 'webp')
+        levels[size] = {format: variant(f'{base}/{size}.{format}', MIMETYPES[format]),
+                        'webp': variant(f'{base}/{size}.webp', MIMETYPES['webp'])}
+    # the original stays the full-size copy in its own format
+    save(image, f'{base}/{width}.webp', 'webp')
+    original = variant(source, None)
+    original['etag'] = source_hash
+    levels[width] = {'original': original, 'webp': variant(f'{base}/{width}.webp', MIMETYPES['webp'])}
+    return {'hash': source_hash, 'width': width, 'levels': {str(size): level for size, level in levels.items()}}
+
+
+def build(image_paths, sizes=SIZES, force=False):
+    """Builds the variants of every texture whose source changed since the last build and writes the manifest
+    Returns the number of textures built and a list of the paths that were missing"""
+    manifest = read_manifest()
+    built, missing = 0, []
+    for image_path in image_paths:
+        source = os.path.join(IMAGE_DIR, image_path)
+        if not os.path.isfile(source):
+            missing.append(image_path)
+            continue
+        source_hash = file_hash(source)
+        entry = manifest.get(image_path)
+        if not force and entry and entry['hash'] == source_hash and \
+                all(os.path.exists(os.path.join(ROOT, file['path'])) for level in entry['levels'].values() for file in level.values()):
+            continue
+        manifest[image_path] = build_texture(image_path, sizes, source_hash)
+        built += 1
+
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with open(MANIFEST + '.tmp', 'w') as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(MANIFEST + '.tmp', MANIFEST)
+    return built, missing
+
+
+def read_manifest():
+    """Returns the manifest written by the last build, reread whenever the file changes, or {} if there is none"""
+    try:
+        mtime = os.path.getmtime(MANIFEST)
+    except OSError:
+        return {}
+    if _manifest['mtime'] != mtime:
+        with open(MANIFEST) as file:
+            _manifest['entries'] = json.load(file)
+        _manifest['mtime'] = mtime
+    return _manifest['entries']
+
+
+def manifest_version():
+    """Returns a value that changes whenever a build writes a new manifest"""
+    read_manifest()
+    return _manifest['mtime']
+
+
+def find_variant(image_path, size=None, webp=False):
+    """Returns the manifest entry of the variant of a texture to serve, or None if the texture was not built
+    size is a width in pixels, 'full' for the original, or None for DEFAULT_SIZE. The smallest level at least
+    that wide is chosen, or the largest level if none is. WebP is chosen when webp is True"""
+    entry = read_manifest().get(image_path)
+    if entry is None:
+        return None
+    widths = sorted(int(width) for width in entry['levels'])
+    size = size or DEFAULT_SIZE
+    wanted = widths[-1] if size == 'full' else int(size)
+    level = entry['levels'][str(next((width for width in widths if width >= wanted), widths[-1]))]
+    if webp:
+        return level['webp']
+    return level.get('original') or next(file for format, file in level.items() if format != 'webp')
+
+
+def texture_version(entry):
+    """Returns the version of a built texture, a digest of the content hash of every variant and of DEFAULT_SIZE,
+    so it changes with the source, with the sizes and encoder settings of the build and with the variant
+    served to requests naming no size"""
+    etags = sorted(file['etag'] for level in entry['levels'].values() for file in level.values())
+    return hashlib.sha256(' '.join(etags + [str(DEFAULT_SIZE)]).encode()).hexdigest()[:16]
+
+
+def texture_url(url):
+    """Adds the version of a built texture to its /images URL as v, or returns the URL unchanged"""
+    if not url or not url.startswith('/images/'):
+        return url
+    entry = read_manifest().get(url[len('/images/'):])
+    return f'{url}?v={texture_version(entry)}' if entry else url
+
+
+if __name__ == '__main__':
+    from app import app
+    from registry import get_registry
+
+    parser = argparse.ArgumentParser(description='Build downscaled and compressed texture variants')
+    parser.add_argument('--sizes', type=lambda value: [int(size) for size in value.split(',')], default=SIZES,
+                        help='comma separated widths of the mip levels, in pixels')
+    parser.add_argument('--force', action='store_true', help='rebuild every texture even if its source is unchanged')
+    args = parser.parse_args()
+
+    built, missing = build(texture_paths(get_registry()), args.sizes, args.force)
+    print(f'built {built} textures into {BUILD_DIR}')
+    for image_path in missing:
+        print(f'missing {image_path}')
@@ -0,0 +1,113 @@
+"""Keeps the ephemeris cache filled for a rolling window of dates around the current time
+
+Runs as a separate worker process. Every interval it fits and stores Chebyshev segments covering
+the window for every object in the popular object sets, so requests for any date in the window
+are answered from the segment tables instead of JPL Horizons. Segments are aligned to multiples of
+the segment length from J2000, so each pass only fetches the segments that have come into the window
+since the last one, and upstream requests are rate limited so the warmer never crowds out
+interactive requests. Web workers pick up new segments within CHEBYSHEV_RELOAD seconds
+
+Usage: python warmer.py [--once]
+
+Configured with WARM_SETS (comma separated object sets), WARM_DAYS_BEFORE, WARM_DAYS_AFTER,
+WARM_INTERVAL (seconds between passes) and WARM_RATE (upstream requests per second)"""
+from app import app
+from object_sets import get_id_list, UnknownSetError
+from horizons import get_transport, get_client, RateLimitedTransport
+from chebyshev import fit_segments, store_segments, load_tables, segment_plans, segment_grid, group_plans
+from ingest import fetch_grid
+from julian import to_jd
+import argparse
+import datetime
+import time
+import numpy
+import os
+
+WARM_SETS = os.environ.get('WARM_SETS', 'full,inner,outer,planets,dwarves,planets-dwarves').split(',')
+DAYS_BEFORE = float(os.environ.get('WARM_DAYS_BEFORE', 1))
+DAYS_AFTER = float(os.environ.get('WARM_DAYS_AFTER', 7))
+INTERVAL = float(os.environ.get('WARM_INTERVAL', 3600))
+RATE = float(os.environ.get('WARM_RATE', 2))
+
+SEGMENT_DAYS = 2        # longest span covered by a segment, shorter for bodies with short orbits, see ingest.py
+DEGREE = 11
+J2000 = 2451545.0       # segments start at whole multiples of their length from this date
+
+
+def get_ids(names):
+    """Returns the ids in every named object set, without duplicates, skipping and reporting unknown sets"""
+    ids = []
+    for name in names:
+        try:
+            set_ids = get_id_list(name)
+        except UnknownSetError as exc:
+            print(f'skipping {exc}', flush=True)
+            continue
+        for id in set_ids:
+            if id not in ids:
+                ids.append(id)
+    return ids
+
+
+def window_segments(now, segment_days):
+    """Returns the start dates of the aligned segments of segment_days overlapping the window around now"""
+    julian = to_jd(now, fmt='jd')
+    first = numpy.floor((julian - DAYS_BEFORE - J2000) / segment_days)
+    last = numpy.floor((julian + DAYS_AFTER - J2000) / segment_days)
+    return [J2000 + k * segment_days for k in numpy.arange(first, last + 1)]
+
+
+def missing_segments(tables, ids, center, starts, segment_days):
+    """Returns a dict mapping each segment start date to the ids with no stored segment covering it"""
+    missing = {}
+    for start in starts:
+        midpoint = start + segment_days / 2
+        uncovered = [id for id in ids
+                     if (id, center) not in tables or tables[(id, center)].find(midpoint) is None]
+        if uncovered:
+            missing[start] = uncovered
+    return missing
+
+
+def warm(ids, center, now, transport):
+    """Fits and stores every missing segment in the window around now
+    Each body's segment length comes from its orbital period, see chebyshev.segment_plans, and segments
+    that miss the fit tolerance are not stored, so they are tried again on the next pass
+    Returns the number of segments stored"""
+    stored = 0
+    tables = load_tables()
+    plans = segment_plans(ids, center, to_jd(now, fmt='jd'), SEGMENT_DAYS, transport)
+    for segment_days, group in group_plans(plans).items():
+        starts = window_segments(now, segment_days)
+        for start, uncovered in missing_segments(tables, group, center, starts, segment_days).items():
+            julians = segment_grid(start, 1, segment_days, DEGREE)
+            for id, rows in fetch_grid(uncovered, center, julians, transport).items():
+                stored += store_segments(id, center, fit_segments(julians, rows, segment_days, DEGREE))
+    return stored
+
+
+def run(once=False):
+    """Warms the cache every INTERVAL seconds, or just once"""
+    # one client for every pass, so its circuit breaker stops passes from hammering an upstream that is down
+    transport = get_client(RateLimitedTransport(get_transport(), RATE))
+    while True:
+        started = time.monotonic()
+        now = datetime.datetime.utcnow()
+        ids = get_ids(WARM_SETS)
+        try:
+            stored = warm(ids, 0, now, transport)
+            print(f'{now.isoformat()}: {len(ids)} objects, stored {stored} segments '
+                  f'in {time.monotonic() - started:.1f} s', flush=True)
+        except Exception as exc:
+            # a failed pass is retried on the next interval rather than stopping the worker
+            print(f'{now.isoformat()}: warming failed: {exc!r}', flush=True)
+        if once:
+            return
+        time.sleep(max(0, INTERVAL - (time.monotonic() - started)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Keep the ephemeris cache filled around the current time')
+    parser.add_argument('--once', action='store_true', help='run a single pass and exit')
+    args = parser.parse_args()
+    run(args.once)